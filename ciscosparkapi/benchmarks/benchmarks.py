@@ -0,0 +1,380 @@
+# -*- coding: utf-8 -*-
+"""Benchmark suite for the ciscosparkapi client hot paths.
+
+The benchmarks are written in the airspeed velocity (asv) style: each suite
+is a class with an optional `setup()` / `teardown()`, and `time_*` methods
+that are timed.  Run them with asv (`asv run`), or with the bundled runner,
+which compares the results against the recorded baseline:
+
+    python benchmarks/run.py
+
+Network benchmarks run against a local SparkSimulator (see
+`ciscosparkapi.simulator`); no access to the Cisco Spark cloud is required.
+
+"""
+
+
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+from builtins import *
+
+
+__author__ = "Chris Lunsford"
+__author_email__ = "chrlunsf@cisco.com"
+__copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
+__license__ = "MIT"
+
+
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import requests
+
+import ciscosparkapi
+from ciscosparkapi.generator_containers import generator_container
+from ciscosparkapi.restsession import RestSession
+from ciscosparkapi.simulator import SparkSimulator
+from ciscosparkapi.utils import (
+    check_response_code,
+    extract_and_parse_json,
+    iter_json_items,
+)
+
+
+# Module Constants
+PAGINATED_MESSAGES = 5000
+PAGE_ITEMS = 1000
+UPLOAD_BYTES = 256 * 1024
+PREFETCH_LATENCY = 0.02         # Simulated network latency per request (s)
+PREFETCH_PAGE_ITEMS = 500
+PREFETCH_PAGE_WORK = 0.01       # Simulated consumer processing per page (s)
+
+
+# Helper Functions
+
+def message_json(index, room_id='Y2lzY29zcGFyazovL3VzL1JPT00vMQ'):
+    """A realistic message JSON object."""
+    return {
+        'id': 'Y2lzY29zcGFyazovL3VzL01FU1NBR0UvMTIzNDU2Nzg5MA{}'.format(index),
+        'roomId': room_id,
+        'roomType': 'group',
+        'text': 'Hello, world! This is message number {}.'.format(index),
+        'personId': 'Y2lzY29zcGFyazovL3VzL1BFT1BMRS8xMjM0NTY3ODkw',
+        'personEmail': 'person@example.com',
+        'markdown': 'Hello, **world**! This is message number {}.'
+                    ''.format(index),
+        'mentionedPeople': ['Y2lzY29zcGFyazovL3VzL1BFT1BMRS8x'],
+        'created': '2018-01-01T00:00:00.000Z',
+    }
+
+
+def json_response(json_data):
+    """A requests.Response with a JSON body."""
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps(json_data).encode('utf-8')
+    response.encoding = 'utf-8'
+    response.request = requests.Request(
+        'GET', 'https://api.ciscospark.com/v1/messages'
+    ).prepare()
+    return response
+
+
+class SimulatorSuite(object):
+    """Base class for suites run against a local SparkSimulator."""
+
+    # The simulated network latency per request (seconds)
+    latency = 0.0
+
+    def setup(self):
+        self.simulator = SparkSimulator(seed=0, latency=self.latency)
+        self.simulator.start()
+        self.api = self.simulator.api()
+        self.session = RestSession(self.simulator.access_token,
+                                   self.simulator.url)
+
+    def teardown(self):
+        self.simulator.stop()
+
+
+# Benchmark Suites
+
+class RestSessionSuite(SimulatorSuite):
+    """RestSession request round trips."""
+
+    def time_request(self):
+        self.session.request('GET', 'people/me', 200)
+
+    def time_get(self):
+        self.session.get('people/me')
+
+
+class PaginationSuite(SimulatorSuite):
+    """Paging through a large (5000 item) result set."""
+
+    def setup(self):
+        super(PaginationSuite, self).setup()
+        self.room_id = self.simulator.populate(
+            rooms=1, messages_per_room=PAGINATED_MESSAGES
+        )[0]
+        self.params = {'roomId': self.room_id}
+
+    def time_get_pages(self):
+        for _ in self.session.get_pages('messages', params=self.params):
+            pass
+
+    def time_get_items_max_1000(self):
+        params = dict(self.params, max=1000)
+        for _ in self.session.get_items('messages', params=params):
+            pass
+
+    def time_get_items_streamed(self):
+        params = dict(self.params, max=1000)
+        for _ in self.session.get_items('messages', params=params,
+                                        stream_items=True):
+            pass
+
+
+class PrefetchSuite(SimulatorSuite):
+    """Paging with and without read-ahead, over a network with latency.
+
+    Read-ahead can only help when the consumer's processing of a page
+    overlaps the request for the next page; so the pages are requested with
+    simulated network latency, and consumed with simulated processing time.
+
+    """
+
+    latency = PREFETCH_LATENCY
+
+    def setup(self):
+        super(PrefetchSuite, self).setup()
+        room_id = self.simulator.populate(
+            rooms=1, messages_per_room=PAGINATED_MESSAGES
+        )[0]
+        self.params = {'roomId': room_id, 'max': PREFETCH_PAGE_ITEMS}
+
+    def consume(self, prefetch):
+        for _ in self.session.get_pages('messages', params=self.params,
+                                        prefetch=prefetch):
+            time.sleep(PREFETCH_PAGE_WORK)
+
+    def time_get_pages(self):
+        self.consume(prefetch=0)
+
+    def time_get_pages_prefetch_1(self):
+        self.consume(prefetch=1)
+
+    def time_get_pages_prefetch_2(self):
+        self.consume(prefetch=2)
+
+
+class JsonSuite(object):
+    """Parsing a page of 1000 messages."""
+
+    def setup(self):
+        self.page = {'items': [message_json(i) for i in range(PAGE_ITEMS)]}
+        self.response = json_response(self.page)
+        self.content = self.response.content
+
+    def time_extract_and_parse_json_auto(self):
+        extract_and_parse_json(self.response, 'auto')
+
+    def time_extract_and_parse_json_fast(self):
+        extract_and_parse_json(self.response, 'fast')
+
+    def time_extract_and_parse_json_compat(self):
+        extract_and_parse_json(self.response, 'compat')
+
+    def time_iter_json_items(self):
+        chunks = [self.content[i:i + 16384]
+                  for i in range(0, len(self.content), 16384)]
+        for _ in iter_json_items(chunks):
+            pass
+
+
+class SparkDataSuite(object):
+    """SparkData construction and attribute access."""
+
+    def setup(self):
+        self.json_data = dict(message_json(0),
+                              extension={'key': 'value'},
+                              **{'extra{}'.format(i): i for i in range(20)})
+        self.raw_json = json.dumps(self.json_data).encode('utf-8')
+        self.message = ciscosparkapi.Message(self.json_data)
+
+    def time_construct(self):
+        ciscosparkapi.Message(self.json_data)
+
+    def time_construct_raw_json(self):
+        ciscosparkapi.Message(self.raw_json)
+
+    def time_property_attribute(self):
+        self.message.text
+
+    def time_dynamic_attribute(self):
+        self.message.extra19
+
+    def time_nested_attribute(self):
+        self.message.extension.key
+
+    def time_raw_json_relay(self):
+        ciscosparkapi.Message(self.raw_json).to_json()
+
+
+class GeneratorContainerSuite(SimulatorSuite):
+    """GeneratorContainer creation, iteration and slicing."""
+
+    def setup(self):
+        super(GeneratorContainerSuite, self).setup()
+        self.room_id = self.simulator.populate(rooms=1,
+                                               messages_per_room=500)[0]
+
+        @generator_container
+        def numbers(count, max=None):
+            for number in range(count):
+                yield number
+
+        self.numbers = numbers
+
+    def time_create_container(self):
+        self.numbers(100)
+
+    def time_iterate_container(self):
+        for _ in self.numbers(10000):
+            pass
+
+    def time_iterate_messages(self):
+        for _ in self.api.messages.list(roomId=self.room_id):
+            pass
+
+    def time_slice_messages(self):
+        list(self.api.messages.list(roomId=self.room_id)[:10])
+
+
+class MessagesCreateSuite(SimulatorSuite):
+    """MessagesAPI.create(), with and without a (multipart) file."""
+
+    def setup(self):
+        super(MessagesCreateSuite, self).setup()
+        self.room_id = self.api.rooms.create("Uploads").id
+        self.directory = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.directory, 'upload.bin')
+        with open(self.file_path, 'wb') as file:
+            file.write(os.urandom(UPLOAD_BYTES))
+
+    def teardown(self):
+        super(MessagesCreateSuite, self).teardown()
+        shutil.rmtree(self.directory)
+
+    def time_create_text(self):
+        self.api.messages.create(roomId=self.room_id, text="Hello")
+
+    def time_create_with_file(self):
+        self.api.messages.create(roomId=self.room_id, text="Attached",
+                                 files=[self.file_path])
+
+
+class HelloBotSuite(SimulatorSuite):
+    """The hello_bot webhook message-handling path.
+
+    Mirrors `hello_bot.sparkwebhook()`: parse the webhook, look up the room,
+    message and sender concurrently, and post a reply.
+
+    """
+
+    def setup(self):
+        super(HelloBotSuite, self).setup()
+        self.api = self.simulator.api(coalesce_gets=True, me_cache_ttl=300)
+        self.pool = ThreadPoolExecutor(max_workers=16)
+        room = self.api.rooms.create("Hello Bot")
+        sender = self.simulator.create('people',
+                                       emails=['sender@example.com'],
+                                       displayName='Sender')
+        message = self.simulator.create('messages', roomId=room.id,
+                                        text='Hello bot',
+                                        personId=sender['id'])
+        self.webhook_json = {
+            'id': 'webhook-id',
+            'name': 'hello-bot-wb-hook',
+            'resource': 'messages',
+            'event': 'created',
+            'data': {'id': message['id'], 'roomId': room.id,
+                     'personId': sender['id']},
+        }
+        # Resolve the bot's identity once, as hello_bot does at startup
+        self.api.me
+
+    def teardown(self):
+        self.pool.shutdown()
+        super(HelloBotSuite, self).teardown()
+
+    def time_handle_message(self):
+        webhook = ciscosparkapi.Webhook(self.webhook_json)
+        sender_id = webhook.data.personId
+        if sender_id == self.api.me.id:
+            return
+        room_future = self.pool.submit(self.api.rooms.get,
+                                       webhook.data.roomId)
+        message_future = self.pool.submit(self.api.messages.get,
+                                          webhook.data.id)
+        person_future = self.pool.submit(self.api.people.get, sender_id)
+        message = message_future.result()
+        room = room_future.result()
+        person = person_future.result()
+        words = message.text.lower().split(' ')
+        self.api.messages.create(room.id, text="Hi {} ({} words)".format(
+            person.displayName, len(words)
+        ))
+
+
+class SparkApiErrorSuite(object):
+    """Raising and handling rate-limit errors (as under a flood of 429s).
+
+    The errors' (lazily built) reports are only rendered by the `_rendered`
+    benchmark.
+
+    """
+
+    def setup(self):
+        request = requests.Request(
+            'POST', 'https://api.ciscospark.com/v1/messages',
+            headers={'Authorization': 'Bearer ' + 'x' * 64,
+                     'Content-Type': 'application/json;charset=utf-8'},
+            json={'roomId': 'Y2lzY29zcGFyazovL3VzL1JPT00v' * 3,
+                  'markdown': 'Hello **world**! ' * 20},
+        ).prepare()
+        response = json_response({
+            'message': 'Too many requests have been sent in a given amount '
+                       'of time. Please wait and try again.',
+            'errors': [{'description': 'Rate limit exceeded.'}],
+            'trackingId': 'ROUTER_5A1B2C3D-0123-4567-89AB-CDEF01234567',
+        })
+        response.request = request
+        response.status_code = 429
+        response.reason = 'Too Many Requests'
+        response.headers.update({
+            'Retry-After': '15',
+            'TrackingID': 'ROUTER_5A1B2C3D-0123-4567-89AB-CDEF01234567',
+            'Content-Type': 'application/json;charset=UTF-8',
+        })
+        self.response = response
+
+    def time_rate_limit_error(self):
+        try:
+            check_response_code(self.response, 200)
+        except ciscosparkapi.SparkRateLimitError as error:
+            error.retry_after
+
+    def time_rate_limit_error_rendered(self):
+        try:
+            check_response_code(self.response, 200)
+        except ciscosparkapi.SparkRateLimitError as error:
+            str(error)
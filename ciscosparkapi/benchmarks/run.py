@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""Run the benchmark suite, and compare the results to the recorded baseline.
+
+Runs the asv-style suites in `benchmarks/benchmarks.py` without asv: each
+`time_*` benchmark is timed (best of `--repeat` runs, each long enough to be
+measured reliably) and compared to its recorded baseline time.  Benchmarks
+slower than `--tolerance` times their baseline (in two successive timings)
+are reported as regressions, and the runner exits with a non-zero status.
+
+Baselines are recorded per platform (Python implementation and version,
+operating system and architecture; see `platform_key()`), and results are
+only compared to the baseline recorded for the platform they were run on.
+The baselines used to gate changes are recorded on the CI runner
+(`make benchmarks-baseline`); on a platform without a recorded baseline the
+results are reported, but not gated.
+
+Usage:
+    python benchmarks/run.py                  # Compare to the baseline
+    python benchmarks/run.py --save           # Record this platform's baseline
+    python benchmarks/run.py -k Pagination    # Run matching benchmarks
+
+"""
+
+
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+from builtins import *
+
+
+__author__ = "Chris Lunsford"
+__author_email__ = "chrlunsf@cisco.com"
+__copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
+__license__ = "MIT"
+
+
+import argparse
+import inspect
+import io
+import json
+import os
+import platform
+import sys
+import timeit
+
+
+# Module Constants
+BENCHMARKS_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCHMARKS_DIRECTORY, 'baseline.json')
+DEFAULT_REPEAT = 5
+DEFAULT_TOLERANCE = 1.5
+MIN_RUN_TIME = 0.2
+
+
+def benchmarks(module, pattern=None):
+    """Yield the (name, suite class, method name) of the `time_*` benchmarks.
+    """
+    for class_name, suite in sorted(inspect.getmembers(module,
+                                                       inspect.isclass)):
+        if suite.__module__ != module.__name__ or \
+                not class_name.endswith('Suite'):
+            continue
+        for method_name in sorted(dir(suite)):
+            if not method_name.startswith('time_'):
+                continue
+            name = '{}.{}'.format(class_name, method_name)
+            if pattern is None or pattern in name:
+                yield name, suite, method_name
+
+
+def time_benchmark(suite, method_name, repeat=DEFAULT_REPEAT):
+    """Time a benchmark; return the best time (in seconds) per call."""
+    instance = suite()
+    if hasattr(instance, 'setup'):
+        instance.setup()
+    try:
+        benchmark = getattr(instance, method_name)
+        timer = timeit.Timer(benchmark)
+        # Calibrate the number of calls per run (as timeit.Timer.autorange)
+        number = 1
+        while timer.timeit(number) < MIN_RUN_TIME:
+            number *= 2
+        return min(timer.repeat(repeat=repeat, number=number)) / number
+    finally:
+        if hasattr(instance, 'teardown'):
+            instance.teardown()
+
+
+def format_time(seconds):
+    """Format a time with an appropriate unit."""
+    for unit, scale in (('s', 1), ('ms', 1e3), ('us', 1e6)):
+        if seconds >= 1 / scale:
+            return '{:8.2f} {:<2}'.format(seconds * scale, unit)
+    return '{:8.2f} ns'.format(seconds * 1e9)
+
+
+def machine():
+    """A description of the machine the benchmarks were run on."""
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+    }
+
+
+def platform_key(machine_info):
+    """The key of the platform baselines are recorded (and compared) for."""
+    python_version = '.'.join(machine_info['python'].split('.')[:2])
+    system = machine_info['platform'].split('-')[0]
+    return '{}-{}-{}-{}'.format(machine_info['implementation'],
+                                python_version, system,
+                                machine_info['processor'])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE,
+                        help="The baseline results file.")
+    parser.add_argument('--save', action='store_true',
+                        help="Record the results as the new baseline.")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="The slowdown (ratio) reported as a regression.")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help="The number of timed runs per benchmark.")
+    parser.add_argument('-k', dest='pattern',
+                        help="Only run benchmarks whose name contains this.")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, BENCHMARKS_DIRECTORY)
+    sys.path.insert(0, os.path.dirname(BENCHMARKS_DIRECTORY))
+    import benchmarks as module
+
+    this_machine = machine()
+    key = platform_key(this_machine)
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with io.open(args.baseline, encoding='utf-8') as file:
+            baselines = json.load(file).get('baselines', {})
+    baseline = baselines.get(key, {})
+    if not args.save:
+        if not baseline:
+            print("No baseline recorded for {}; the results are not gated "
+                  "(record one with --save).".format(key))
+        elif baseline.get('machine') != this_machine:
+            print("Warning: the {} baseline was recorded on a different "
+                  "machine ({}).".format(key, baseline.get('machine')))
+
+    results = {}
+    regressions = []
+    for name, suite, method_name in benchmarks(module, args.pattern):
+        seconds = time_benchmark(suite, method_name, args.repeat)
+        reference = baseline.get('results', {}).get(name)
+        if reference and not args.save and \
+                seconds / reference > args.tolerance:
+            # Re-time suspected regressions; to rule out transient noise
+            seconds = min(seconds,
+                          time_benchmark(suite, method_name, args.repeat))
+        results[name] = seconds
+        if reference:
+            ratio = seconds / reference
+            status = "REGRESSION" if ratio > args.tolerance else ""
+            if status:
+                regressions.append(name)
+            print("{:<52} {}  {:5.2f}x  {}".format(name, format_time(seconds),
+                                                   ratio, status))
+        else:
+            print("{:<52} {}".format(name, format_time(seconds)))
+
+    if args.save:
+        if args.pattern:
+            # Only the benchmarks that were run are updated
+            recorded = dict(baseline.get('results', {}))
+            recorded.update(results)
+            results = recorded
+        baselines[key] = {'machine': this_machine, 'results': results}
+        with io.open(args.baseline, 'w', encoding='utf-8') as file:
+            file.write(json.dumps({'baselines': baselines},
+                                  indent=2, sort_keys=True) + '\n')
+        print("{} baseline saved to {}".format(key, args.baseline))
+        return 0
+
+    if regressions:
+        print("{} benchmark(s) regressed by more than {}x: {}"
+              "".format(len(regressions), args.tolerance,
+                        ", ".join(regressions)))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -21,12 +21,17 @@ __all__ = [
     "CiscoSparkAPI", "ciscosparkapiException", "SparkApiError",
     "SparkRateLimitError", "Person", "Room", "Membership", "Message", "Team",
     "TeamMembership", "Webhook", "WebhookEvent", "Organization", "License",
-    "Role", "AccessToken"
+    "Role", "AccessToken", "EntityCache", "ReplicaStore", "RateLimiter",
+    "DeferredExecutor", "RetryPolicy", "HTTP2Adapter", "ResponseCache",
+    "DiskResponseCache", "Instrumentation", "MetricsSink", "RequestEvent",
+    "TracingSink", "MultipartUpload", "EncodableFile",
+    "DEFAULT_UPLOAD_CHUNK_SIZE"
 ]
 
 
 import logging
 import os
+import sys
 
 from .api.people import Person
 from .api.rooms import Room
@@ -40,7 +45,10 @@ from .api.licenses import License
 from .api.roles import Role
 from .api.access_tokens import AccessToken
 
-from .api.people import PeopleAPI as _PeopleAPI
+from .api.people import (
+    DEFAULT_ME_CACHE_TTL,
+    PeopleAPI as _PeopleAPI,
+)
 from .api.rooms import RoomsAPI as _RoomsAPI
 from .api.memberships import MembershipsAPI as _MembershipsAPI
 from .api.messages import MessagesAPI as _MessagesAPI
@@ -52,19 +60,58 @@ from .api.licenses import LicensesAPI as _LicensesAPI
 from .api.roles import RolesAPI as _RolesAPI
 from .api.access_tokens import AccessTokensAPI as _AccessTokensAPI
 
+from .cache import EntityCache
+
 from .exceptions import (
     ciscosparkapiException,
     SparkApiError,
     SparkRateLimitError,
 )
 
+from .export import DEFAULT_EXPORT_BATCH_SIZE, export_items
+
+from .httpcache import DiskResponseCache, ResponseCache
+
+from .instrumentation import (
+    Instrumentation,
+    MetricsSink,
+    RequestEvent,
+    TracingSink,
+)
+
+from .ratelimit import RateLimiter
+
+from .replica import ReplicaStore
+
+from .retry import RetryPolicy
+
+from .scheduler import DeferredExecutor
+
+from .transports import HTTP2Adapter
+
+from .uploads import DEFAULT_UPLOAD_CHUNK_SIZE, MultipartUpload
+
 from .restsession import (
     DEFAULT_SINGLE_REQUEST_TIMEOUT,
     DEFAULT_WAIT_ON_RATE_LIMIT,
+    DEFAULT_RETRY_POLICY,
+    DEFAULT_POOL_CONNECTIONS,
+    DEFAULT_POOL_MAXSIZE,
+    DEFAULT_POOL_BLOCK,
+    DEFAULT_KEEP_ALIVE,
+    DEFAULT_HTTP2,
+    DEFAULT_PREFETCH_PAGES,
+    DEFAULT_COALESCE_GETS,
+    DEFAULT_STREAM_ITEMS,
+    DEFAULT_RAW_JSON,
     RestSession as _RestSession,
 )
 
-from .utils import check_type
+from .utils import (
+    DEFAULT_JSON_DECODER,
+    EncodableFile,
+    check_type,
+)
 
 
 # Versioneer version control
@@ -121,7 +168,21 @@ class CiscoSparkAPI(object):
     def __init__(self, access_token=None, base_url=DEFAULT_BASE_URL,
                  timeout=None,
                  single_request_timeout=DEFAULT_SINGLE_REQUEST_TIMEOUT,
-                 wait_on_rate_limit=DEFAULT_WAIT_ON_RATE_LIMIT):
+                 wait_on_rate_limit=DEFAULT_WAIT_ON_RATE_LIMIT,
+                 me_cache_ttl=DEFAULT_ME_CACHE_TTL,
+                 entity_cache=None, rate_limiter=None,
+                 deferred_executor=None,
+                 retry_policy=DEFAULT_RETRY_POLICY,
+                 pool_connections=DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 pool_block=DEFAULT_POOL_BLOCK,
+                 keep_alive=DEFAULT_KEEP_ALIVE,
+                 http_adapter=None, http2=DEFAULT_HTTP2,
+                 prefetch_pages=DEFAULT_PREFETCH_PAGES,
+                 coalesce_gets=DEFAULT_COALESCE_GETS, response_cache=None,
+                 json_decoder=DEFAULT_JSON_DECODER,
+                 stream_items=DEFAULT_STREAM_ITEMS,
+                 raw_json=DEFAULT_RAW_JSON, instrumentation=None):
         """Create a new CiscoSparkAPI object.
 
         An access token must be used when interacting with the Cisco Spark API.
@@ -150,6 +211,83 @@ class CiscoSparkAPI(object):
                 ciscosparkapi.DEFAULT_SINGLE_REQUEST_TIMEOUT.
             wait_on_rate_limit(bool): Enables or disables automatic rate-limit
                 handling. Defaults to ciscosparkapi.DEFAULT_WAIT_ON_RATE_LIMIT.
+            me_cache_ttl(int, float): An (opt-in) time (in seconds) the
+                details of the person accessing the API (`me`) are cached
+                before being revalidated.  `None` or `0` disables caching.
+                Defaults to ciscosparkapi.DEFAULT_ME_CACHE_TTL (no caching).
+            entity_cache(EntityCache): An (opt-in) cache used to serve the
+                `get()` calls of the API wrappers (people, rooms, etc.).
+                Cached entities are invalidated by the corresponding `update()`
+                and `delete()` calls.  Defaults to no caching.
+            rate_limiter(RateLimiter): An (opt-in) client-side rate limiter,
+                which paces the requests sent to each API endpoint and adapts
+                to the rate-limit responses received from Cisco Spark.
+                Defaults to no client-side rate limiting.
+            deferred_executor(DeferredExecutor): The executor that runs the
+                requests made with `submit()`; rate-limited requests are
+                parked in its queue until they may be retried.  Defaults to an
+                executor created on first use.
+            retry_policy(RetryPolicy): Retries the requests that fail with
+                transient errors (server errors, connection errors and
+                timeouts); non-idempotent requests (i.e. creating a message)
+                are only retried if they could not have reached Cisco Spark.
+                Defaults to ciscosparkapi.DEFAULT_RETRY_POLICY (`None`; no
+                retries); e.g. pass `RetryPolicy()` to enable retries.
+            pool_connections(int): The number of connection pools (one per
+                host) cached by the HTTP adapter.  Defaults to
+                ciscosparkapi.DEFAULT_POOL_CONNECTIONS.
+            pool_maxsize(int): The maximum number of connections kept open to
+                a host; size this to (at least) the number of threads making
+                concurrent API calls.  Defaults to
+                ciscosparkapi.DEFAULT_POOL_MAXSIZE.
+            pool_block(bool): Block until a pooled connection is available,
+                rather than opening (and then discarding) extra connections.
+                Defaults to ciscosparkapi.DEFAULT_POOL_BLOCK.
+            keep_alive(bool): Reuse connections for subsequent API calls.
+                Defaults to ciscosparkapi.DEFAULT_KEEP_ALIVE.
+            http_adapter(requests.adapters.HTTPAdapter): A custom transport
+                adapter used for all API calls (overrides the pool and HTTP/2
+                settings).
+            http2(bool): Make the API calls over HTTP/2, multiplexing
+                concurrent calls over a single connection (see
+                `HTTP2Adapter`; requires the optional `httpx` package).
+                Defaults to ciscosparkapi.DEFAULT_HTTP2.
+            prefetch_pages(int): The number of pages the `list()` methods
+                request ahead of the consumer (in a background thread), so
+                that the next page is already on its way while the current
+                page is processed.  Read-ahead only helps consumers that spend
+                time processing each page; one (1) page is usually enough.
+                `0` disables read-ahead.  Defaults to
+                ciscosparkapi.DEFAULT_PREFETCH_PAGES.
+            coalesce_gets(bool): Coalesce identical concurrent GET requests
+                (i.e. many threads calling `rooms.get()` for the same room), so
+                that only one request is sent and all of the callers share its
+                result.  Defaults to ciscosparkapi.DEFAULT_COALESCE_GETS.
+            response_cache(ResponseCache): An (opt-in) HTTP response cache;
+                GET responses carrying validators (ETag / Last-Modified) are
+                cached, later GETs are sent as conditional requests, and the
+                cached data is served when Cisco Spark responds 304 (Not
+                Modified).  Use a DiskResponseCache to persist the cache
+                across runs.  Defaults to no response caching.
+            json_decoder(basestring, func): The JSON decoder used to parse
+                the API responses: 'auto' (orjson if installed, else 'fast'
+                on Python 3.7+), 'fast' (standard library, plain dicts),
+                'orjson', 'compat' (the original OrderedDict decoder) or a
+                function called with the response body bytes.  Defaults to
+                ciscosparkapi.DEFAULT_JSON_DECODER.
+            stream_items(bool): The `list()` methods stream the response
+                pages, and yield the items as they are parsed; reducing the
+                time to the first item and the memory used by large pages.
+                Defaults to ciscosparkapi.DEFAULT_STREAM_ITEMS.
+            raw_json(bool): The `get()` methods return objects that retain
+                the raw JSON response body, which is only parsed when their
+                data is first accessed; and their `to_json()` returns it
+                unchanged.  Defaults to ciscosparkapi.DEFAULT_RAW_JSON.
+            instrumentation(Instrumentation): Emits a RequestEvent (endpoint,
+                status, sizes, latency, retries and rate-limit waits) for each
+                API call to its sinks; i.e. a MetricsSink (Prometheus-style
+                metrics) or a TracingSink (OpenTelemetry spans).  Defaults to
+                no instrumentation.
 
         Returns:
             CiscoSparkAPI: A new CiscoSparkAPI object.
@@ -165,6 +303,22 @@ class CiscoSparkAPI(object):
         check_type(base_url, basestring)
         check_type(single_request_timeout, int)
         check_type(wait_on_rate_limit, bool)
+        check_type(me_cache_ttl, (int, float))
+        check_type(entity_cache, EntityCache)
+        check_type(rate_limiter, RateLimiter)
+        check_type(deferred_executor, DeferredExecutor)
+        check_type(retry_policy, RetryPolicy)
+        check_type(pool_connections, int, may_be_none=False)
+        check_type(pool_maxsize, int, may_be_none=False)
+        check_type(pool_block, bool, may_be_none=False)
+        check_type(keep_alive, bool, may_be_none=False)
+        check_type(http2, bool, may_be_none=False)
+        check_type(prefetch_pages, int, may_be_none=False)
+        check_type(coalesce_gets, bool, may_be_none=False)
+        check_type(stream_items, bool, may_be_none=False)
+        check_type(raw_json, bool, may_be_none=False)
+        check_type(response_cache, ResponseCache)
+        check_type(instrumentation, Instrumentation)
 
         env_access_token = os.environ.get(ACCESS_TOKEN_ENVIRONMENT_VARIABLE)
         access_token = access_token or env_access_token
@@ -184,11 +338,28 @@ class CiscoSparkAPI(object):
             base_url,
             timeout=timeout,
             single_request_timeout=single_request_timeout,
-            wait_on_rate_limit=wait_on_rate_limit
+            wait_on_rate_limit=wait_on_rate_limit,
+            entity_cache=entity_cache,
+            rate_limiter=rate_limiter,
+            deferred_executor=deferred_executor,
+            retry_policy=retry_policy,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            keep_alive=keep_alive,
+            http_adapter=http_adapter,
+            http2=http2,
+            prefetch_pages=prefetch_pages,
+            coalesce_gets=coalesce_gets,
+            response_cache=response_cache,
+            json_decoder=json_decoder,
+            stream_items=stream_items,
+            raw_json=raw_json,
+            instrumentation=instrumentation,
         )
 
         # Spark API wrappers
-        self.people = _PeopleAPI(self._session)
+        self.people = _PeopleAPI(self._session, me_cache_ttl=me_cache_ttl)
         self.rooms = _RoomsAPI(self._session)
         self.memberships = _MembershipsAPI(self._session)
         self.messages = _MessagesAPI(self._session)
@@ -224,3 +395,114 @@ class CiscoSparkAPI(object):
     def wait_on_rate_limit(self):
         """Automatic rate-limit handling enabled / disabled."""
         return self._session.wait_on_rate_limit
+
+    @property
+    def entity_cache(self):
+        """The EntityCache used to serve the API wrapper `get()` calls."""
+        return self._session.entity_cache
+
+    @property
+    def rate_limiter(self):
+        """The RateLimiter pacing the requests to the API endpoints."""
+        return self._session.rate_limiter
+
+    @property
+    def response_cache(self):
+        """The ResponseCache used to revalidate GET responses."""
+        return self._session.response_cache
+
+    @property
+    def retry_policy(self):
+        """The RetryPolicy for transient request failures."""
+        return self._session.retry_policy
+
+    def submit(self, method, url, **kwargs):
+        """Make a Cisco Spark API request without blocking the caller.
+
+        Rate-limited requests are parked and retried when their `Retry-After`
+        deadline arrives, without holding up the calling thread or the
+        requests to other API endpoints.
+
+        Example:
+            >>> future = api.submit('POST', 'messages',
+            ...                     json={'roomId': roomId, 'text': 'Hi'})
+            >>> message = Message(future.result())
+
+        Args:
+            method(basestring): The request-method type ('GET', 'POST', etc.).
+            url(basestring): The (relative or absolute) URL of the API
+                endpoint.
+            **kwargs: Passed on to `RestSession.submit()`.
+
+        Returns:
+            concurrent.futures.Future: A future for the JSON data returned by
+            the API endpoint.
+
+        """
+        return self._session.submit(method, url, **kwargs)
+
+    def export(self, resource, destination, format=None, columns=None,
+               batch_size=DEFAULT_EXPORT_BATCH_SIZE, column_types=None,
+               **request_parameters):
+        """Export the items listed by an API endpoint to a file, in bulk.
+
+        The items are written directly from the parsed JSON pages into
+        columnar (Parquet) or flat (CSV, JSON Lines) files, in batches, as the
+        pages are received; no per-item model objects (`Person`, `Room`, etc.)
+        are created.  Parquet export requires the pyarrow package.
+
+        Example:
+            >>> api.export('memberships', 'memberships.parquet',
+            ...            roomId=roomId)
+
+        Args:
+            resource(basestring): The (list) API endpoint; i.e. 'rooms',
+                'memberships', 'people', etc.
+            destination(basestring, file): The path of the output file, or a
+                file object.
+            format(basestring): 'parquet', 'csv' or 'jsonl'.  Defaults to the
+                format implied by the destination file's extension.
+            columns(list): The item attributes to be exported.  Defaults to
+                the attributes of the items in the first batch.
+            batch_size(int): The number of items written per batch.
+            column_types(dict): The Parquet types of (some of) the columns
+                (see `export_items()`).  Defaults to types inferred from the
+                first batch.
+            **request_parameters: The query parameters for the list request
+                (i.e. `roomId`, `type`, `max`).
+
+        Returns:
+            int: The number of items exported.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ValueError: If the export format is not supported, or if a value
+                cannot be converted to its Parquet column's type.
+            SparkApiError: If the Cisco Spark cloud returns an error.
+
+        """
+        check_type(resource, basestring, may_be_none=False)
+
+        items = self._session.get_items(resource, params=request_parameters)
+        return export_items(items, destination, format=format,
+                            columns=columns, batch_size=batch_size,
+                            column_types=column_types)
+
+    @property
+    def me(self):
+        """The details of the person accessing the API.
+
+        Equivalent to `people.me()`.  When the identity cache is enabled (see
+        `me_cache_ttl`), the details are looked up on first access and
+        revalidated once they are older than `me_cache_ttl` seconds; access
+        this property at startup to resolve the identity before handling any
+        requests.  Otherwise, each access requests the details.
+
+        """
+        return self.people.me()
+
+
+# Asyncio interface (Python 3.6+)
+if sys.version_info >= (3, 6):
+    from .aio import AsyncCiscoSparkAPI  # noqa: F401 (in __all__)
+    __all__.append("AsyncCiscoSparkAPI")
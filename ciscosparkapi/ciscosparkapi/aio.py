@@ -0,0 +1,449 @@
+# -*- coding: utf-8 -*-
+"""Asyncio interface to the Cisco Spark APIs.
+
+Classes:
+    AsyncRestSession: Exposes the RestSession request methods as coroutines
+        and asynchronous generators.
+    AsyncAPIWrapper: Exposes the methods of a Cisco Spark API wrapper (people,
+        rooms, etc.) as coroutines and asynchronous generators.
+    AsyncCiscoSparkAPI: Asyncio counterpart to the CiscoSparkAPI class.
+
+The blocking HTTP requests made by the package are dispatched to a thread pool
+executor, which allows a single event loop to service many concurrent API
+calls (webhook deliveries, etc.) without tying up the loop for the duration of
+each round-trip.
+
+This module requires Python 3.6+ (asynchronous generators).
+
+"""
+
+
+# Use future for Python v2 and v3 compatibility
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+from builtins import *
+
+
+__author__ = "Chris Lunsford"
+__author_email__ = "chrlunsf@cisco.com"
+__copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
+__license__ = "MIT"
+
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import inspect
+from itertools import islice
+import json
+
+from .exceptions import ciscosparkapiException
+from .response_codes import EXPECTED_RESPONSE_CODE
+from .restsession import RestSession
+from .singleflight import coalescing_key
+from .utils import check_type, copy_json
+
+
+# Module Constants
+DEFAULT_ASYNC_MAX_WORKERS = 64
+DEFAULT_ITERATION_CHUNK_SIZE = 100
+# The (GET-only) API wrapper methods coalesced by AsyncCiscoSparkAPI
+COALESCED_API_METHODS = ('get',)
+
+
+# The running loop (asyncio.get_running_loop() is new in Python 3.7)
+_get_running_loop = getattr(asyncio, 'get_running_loop',
+                            asyncio.get_event_loop)
+
+
+# Helper Functions
+def _next_chunk(iterator, chunk_size):
+    """Return a list of (up to) the next `chunk_size` items of an iterator."""
+    return list(islice(iterator, chunk_size))
+
+
+def _is_generator_container_function(method):
+    """Is this method a `@generator_container` decorated generator function."""
+    wrapped = getattr(method, '__wrapped__', None)
+    return wrapped is not None and inspect.isgeneratorfunction(wrapped)
+
+
+class AsyncRestSession(object):
+    """Asyncio wrapper for a RestSession.
+
+    Dispatches the (blocking) RestSession requests to an executor and exposes
+    them as coroutines and asynchronous generators.
+
+    """
+
+    def __init__(self, session, executor=None,
+                 max_workers=DEFAULT_ASYNC_MAX_WORKERS):
+        """Initialize a new AsyncRestSession object.
+
+        Args:
+            session(RestSession): The RestSession used to make the requests.
+            executor(concurrent.futures.Executor): The executor used to run
+                the blocking requests. Defaults to a new ThreadPoolExecutor
+                (owned and shut down by this AsyncRestSession).
+            max_workers(int): The maximum number of worker threads used by the
+                default executor; i.e. the maximum number of concurrent
+                requests.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+
+        """
+        check_type(session, RestSession, may_be_none=False)
+        check_type(max_workers, int, may_be_none=False)
+
+        super(AsyncRestSession, self).__init__()
+
+        self._session = session
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_workers)
+        self._inflight_gets = {}
+
+    @property
+    def session(self):
+        """The (synchronous) RestSession used to make the requests."""
+        return self._session
+
+    @property
+    def executor(self):
+        """The executor used to run the blocking requests."""
+        return self._executor
+
+    async def run(self, function, *args, **kwargs):
+        """Run a blocking function on the executor and await its result.
+
+        Args:
+            function(func): The blocking function to be called.
+            *args: The arguments passed to the function.
+            **kwargs: The keyword arguments passed to the function.
+
+        Returns:
+            The value returned by the function.
+
+        """
+        loop = _get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            functools.partial(function, *args, **kwargs),
+        )
+
+    async def coalesce(self, key, function, *args, **kwargs):
+        """Run a blocking function, or await an identical call in flight.
+
+        Concurrent calls with the same key, made by multiple tasks, share a
+        single executor call; cancelling one of the waiting tasks does not
+        cancel the shared call.
+
+        Args:
+            key: A hashable key identifying identical calls.
+            function(func): The blocking function to be called.
+            *args: The arguments passed to the function.
+            **kwargs: The keyword arguments passed to the function.
+
+        Returns:
+            The value returned by the (shared) call.
+
+        """
+        future, _ = self._shared_call(key, function, *args, **kwargs)
+        return await asyncio.shield(future)
+
+    def _shared_call(self, key, function, *args, **kwargs):
+        """Start a call, or join the identical call in flight.
+
+        Returns:
+            tuple: The (future) result of the call, and whether this call
+            started it.
+
+        """
+        future = self._inflight_gets.get(key)
+        if future is not None:
+            return future, False
+
+        future = asyncio.ensure_future(self.run(function, *args, **kwargs))
+        self._inflight_gets[key] = future
+        future.add_done_callback(lambda _: self._inflight_gets.pop(key, None))
+        return future, True
+
+    async def iterate(self, iterable, chunk_size=DEFAULT_ITERATION_CHUNK_SIZE):
+        """Asynchronously iterate a blocking iterable.
+
+        The iterable is advanced on the executor, `chunk_size` items at a
+        time, so that the event loop only hands off to the executor about once
+        per page of results.
+
+        Args:
+            iterable: The (blocking) iterable to be iterated.
+            chunk_size(int): The number of items retrieved per executor call.
+
+        """
+        iterator = iter(iterable)
+        while True:
+            chunk = await self.run(_next_chunk, iterator, chunk_size)
+            if not chunk:
+                return
+
+            for item in chunk:
+                yield item
+
+    async def request(self, method, url, erc, **kwargs):
+        """Coroutine version of :meth:`RestSession.request`."""
+        return await self.run(self._session.request, method, url, erc,
+                              **kwargs)
+
+    async def get(self, url, params=None, **kwargs):
+        """Coroutine version of :meth:`RestSession.get`.
+
+        When coalescing is enabled (see `RestSession.coalesce_gets`),
+        identical concurrent GETs made by multiple tasks share a single
+        executor call, and each task gets its own copy of the parsed JSON
+        data; cancelling one of the waiting tasks does not cancel the shared
+        request.
+
+        """
+        coalesce = kwargs.pop('coalesce', self._session.coalesce_gets)
+        if not coalesce:
+            return await self.run(self._session.get, url, params=params,
+                                  coalesce=False, **kwargs)
+
+        options = dict(kwargs)
+        erc = options.pop('erc', EXPECTED_RESPONSE_CODE['GET'])
+        key = coalescing_key(self._session.abs_url(url), params, erc,
+                             **options)
+        future, started = self._shared_call(key, self._session.get, url,
+                                            params=params, coalesce=True,
+                                            **kwargs)
+        json_data = await asyncio.shield(future)
+        return json_data if started else copy_json(json_data)
+
+    async def get_pages(self, url, params=None, **kwargs):
+        """Asynchronous generator version of :meth:`RestSession.get_pages`."""
+        pages = self._session.get_pages(url, params=params, **kwargs)
+        async for page in self.iterate(pages, chunk_size=1):
+            yield page
+
+    async def get_items(self, url, params=None, **kwargs):
+        """Asynchronous generator version of :meth:`RestSession.get_items`."""
+        async for json_page in self.get_pages(url, params=params, **kwargs):
+            assert isinstance(json_page, dict)
+
+            items = json_page.get('items')
+
+            if items is None:
+                error_message = "'items' key not found in JSON data: " \
+                                "{!r}".format(json_page)
+                raise ciscosparkapiException(error_message)
+
+            else:
+                for item in items:
+                    yield item
+
+    async def post(self, url, json=None, data=None, **kwargs):
+        """Coroutine version of :meth:`RestSession.post`."""
+        return await self.run(self._session.post, url, json=json, data=data,
+                              **kwargs)
+
+    async def put(self, url, json=None, data=None, **kwargs):
+        """Coroutine version of :meth:`RestSession.put`."""
+        return await self.run(self._session.put, url, json=json, data=data,
+                              **kwargs)
+
+    async def delete(self, url, **kwargs):
+        """Coroutine version of :meth:`RestSession.delete`."""
+        return await self.run(self._session.delete, url, **kwargs)
+
+    def close(self):
+        """Shut down the executor, if it is owned by this session."""
+        if self._owns_executor:
+            self._executor.shutdown(wait=False)
+
+
+class AsyncAPIWrapper(object):
+    """Expose the methods of a Cisco Spark API wrapper as coroutines.
+
+    Methods that return a GeneratorContainer (the `list()` methods) are
+    exposed as functions returning asynchronous generators; all other public
+    methods are exposed as coroutine functions with the same signatures as
+    the wrapped methods.
+
+    When coalescing is enabled (see `RestSession.coalesce_gets`), identical
+    concurrent calls to the `coalesced_methods` made by multiple tasks share
+    a single executor call, and its result (i.e. a Room object; which should
+    be treated as read-only).
+
+    """
+
+    def __init__(self, api, session, coalesced_methods=()):
+        """Initialize a new AsyncAPIWrapper object.
+
+        Args:
+            api: The Cisco Spark API wrapper object (PeopleAPI, RoomsAPI,
+                etc.) to be wrapped.
+            session(AsyncRestSession): The AsyncRestSession used to run the
+                wrapped methods.
+            coalesced_methods(tuple): The names of the wrapped methods whose
+                identical concurrent calls may be coalesced; only methods
+                that make GET requests (and no other changes) are safe to
+                coalesce.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+
+        """
+        check_type(session, AsyncRestSession, may_be_none=False)
+        check_type(coalesced_methods, tuple, may_be_none=False)
+
+        super(AsyncAPIWrapper, self).__init__()
+
+        self._api = api
+        self._session = session
+        self._coalesced_methods = frozenset(coalesced_methods)
+
+    def __getattr__(self, item):
+        """Return an asyncio version of the wrapped API's attribute."""
+        if item.startswith('_'):
+            raise AttributeError(
+                "'{}' object has no attribute '{}'"
+                "".format(self.__class__.__name__, item)
+            )
+
+        attribute = getattr(self._api, item)
+
+        if not callable(attribute):
+            return attribute
+
+        elif _is_generator_container_function(attribute):
+            @functools.wraps(attribute)
+            def wrapper(*args, **kwargs):
+                container = attribute(*args, **kwargs)
+                chunk_size = (container.arguments.get('max')
+                              or DEFAULT_ITERATION_CHUNK_SIZE)
+                return self._session.iterate(container, chunk_size=chunk_size)
+
+        elif item in self._coalesced_methods:
+            @functools.wraps(attribute)
+            async def wrapper(*args, **kwargs):
+                if not self._session.session.coalesce_gets:
+                    return await self._session.run(attribute, *args, **kwargs)
+                # A canonical encoding of the arguments; which may be lists
+                # or dicts (unhashable)
+                arguments = json.dumps([args, kwargs], sort_keys=True,
+                                       default=repr)
+                key = (id(self._api), item, arguments)
+                return await self._session.coalesce(key, attribute, *args,
+                                                    **kwargs)
+
+        else:
+            @functools.wraps(attribute)
+            async def wrapper(*args, **kwargs):
+                return await self._session.run(attribute, *args, **kwargs)
+
+        # Cache the wrapper; __getattr__ is only called on lookup misses
+        setattr(self, item, wrapper)
+        return wrapper
+
+
+class AsyncCiscoSparkAPI(object):
+    """Asyncio Cisco Spark API wrapper.
+
+    Mirrors the CiscoSparkAPI interface; each of the API wrappers (people,
+    rooms, memberships, etc.) exposes the same methods, as coroutines, and the
+    `list()` methods return asynchronous generators.
+
+    Example:
+        >>> api = AsyncCiscoSparkAPI()
+        >>> room = await api.rooms.get(roomId)
+        >>> async for membership in api.memberships.list(roomId=room.id):
+        ...     print(membership.personDisplayName)
+
+    """
+
+    def __init__(self, *args, executor=None,
+                 max_workers=DEFAULT_ASYNC_MAX_WORKERS, **kwargs):
+        """Create a new AsyncCiscoSparkAPI object.
+
+        Args:
+            *args: Passed on to :class:`CiscoSparkAPI`.
+            executor(concurrent.futures.Executor): The executor used to run
+                the blocking requests. Defaults to a new ThreadPoolExecutor.
+            max_workers(int): The maximum number of worker threads used by the
+                default executor; i.e. the maximum number of concurrent
+                requests.
+            **kwargs: Passed on to :class:`CiscoSparkAPI`.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ciscosparkapiException: If an access token is not provided via the
+                access_token argument or SPARK_ACCESS_TOKEN environment
+                variable.
+
+        """
+        from . import CiscoSparkAPI
+
+        super(AsyncCiscoSparkAPI, self).__init__()
+
+        self._api = CiscoSparkAPI(*args, **kwargs)
+        self._session = AsyncRestSession(self._api._session,
+                                         executor=executor,
+                                         max_workers=max_workers)
+
+        # Spark API wrappers
+        def wrap(api, coalesced_methods=COALESCED_API_METHODS):
+            return AsyncAPIWrapper(api, self._session, coalesced_methods)
+
+        self.people = wrap(self._api.people,
+                           coalesced_methods=COALESCED_API_METHODS + ('me',))
+        self.rooms = wrap(self._api.rooms)
+        self.memberships = wrap(self._api.memberships)
+        self.messages = wrap(self._api.messages)
+        self.teams = wrap(self._api.teams)
+        self.team_memberships = wrap(self._api.team_memberships)
+        self.webhooks = wrap(self._api.webhooks)
+        self.organizations = wrap(self._api.organizations)
+        self.licenses = wrap(self._api.licenses)
+        self.roles = wrap(self._api.roles)
+        # AccessTokensAPI.get() POSTs to the API; never coalesce it
+        self.access_tokens = AsyncAPIWrapper(self._api.access_tokens,
+                                             self._session)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def session(self):
+        """The AsyncRestSession used for all API calls."""
+        return self._session
+
+    @property
+    def access_token(self):
+        """The access token used for API calls to the Cisco Spark service."""
+        return self._api.access_token
+
+    @property
+    def base_url(self):
+        """The base URL prefixed to the individual API endpoint suffixes."""
+        return self._api.base_url
+
+    @property
+    def single_request_timeout(self):
+        """Timeout (in seconds) for an single HTTP request."""
+        return self._api.single_request_timeout
+
+    @property
+    def wait_on_rate_limit(self):
+        """Automatic rate-limit handling enabled / disabled."""
+        return self._api.wait_on_rate_limit
+
+    def close(self):
+        """Release the executor resources used by this object."""
+        self._session.close()
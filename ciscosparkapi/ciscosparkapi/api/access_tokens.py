@@ -50,6 +50,8 @@ API_ENDPOINT = "access_token"
 class AccessToken(SparkData):
     """Model a Spark 'access token' JSON object as a native Python object."""
 
+    __slots__ = ()
+
     def __init__(self, json):
         """Init a new AccessToken data object from a dictionary or JSON string.
 
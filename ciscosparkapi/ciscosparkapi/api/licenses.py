@@ -38,6 +38,8 @@ from ..utils import (
 class License(SparkData):
     """Model a Spark License JSON object as a native Python object."""
 
+    __slots__ = ()
+
     def __init__(self, json):
         """Initialize a License data object from a dictionary or JSON string.
 
@@ -163,7 +165,7 @@ class LicensesAPI(object):
         check_type(licenseId, basestring, may_be_none=False)
 
         # API request
-        json_data = self._session.get('licenses/' + licenseId)
+        json_data = self._session.get_entity('licenses', licenseId)
 
         # Return a License object created from the returned JSON object
         return License(json_data)
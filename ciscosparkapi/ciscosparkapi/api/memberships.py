@@ -28,6 +28,7 @@ __license__ = "MIT"
 
 
 from ..generator_containers import generator_container
+from ..parallel import DEFAULT_MAX_CONCURRENCY, parallel_items
 from ..restsession import RestSession
 from ..sparkdata import SparkData
 from ..utils import (
@@ -39,6 +40,8 @@ from ..utils import (
 class Membership(SparkData):
     """Model a Spark 'membership' JSON object as a native Python object."""
 
+    __slots__ = ()
+
     def __init__(self, json):
         """Initialize a Membership object from a dictionary or JSON string.
 
@@ -185,6 +188,51 @@ class MembershipsAPI(object):
         for item in items:
             yield Membership(item)
 
+    @generator_container
+    def list_parallel(self, roomIds, personId=None, personEmail=None,
+                      max=None, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                      **request_parameters):
+        """List the memberships of many rooms, querying rooms in parallel.
+
+        The query is sharded by room: the memberships of each room are listed
+        by a separate `list(roomId=...)` query, and up to `max_concurrency`
+        rooms are queried at a time (each on its own connection).  The
+        memberships are yielded room by room, in the order of `roomIds`.
+
+        Args:
+            roomIds(list): The IDs of the rooms (list of strings).
+            personId(basestring): Limit results to a specific person, by ID.
+            personEmail(basestring): Limit results to a specific person, by
+                email address.
+            max(int): Limit the maximum number of items returned from the Spark
+                service per request.
+            max_concurrency(int): The maximum number of rooms queried at a
+                time.
+            **request_parameters: Additional request parameters (provides
+                support for parameters that may be added in the future).
+
+        Returns:
+            GeneratorContainer: A GeneratorContainer which, when iterated,
+                yields the memberships of the rooms.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            SparkApiError: If the Cisco Spark cloud returns an error.
+
+        """
+        check_type(roomIds, list, may_be_none=False)
+        check_type(max_concurrency, int, may_be_none=False)
+
+        shards = [
+            dict(request_parameters, roomId=roomId, personId=personId,
+                 personEmail=personEmail, max=max)
+            for roomId in roomIds
+        ]
+
+        for membership in parallel_items(self.list, shards,
+                                         max_concurrency=max_concurrency):
+            yield membership
+
     def create(self, roomId, personId=None, personEmail=None,
                isModerator=False, **request_parameters):
         """Add someone to a room by Person ID or email address.
@@ -246,7 +294,7 @@ class MembershipsAPI(object):
         check_type(membershipId, basestring, may_be_none=False)
 
         # API request
-        json_data = self._session.get('memberships/' + membershipId)
+        json_data = self._session.get_entity('memberships', membershipId)
 
         # Return a Membership object created from the response JSON data
         return Membership(json_data)
@@ -281,6 +329,9 @@ class MembershipsAPI(object):
         json_data = self._session.put('memberships/' + membershipId,
                                       json=put_data)
 
+        # Drop any cached copy of the entity
+        self._session.invalidate_entity('memberships', membershipId)
+
         # Return a Membership object created from the response JSON data
         return Membership(json_data)
 
@@ -299,3 +350,4 @@ class MembershipsAPI(object):
 
         # API request
         self._session.delete('memberships/' + membershipId)
+        self._session.invalidate_entity('memberships', membershipId)
@@ -26,23 +26,27 @@ __copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
 __license__ = "MIT"
 
 
-from requests_toolbelt import MultipartEncoder
-
 from ..generator_containers import generator_container
+from ..parallel import DEFAULT_MAX_CONCURRENCY, parallel_calls
 from ..restsession import RestSession
 from ..sparkdata import SparkData
+from ..uploads import (
+    DEFAULT_UPLOAD_CHUNK_SIZE,
+    MultipartUpload,
+    is_upload_source,
+)
 from ..utils import (
     check_type,
     dict_from_items_with_values,
     is_web_url,
-    is_local_file,
-    open_local_file,
 )
 
 
 class Message(SparkData):
     """Model a Spark 'message' JSON object as a native Python object."""
 
+    __slots__ = ()
+
     def __init__(self, json):
         """Initialize a Message data object from a dictionary or JSON string.
 
@@ -198,13 +202,21 @@ class MessagesAPI(object):
             yield Message(item)
 
     def create(self, roomId=None, toPersonId=None, toPersonEmail=None,
-               text=None, markdown=None, files=None, **request_parameters):
+               text=None, markdown=None, files=None, progress=None,
+               chunk_size=DEFAULT_UPLOAD_CHUNK_SIZE, **request_parameters):
         """Posts a message, and optionally a attachment, to a room.
 
         The files parameter is a list, which accepts multiple values to allow
         for future expansion, but currently only one file may be included with
         the message.
 
+        Local files are streamed to Cisco Spark in chunks of `chunk_size`
+        bytes (see `MultipartUpload`), so the memory used by an upload does
+        not depend on the size of the file.  Besides a path, a local file may
+        be provided as a (binary) file object, bytes, a memoryview, an
+        iterator of bytes chunks, or an EncodableFile tuple (to provide the
+        file name and content type of one of these).
+
         Args:
             roomId(basestring): The room ID.
             toPersonId(basestring): The ID of the recipient when sending a
@@ -215,10 +227,15 @@ class MessagesAPI(object):
                 specified this parameter may be optionally used to provide
                 alternate text for UI clients that do not support rich text.
             markdown(basestring): The message, in markdown format.
-            files(list): A list of public URL(s) or local path(s) to files to
-                be posted into the room. Only one file is allowed per message.
-                Uploaded files are automatically converted into a format that
-                all Spark clients can render.
+            files(list): A list of public URL(s), local path(s) or local file
+                content (see above) to be posted into the room. Only one file
+                is allowed per message. Uploaded files are automatically
+                converted into a format that all Spark clients can render.
+            progress(func): Called, as `progress(bytes_sent, total_bytes)`,
+                as a local file is uploaded; total_bytes is None if the size
+                of the upload is unknown.
+            chunk_size(int): The maximum size (in bytes) of the chunks a
+                local file is uploaded in.
             **request_parameters: Additional request parameters (provides
                 support for parameters that may be added in the future).
 
@@ -229,8 +246,8 @@ class MessagesAPI(object):
             TypeError: If the parameter types are incorrect.
             SparkApiError: If the Cisco Spark cloud returns an error.
             ValueError: If the files parameter is a list of length > 1, or if
-                the string in the list (the only element in the list) does not
-                contain a valid URL or path to a local file.
+                the element in the list (the only element in the list) is not a
+                valid URL, path to a local file, or local file content.
 
         """
         check_type(roomId, basestring)
@@ -247,7 +264,6 @@ class MessagesAPI(object):
                                  "allow for future expansion, but currently "
                                  "only one file may be included with the "
                                  "message.")
-            check_type(files[0], basestring)
 
         post_data = dict_from_items_with_values(
             request_parameters,
@@ -260,29 +276,60 @@ class MessagesAPI(object):
         )
 
         # API request
-        if not files or is_web_url(files[0]):
+        if not files or (isinstance(files[0], basestring) and
+                         not isinstance(files[0], bytes) and
+                         is_web_url(files[0])):
             # Standard JSON post
             json_data = self._session.post('messages', json=post_data)
 
-        elif is_local_file(files[0]):
-            # Multipart MIME post
-            try:
-                post_data['files'] = open_local_file(files[0])
-                multipart_data = MultipartEncoder(post_data)
-                headers = {'Content-type': multipart_data.content_type}
-                json_data = self._session.post('messages',
-                                               headers=headers,
-                                               data=multipart_data)
-            finally:
-                post_data['files'].file_object.close()
+        elif is_upload_source(files[0]):
+            # Streaming multipart MIME post
+            source = post_data.pop('files')[0]
+            multipart_data = MultipartUpload(post_data, source,
+                                             chunk_size=chunk_size,
+                                             progress=progress)
+            headers = {'Content-type': multipart_data.content_type}
+            json_data = self._session.post('messages',
+                                           headers=headers,
+                                           data=multipart_data)
 
         else:
             raise ValueError("The `files` parameter does not contain a vaild "
-                             "URL or path to a local file.")
+                             "URL, path to a local file or local file "
+                             "content.")
 
         # Return a Message object created from the response JSON data
         return Message(json_data)
 
+    def create_many(self, messages, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+        """Post many messages (i.e. file uploads to different rooms) at once.
+
+        The messages are posted concurrently, at most `max_concurrency` at a
+        time, each on its own (pooled) connection; size the session's
+        `pool_maxsize` to (at least) `max_concurrency`.
+
+        Args:
+            messages(list): The keyword arguments (dicts) of the `create()`
+                call for each message; i.e.
+                `[{'roomId': room_id, 'files': [path]}, ...]`.
+            max_concurrency(int): The maximum number of messages posted at a
+                time.
+
+        Returns:
+            list: The Message objects of the created messages, in the order
+                they were provided.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ValueError: If max_concurrency is less than one (1), or if a
+                message's parameters are invalid.
+            SparkApiError: If the Cisco Spark cloud returns an error.
+
+        """
+        check_type(messages, list, may_be_none=False)
+        return parallel_calls(self.create, messages,
+                              max_concurrency=max_concurrency)
+
     def get(self, messageId):
         """Get the details of a message, by ID.
 
@@ -301,7 +348,7 @@ class MessagesAPI(object):
         check_type(messageId, basestring, may_be_none=False)
 
         # API request
-        json_data = self._session.get('messages/' + messageId)
+        json_data = self._session.get_entity('messages', messageId)
 
         # Return a Message object created from the response JSON data
         return Message(json_data)
@@ -321,3 +368,4 @@ class MessagesAPI(object):
 
         # API request
         self._session.delete('messages/' + messageId)
+        self._session.invalidate_entity('messages', messageId)
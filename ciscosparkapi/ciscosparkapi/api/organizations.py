@@ -39,6 +39,8 @@ from ..utils import (
 class Organization(SparkData):
     """Model a Spark Organization JSON object as a native Python object."""
 
+    __slots__ = ()
+
     def __init__(self, json):
         """Init a Organization data object from a dictionary or JSON string.
 
@@ -153,7 +155,7 @@ class OrganizationsAPI(object):
         check_type(orgId, basestring, may_be_none=False)
 
         # API request
-        json_data = self._session.get('organizations/' + orgId)
+        json_data = self._session.get_entity('organizations', orgId)
 
         # Return a Organization object created from the returned JSON object
         return Organization(json_data)
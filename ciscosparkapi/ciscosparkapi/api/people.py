@@ -26,7 +26,11 @@ __copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
 __license__ = "MIT"
 
 
+import threading
+import time
+
 from ..generator_containers import generator_container
+from ..parallel import DEFAULT_MAX_CONCURRENCY, chunked, parallel_items
 from ..restsession import RestSession
 from ..sparkdata import SparkData
 from ..utils import (
@@ -35,9 +39,21 @@ from ..utils import (
 )
 
 
+# Module Constants
+DEFAULT_ME_CACHE_TTL = None
+MAX_IDS_PER_REQUEST = 85
+
+
+# A clock unaffected by system time changes (time.monotonic() is new in
+# Python 3.3)
+_monotonic = getattr(time, 'monotonic', time.time)
+
+
 class Person(SparkData):
     """Model a Spark person JSON object as a native Python object."""
 
+    __slots__ = ()
+
     def __init__(self, json):
         """Initialize a Person data object from a dictionary or JSON string.
 
@@ -139,22 +155,35 @@ class PeopleAPI(object):
 
     """
 
-    def __init__(self, session):
+    def __init__(self, session, me_cache_ttl=DEFAULT_ME_CACHE_TTL):
         """Initialize a new PeopleAPI object with the provided RestSession.
 
         Args:
             session(RestSession): The RESTful session object to be used for
                 API calls to the Cisco Spark service.
+            me_cache_ttl(int, float): The time (in seconds) the details of the
+                person accessing the API are cached by `me()`.  `None` (the
+                default) or `0` disables caching.
 
         Raises:
             TypeError: If the parameter types are incorrect.
 
         """
         check_type(session, RestSession)
+        check_type(me_cache_ttl, (int, float))
 
         super(PeopleAPI, self).__init__()
 
         self._session = session
+        self._me_cache_ttl = me_cache_ttl
+        self._me = None
+        self._me_expires = 0
+        self._me_lock = threading.Lock()
+
+    @property
+    def me_cache_ttl(self):
+        """Time (in seconds) the details returned by `me()` are cached."""
+        return self._me_cache_ttl
 
     @generator_container
     def list(self, email=None, displayName=None, id=None, orgId=None, max=None,
@@ -214,6 +243,48 @@ class PeopleAPI(object):
         for item in items:
             yield Person(item)
 
+    @generator_container
+    def list_parallel(self, ids, orgId=None,
+                      max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                      **request_parameters):
+        """List many people by ID, querying batches of IDs in parallel.
+
+        The query is sharded by ID: the IDs are split into batches of (up to)
+        85 IDs, each batch is listed by a separate `list(id=...)` query, and
+        up to `max_concurrency` batches are queried at a time (each on its
+        own connection).  The people are yielded batch by batch, in the order
+        of `ids`; IDs that do not match a person are skipped.
+
+        Args:
+            ids(list): The IDs of the people (list of strings).
+            orgId(basestring): The organization ID.
+            max_concurrency(int): The maximum number of batches queried at a
+                time.
+            **request_parameters: Additional request parameters (provides
+                support for parameters that may be added in the future).
+
+        Returns:
+            GeneratorContainer: A GeneratorContainer which, when iterated,
+                yields the people returned by the Cisco Spark queries.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            SparkApiError: If the Cisco Spark cloud returns an error.
+
+        """
+        check_type(ids, list, may_be_none=False)
+        check_type(max_concurrency, int, may_be_none=False)
+
+        shards = [
+            dict(request_parameters, id=','.join(batch), orgId=orgId,
+                 max=len(batch))
+            for batch in chunked(ids, MAX_IDS_PER_REQUEST)
+        ]
+
+        for person in parallel_items(self.list, shards,
+                                     max_concurrency=max_concurrency):
+            yield person
+
     def create(self, emails, displayName=None, firstName=None, lastName=None,
                avatar=None, orgId=None, roles=None, licenses=None,
                **request_parameters):
@@ -289,11 +360,61 @@ class PeopleAPI(object):
         check_type(personId, basestring, may_be_none=False)
 
         # API request
-        json_data = self._session.get('people/' + personId)
+        json_data = self._session.get_entity('people', personId)
 
         # Return a Person object created from the response JSON data
         return Person(json_data)
 
+    def get_many(self, ids, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+        """Get the details of many people, by ID, in a few requests.
+
+        Rather than making one `get()` request per person, the IDs are
+        listed in batches of (up to) 85 IDs per request, and the batches are
+        requested concurrently (see `list_parallel()`).  People held by the
+        entity cache (if enabled) are served from the cache, and the people
+        returned are added to it.
+
+        Args:
+            ids(list): The IDs of the people (list of strings).
+            max_concurrency(int): The maximum number of concurrent requests.
+
+        Returns:
+            dict: A dictionary of Person objects keyed by ID; IDs that do not
+                match a person map to None.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            SparkApiError: If the Cisco Spark cloud returns an error.
+
+        """
+        check_type(ids, list, may_be_none=False)
+
+        entity_cache = self._session.entity_cache
+        people = {}
+        requested = set()
+        missing = []
+        for personId in ids:
+            check_type(personId, basestring, may_be_none=False)
+            if personId in requested:
+                continue
+            requested.add(personId)
+            json_data = (entity_cache.get('people', personId)
+                         if entity_cache is not None else None)
+            if json_data is not None:
+                people[personId] = Person(json_data)
+            else:
+                missing.append(personId)
+
+        if missing:
+            people.update((personId, None) for personId in missing)
+            for person in self.list_parallel(missing,
+                                             max_concurrency=max_concurrency):
+                people[person.id] = person
+                if entity_cache is not None:
+                    entity_cache.set('people', person.id, person.json_data)
+
+        return people
+
     def update(self, personId, emails=None, displayName=None, firstName=None,
                lastName=None, avatar=None, orgId=None, roles=None,
                licenses=None, **request_parameters):
@@ -357,6 +478,9 @@ class PeopleAPI(object):
         # API request
         json_data = self._session.put('people/' + personId, json=put_data)
 
+        # Drop any cached copy of the entity
+        self._session.invalidate_entity('people', personId)
+
         # Return a Person object created from the returned JSON object
         return Person(json_data)
 
@@ -377,16 +501,45 @@ class PeopleAPI(object):
 
         # API request
         self._session.delete('people/' + personId)
+        self._session.invalidate_entity('people', personId)
 
-    def me(self):
+    def me(self, refresh=False):
         """Get the details of the person accessing the API.
 
+        If caching is enabled (see `me_cache_ttl`), the details are cached for
+        `me_cache_ttl` seconds; once expired, they are revalidated with Cisco
+        Spark on the next call.  Otherwise, each call requests the details.
+
+        Args:
+            refresh(bool): Ignore any cached details and revalidate them with
+                Cisco Spark.
+
+        Returns:
+            Person: A Person object with the details of the person accessing
+                the API.
+
         Raises:
+            TypeError: If the parameter types are incorrect.
             SparkApiError: If the Cisco Spark cloud returns an error.
 
         """
-        # API request
-        json_data = self._session.get('people/me')
+        check_type(refresh, bool, may_be_none=False)
 
-        # Return a Person object created from the response JSON data
-        return Person(json_data)
+        if not self._me_cache_ttl:
+            # API request
+            json_data = self._session.get('people/me')
+
+            # Return a Person object created from the response JSON data
+            return Person(json_data)
+
+        with self._me_lock:
+            if refresh or self._me is None or \
+                    _monotonic() >= self._me_expires:
+                # API request
+                json_data = self._session.get('people/me')
+
+                # Cache a Person object created from the response JSON data
+                self._me = Person(json_data)
+                self._me_expires = _monotonic() + self._me_cache_ttl
+
+            return self._me
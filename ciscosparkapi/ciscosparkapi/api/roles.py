@@ -38,6 +38,8 @@ from ..utils import (
 class Role(SparkData):
     """Model a Spark Role JSON object as a native Python object."""
 
+    __slots__ = ()
+
     def __init__(self, json):
         """Initialize a new Role data object from a dictionary or JSON string.
 
@@ -146,7 +148,7 @@ class RolesAPI(object):
         check_type(roleId, basestring, may_be_none=False)
 
         # API request
-        json_data = self._session.get('roles/' + roleId)
+        json_data = self._session.get_entity('roles', roleId)
 
         # Return a Role object created from the returned JSON object
         return Role(json_data)
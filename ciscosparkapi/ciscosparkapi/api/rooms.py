@@ -38,6 +38,8 @@ from ..utils import (
 class Room(SparkData):
     """Model a Spark 'room' JSON object as a native Python object."""
 
+    __slots__ = ()
+
     def __init__(self, json):
         """Initialize a Room data object from a dictionary or JSON string.
 
@@ -228,7 +230,7 @@ class RoomsAPI(object):
         check_type(roomId, basestring, may_be_none=False)
 
         # API request
-        json_data = self._session.get('rooms/' + roomId)
+        json_data = self._session.get_entity('rooms', roomId)
 
         # Return a Room object created from the response JSON data
         return Room(json_data)
@@ -261,6 +263,9 @@ class RoomsAPI(object):
         # API request
         json_data = self._session.put('rooms/' + roomId, json=put_data)
 
+        # Drop any cached copy of the entity
+        self._session.invalidate_entity('rooms', roomId)
+
         # Return a Room object created from the response JSON data
         return Room(json_data)
 
@@ -279,3 +284,4 @@ class RoomsAPI(object):
 
         # API request
         self._session.delete('rooms/' + roomId)
+        self._session.invalidate_entity('rooms', roomId)
@@ -40,6 +40,8 @@ class TeamMembership(SparkData):
     """Model a Spark 'team membership' JSON object as a native Python object.
     """
 
+    __slots__ = ()
+
     def __init__(self, json):
         """Initialize a TeamMembership object from a dictionary or JSON string.
 
@@ -225,7 +227,7 @@ class TeamMembershipsAPI(object):
         check_type(membershipId, basestring, may_be_none=False)
 
         # API request
-        json_data = self._session.get('team/memberships/' + membershipId)
+        json_data = self._session.get_entity('team/memberships', membershipId)
 
         # Return a TeamMembership object created from the response JSON data
         return TeamMembership(json_data)
@@ -260,6 +262,9 @@ class TeamMembershipsAPI(object):
         json_data = self._session.put('team/memberships/' + membershipId,
                                       json=put_data)
 
+        # Drop any cached copy of the entity
+        self._session.invalidate_entity('team/memberships', membershipId)
+
         # Return a TeamMembership object created from the response JSON data
         return TeamMembership(json_data)
 
@@ -278,3 +283,4 @@ class TeamMembershipsAPI(object):
 
         # API request
         self._session.delete('team/memberships/' + membershipId)
+        self._session.invalidate_entity('team/memberships', membershipId)
@@ -38,6 +38,8 @@ from ..utils import (
 class Team(SparkData):
     """Model a Spark 'team' JSON object as a native Python object."""
 
+    __slots__ = ()
+
     def __init__(self, json):
         """Initialize a new Team data object from a dictionary or JSON string.
 
@@ -187,7 +189,7 @@ class TeamsAPI(object):
         check_type(teamId, basestring, may_be_none=False)
 
         # API request
-        json_data = self._session.get('teams/' + teamId)
+        json_data = self._session.get_entity('teams', teamId)
 
         # Return a Team object created from the response JSON data
         return Team(json_data)
@@ -220,6 +222,9 @@ class TeamsAPI(object):
         # API request
         json_data = self._session.put('teams/' + teamId, json=put_data)
 
+        # Drop any cached copy of the entity
+        self._session.invalidate_entity('teams', teamId)
+
         # Return a Team object created from the response JSON data
         return Team(json_data)
 
@@ -238,3 +243,4 @@ class TeamsAPI(object):
 
         # API request
         self._session.delete('teams/' + teamId)
+        self._session.invalidate_entity('teams', teamId)
@@ -41,6 +41,8 @@ from .rooms import Room
 class Webhook(SparkData):
     """Model a Spark 'webhook' JSON object as a native Python object."""
 
+    __slots__ = ()
+
     def __init__(self, json):
         """Init a new Webhook data object from a dictionary or JSON string.
 
@@ -133,6 +135,8 @@ class Webhook(SparkData):
 class WebhookEvent(SparkData):
     """Model a Spark webhook event JSON object as a native Python object."""
 
+    __slots__ = ('_data',)
+
     def __init__(self, json):
         """Init a WebhookEvent data object from a JSON dictionary or string.
 
@@ -376,7 +380,7 @@ class WebhooksAPI(object):
         check_type(webhookId, basestring, may_be_none=False)
 
         # API request
-        json_data = self._session.get('webhooks/' + webhookId)
+        json_data = self._session.get_entity('webhooks', webhookId)
 
         # Return a Webhook object created from the response JSON data
         return Webhook(json_data)
@@ -414,6 +418,9 @@ class WebhooksAPI(object):
         # API request
         json_data = self._session.put('webhooks/' + webhookId, json=put_data)
 
+        # Drop any cached copy of the entity
+        self._session.invalidate_entity('webhooks', webhookId)
+
         # Return a Webhook object created from the response JSON data
         return Webhook(json_data)
 
@@ -432,3 +439,4 @@ class WebhooksAPI(object):
 
         # API request
         self._session.delete('webhooks/' + webhookId)
+        self._session.invalidate_entity('webhooks', webhookId)
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""EntityCache class for caching Cisco Spark entities.
+
+Classes:
+    EntityCache: A size-bounded LRU cache, with per-resource TTLs, for the
+        JSON data of Cisco Spark entities (people, rooms, etc.).
+
+"""
+
+
+# Use future for Python v2 and v3 compatibility
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+from builtins import *
+from past.builtins import basestring
+
+
+__author__ = "Chris Lunsford"
+__author_email__ = "chrlunsf@cisco.com"
+__copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
+__license__ = "MIT"
+
+
+from collections import OrderedDict
+import threading
+import time
+
+from .utils import check_type
+
+
+# Module Constants
+DEFAULT_ENTITY_CACHE_MAX_SIZE = 1024
+DEFAULT_ENTITY_CACHE_TTL = 60
+
+
+class EntityCache(object):
+    """Size-bounded LRU cache for the JSON data of Cisco Spark entities.
+
+    Entries are keyed by resource (the API endpoint; i.e. 'people', 'rooms',
+    etc.) and entity ID, and expire `ttl` seconds after they are cached.  The
+    TTL may be overridden per resource; a resource TTL of `0` disables
+    caching for that resource, and a TTL of `None` caches its entities until
+    they are evicted or invalidated.
+
+    When the cache is full, the least-recently-used entry is evicted.  The
+    cache is safe for use by multiple threads.
+
+    """
+
+    def __init__(self, max_size=DEFAULT_ENTITY_CACHE_MAX_SIZE,
+                 ttl=DEFAULT_ENTITY_CACHE_TTL, resource_ttls=None):
+        """Initialize a new EntityCache object.
+
+        Args:
+            max_size(int): The maximum number of entities held by the cache.
+            ttl(int, float): The default time (in seconds) entities are
+                cached.
+            resource_ttls(dict): Per-resource TTLs; i.e. {'people': 300}.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ValueError: If max_size is less than one (1).
+
+        """
+        check_type(max_size, int, may_be_none=False)
+        check_type(ttl, (int, float))
+        check_type(resource_ttls, dict)
+        if max_size < 1:
+            raise ValueError("max_size must be greater than zero (0).")
+
+        super(EntityCache, self).__init__()
+
+        self._max_size = max_size
+        self._ttl = ttl
+        self._resource_ttls = dict(resource_ttls or {})
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def max_size(self):
+        """The maximum number of entities held by the cache."""
+        return self._max_size
+
+    @property
+    def ttl(self):
+        """The default time (in seconds) entities are cached."""
+        return self._ttl
+
+    @property
+    def hits(self):
+        """The number of lookups served from the cache."""
+        return self._hits
+
+    @property
+    def misses(self):
+        """The number of lookups not served from the cache."""
+        return self._misses
+
+    @property
+    def evictions(self):
+        """The number of entries evicted to make room for new entries."""
+        return self._evictions
+
+    def resource_ttl(self, resource):
+        """The time (in seconds) entities of a resource type are cached."""
+        return self._resource_ttls.get(resource, self._ttl)
+
+    def get(self, resource, entity_id):
+        """Get the cached JSON data for an entity.
+
+        Args:
+            resource(basestring): The resource (API endpoint) of the entity.
+            entity_id(basestring): The ID of the entity.
+
+        Returns:
+            The cached JSON data, or None if the entity isn't cached (or its
+            entry has expired).
+
+        """
+        key = (resource, entity_id)
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            expires, json_data = entry
+            if expires is not None and time.time() >= expires:
+                self._misses += 1
+                return None
+
+            # Re-insert the entry as the most-recently-used
+            self._entries[key] = entry
+            self._hits += 1
+            return json_data
+
+    def set(self, resource, entity_id, json_data):
+        """Cache the JSON data for an entity.
+
+        Args:
+            resource(basestring): The resource (API endpoint) of the entity.
+            entity_id(basestring): The ID of the entity.
+            json_data: The JSON data to be cached.
+
+        """
+        ttl = self.resource_ttl(resource)
+        if ttl == 0:
+            return
+
+        expires = None if ttl is None else time.time() + ttl
+        key = (resource, entity_id)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (expires, json_data)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, resource, entity_id):
+        """Remove an entity from the cache."""
+        with self._lock:
+            self._entries.pop((resource, entity_id), None)
+
+    def clear(self, resource=None):
+        """Remove all entities (of a resource type) from the cache.
+
+        Args:
+            resource(basestring): Only remove the entities of this resource
+                type.  Defaults to removing all entities.
+
+        """
+        check_type(resource, basestring)
+        with self._lock:
+            if resource is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == resource]:
+                    del self._entries[key]
+
+    def stats(self):
+        """Return a dictionary of the cache statistics."""
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'max_size': self._max_size,
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+            }
+
+    def __len__(self):
+        """The number of entities currently held by the cache."""
+        return len(self._entries)
@@ -19,15 +19,48 @@ __copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
 __license__ = "MIT"
 
 
+import email.utils
 import sys
 import textwrap
+import time
 
 import requests
 
 from .response_codes import SPARK_RESPONSE_CODES
 
 
+# Module Constants
+DEFAULT_RETRY_AFTER = 200
+
+
 # Helper functions
+def parse_retry_after(value, default=DEFAULT_RETRY_AFTER):
+    """Parse a `Retry-After` header value into a number of seconds.
+
+    RFC 7231 allows the value to be a number of seconds or an HTTP-date;
+    fractional seconds are also accepted.  Dates are converted into the
+    (non-negative) number of seconds from now.  If the value is missing,
+    cannot be parsed, or is not a finite number, `default` is returned.
+
+    """
+    if value is None:
+        return default
+    value = value.strip()
+    for number_type in (int, float):
+        try:
+            seconds = number_type(value)
+        except ValueError:
+            continue
+        # Rejects negative values, and (parsed floats) 'inf' and 'nan'
+        return seconds if 0 <= seconds < float('inf') else default
+
+    parsed_date = email.utils.parsedate_tz(value)
+    if parsed_date is None:
+        return default
+    return max(0, int(round(email.utils.mktime_tz(parsed_date) -
+                            time.time())))
+
+
 def sanitize(header_tuple):
     """Sanitize request headers.
 
@@ -114,7 +147,14 @@ class ciscosparkapiException(Exception):
 
 
 class SparkApiError(ciscosparkapiException):
-    """Errors returned by requests to the Cisco Spark cloud APIs."""
+    """Errors returned by requests to the Cisco Spark cloud APIs.
+
+    The detailed error report (the formatted request and response) is only
+    rendered when the exception is converted to a string, so creating (and
+    handling) API errors that are never displayed, i.e. rate-limit responses
+    that are retried, is cheap.
+
+    """
 
     def __init__(self, response):
         assert isinstance(response, requests.Response)
@@ -126,18 +166,33 @@ class SparkApiError(ciscosparkapiException):
         self.response = response
         """The :class:`requests.Response` object returned from the API call."""
 
-        # Error message
-        response_code = response.status_code
+        self.status_code = response.status_code
+        """The HTTP status code of the API response."""
+
+        self.tracking_id = response.headers.get('TrackingID')
+        """The Cisco Spark `TrackingID` of the API call (if provided)."""
+
+        # Error message; the detailed report is rendered on demand
         response_reason = " " + response.reason if response.reason else ""
-        description = SPARK_RESPONSE_CODES.get(response_code,
+        description = SPARK_RESPONSE_CODES.get(self.status_code,
                                                "Unknown Response Code")
-        detail = response_to_string(response)
+        self._details = None
 
-        super(SparkApiError, self).__init__("Response Code [{}]{} - {}\n{}"
-                                            "".format(response_code,
+        super(SparkApiError, self).__init__("Response Code [{}]{} - {}"
+                                            "".format(self.status_code,
                                                       response_reason,
-                                                      description,
-                                                      detail))
+                                                      description))
+
+    @property
+    def details(self):
+        """A human readable report of the API request and response."""
+        if self._details is None:
+            self._details = response_to_string(self.response)
+        return self._details
+
+    def __str__(self):
+        """The error message, followed by the detailed request report."""
+        return "{}\n{}".format(self.args[0], self.details)
 
 
 class SparkRateLimitError(SparkApiError):
@@ -147,10 +202,12 @@ class SparkRateLimitError(SparkApiError):
         super(SparkRateLimitError, self).__init__(response)
 
         # Extended exception data attributes
-        self.retry_after = response.headers.get('Retry-After', 200)
+        self.retry_after = parse_retry_after(
+            response.headers.get('Retry-After')
+        )
         """The `Retry-After` time period (in seconds) provided by Cisco Spark.
 
         Defaults to 200 seconds if the response `Retry-After` header isn't
-        present in the response headers.
+        present in the response headers (or cannot be parsed).
 
         """
@@ -0,0 +1,409 @@
+# -*- coding: utf-8 -*-
+"""Bulk export of Cisco Spark list results to columnar and flat files.
+
+Functions:
+    export_items: Stream items (JSON objects) into a Parquet, CSV or JSON
+        Lines file, in batches, without creating per-item model objects.
+    batched: Split an iterable into lists of a maximum size.
+    infer_column_types: Infer the (Parquet) column types of a batch of items.
+    coerce_value: Convert a JSON value to a column's type.
+
+"""
+
+
+# Use future for Python v2 and v3 compatibility
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+from builtins import *
+from past.builtins import basestring
+
+
+__author__ = "Chris Lunsford"
+__author_email__ = "chrlunsf@cisco.com"
+__copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
+__license__ = "MIT"
+
+
+import csv
+import io
+import json
+import numbers
+import os
+import sys
+import warnings
+
+from .utils import check_type
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+# Module Constants
+DEFAULT_EXPORT_BATCH_SIZE = 1000
+EXPORT_FORMATS = {
+    '.jsonl': 'jsonl',
+    '.json': 'jsonl',
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+}
+COLUMN_TYPES = ('string', 'int', 'float', 'bool', 'json')
+
+
+def batched(iterable, size):
+    """Yield lists of (at most) `size` items from an iterable."""
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def export_items(items, destination, format=None, columns=None,
+                 batch_size=DEFAULT_EXPORT_BATCH_SIZE, column_types=None):
+    """Stream items (JSON objects) into a Parquet, CSV or JSON Lines file.
+
+    The items are consumed (and written) in batches of `batch_size` items, so
+    that only one batch is held in memory at a time; when the items are
+    produced by `RestSession.get_items()`, pages are requested as the batches
+    are written.
+
+    If `columns` is not provided, the columns are the keys of the items in the
+    first batch (in the order they are first seen); keys that only appear in
+    later items are not exported, and a warning is issued.  When there are no
+    items, an empty file is written; with a header row (CSV) or schema
+    (Parquet) if the `columns` are provided.
+
+    Parquet column types are fixed when the file is created.  Types that are
+    not provided in `column_types` are inferred from the first batch:
+    columns with no values in the first batch are strings, and nested values
+    (objects and lists) are stored as JSON strings.  Later values are
+    converted to their column's type (any value may be stored in a string
+    column); a ValueError is raised if a value cannot be converted, i.e. a
+    non-integral number in an 'int' column.
+
+    Args:
+        items(iterable): The items (dictionaries) to be exported.
+        destination(basestring, file): The path of the output file, or a file
+            object (a text file for 'jsonl' and 'csv', a binary file for
+            'parquet').
+        format(basestring): 'parquet', 'csv' or 'jsonl'.  Defaults to the
+            format implied by the destination file's extension.
+        columns(list): The item keys to be exported.
+        batch_size(int): The number of items written per batch (Parquet row
+            group).
+        column_types(dict): The Parquet types of (some of) the columns; one
+            of 'string', 'int', 'float', 'bool' or 'json' (a JSON-encoded
+            string) per column name.
+
+    Returns:
+        int: The number of items exported.
+
+    Raises:
+        TypeError: If the parameter types are incorrect.
+        ValueError: If the format cannot be determined or is not supported,
+            or if a value cannot be converted to its Parquet column's type.
+        ImportError: If the 'parquet' format is requested but the pyarrow
+            package is not installed.
+
+    """
+    check_type(format, basestring)
+    check_type(columns, list)
+    check_type(batch_size, int, may_be_none=False)
+    check_type(column_types, dict)
+    if batch_size < 1:
+        raise ValueError("batch_size must be greater than zero (0).")
+    for column, column_type in (column_types or {}).items():
+        if column_type not in COLUMN_TYPES:
+            raise ValueError("Unsupported type {!r} for column {!r}; expected "
+                             "one of: {}.".format(column_type, column,
+                                                  ", ".join(COLUMN_TYPES)))
+
+    format = format or _format_from_path(destination)
+    if format not in ('jsonl', 'csv', 'parquet'):
+        raise ValueError("Unsupported export format {!r}; expected one of: "
+                         "'parquet', 'csv', 'jsonl'.".format(format))
+    if format == 'parquet' and pyarrow is None:
+        raise ImportError("The 'parquet' export format requires the pyarrow "
+                          "package.")
+
+    batches = batched(items, batch_size)
+    if format == 'parquet':
+        return _write_parquet(batches, destination, columns,
+                              column_types or {})
+    elif format == 'csv':
+        return _write_csv(batches, destination, columns)
+    else:
+        return _write_jsonl(batches, destination, columns)
+
+
+def _format_from_path(destination):
+    """The export format implied by the destination file's extension."""
+    if isinstance(destination, basestring):
+        extension = os.path.splitext(destination)[1].lower()
+        if extension in EXPORT_FORMATS:
+            return EXPORT_FORMATS[extension]
+    raise ValueError("The export format could not be determined from the "
+                     "destination; please specify the format.")
+
+
+def _columns(batch):
+    """The keys of the items in a batch, in the order they are first seen."""
+    columns = []
+    seen = set()
+    for item in batch:
+        for key in item:
+            if key not in seen:
+                seen.add(key)
+                columns.append(key)
+    return columns
+
+
+def _warn_dropped_keys(batch, columns, dropped):
+    """Warn (once per key) about item keys that are not exported columns."""
+    new_keys = set()
+    for item in batch:
+        new_keys.update(key for key in item
+                        if key not in columns and key not in dropped)
+    if new_keys:
+        dropped.update(new_keys)
+        warnings.warn("Item keys first seen after the first batch are not "
+                      "exported: {}.  Pass the `columns` to be exported."
+                      "".format(", ".join(sorted(new_keys))), Warning)
+
+
+def _open_text(destination):
+    """Open a destination path for writing text; or pass a file through."""
+    if isinstance(destination, basestring):
+        return io.open(destination, 'w', encoding='utf-8', newline=''), True
+    return destination, False
+
+
+def _json_line(item):
+    """Encode an item as a (unicode) line of JSON text."""
+    line = json.dumps(item, ensure_ascii=False)
+    # Python 2's json.dumps() returns a byte string for ASCII-only data
+    return line.decode('utf-8') if isinstance(line, bytes) else line
+
+
+class _TextCSVWriter(object):
+    """A csv.writer for text files on Python 2.
+
+    Python 2's csv module only writes byte strings; the rows are written to a
+    buffer as UTF-8 encoded bytes, and then decoded and written to the file.
+
+    """
+
+    def __init__(self, file):
+        self._file = file
+        self._buffer = io.BytesIO()
+        self._writer = csv.writer(self._buffer)
+
+    def writerow(self, row):
+        self.writerows([row])
+
+    def writerows(self, rows):
+        self._writer.writerows(
+            [value.encode('utf-8')
+             if isinstance(value, basestring) and not isinstance(value, bytes)
+             else value for value in row]
+            for row in rows
+        )
+        self._file.write(self._buffer.getvalue().decode('utf-8'))
+        self._buffer.seek(0)
+        self._buffer.truncate()
+
+
+def _csv_writer(file):
+    """A CSV writer for a text file."""
+    if sys.version_info[0] < 3:
+        return _TextCSVWriter(file)
+    return csv.writer(file)
+
+
+def _csv_value(value):
+    """Flatten a JSON value for a CSV cell; nested values are JSON encoded."""
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list)):
+        return _json_line(value)
+    return value
+
+
+def _write_jsonl(batches, destination, columns):
+    """Write the batches of items as JSON Lines; one JSON object per line."""
+    file, close = _open_text(destination)
+    count = 0
+    try:
+        for batch in batches:
+            lines = []
+            for item in batch:
+                if columns is not None:
+                    item = {key: item.get(key) for key in columns}
+                lines.append(_json_line(item))
+            file.write('\n'.join(lines) + '\n')
+            count += len(batch)
+    finally:
+        if close:
+            file.close()
+    return count
+
+
+def _write_csv(batches, destination, columns):
+    """Write the batches of items as CSV rows, with a header row."""
+    file, close = _open_text(destination)
+    writer = None
+    dropped = None
+    count = 0
+    try:
+        for batch in batches:
+            if writer is None:
+                if columns is None:
+                    columns = _columns(batch)
+                    dropped = set()
+                writer = _csv_writer(file)
+                writer.writerow(columns)
+            elif dropped is not None:
+                _warn_dropped_keys(batch, columns, dropped)
+            writer.writerows([_csv_value(item.get(key)) for key in columns]
+                             for item in batch)
+            count += len(batch)
+
+        if writer is None and columns is not None:
+            # No items; write the header row
+            _csv_writer(file).writerow(columns)
+    finally:
+        if close:
+            file.close()
+    return count
+
+
+def _write_parquet(batches, destination, columns, column_types):
+    """Write each batch of items as a Parquet row group."""
+    writer = None
+    dropped = None
+    count = 0
+    try:
+        for batch in batches:
+            if writer is None:
+                if columns is None:
+                    columns = _columns(batch)
+                    dropped = set()
+                types = infer_column_types(batch, columns, column_types)
+                schema = _arrow_schema(columns, types)
+                writer = pyarrow.parquet.ParquetWriter(destination, schema)
+            elif dropped is not None:
+                _warn_dropped_keys(batch, columns, dropped)
+            table = pyarrow.Table.from_pydict(
+                {column: [coerce_value(item.get(column), types[column], column)
+                          for item in batch]
+                 for column in columns},
+                schema=schema,
+            )
+            writer.write_table(table)
+            count += len(batch)
+
+        if writer is None and columns is not None:
+            # No items; write the schema (with no row groups)
+            types = infer_column_types([], columns, column_types)
+            writer = pyarrow.parquet.ParquetWriter(
+                destination, _arrow_schema(columns, types)
+            )
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
+
+
+def _arrow_schema(columns, column_types):
+    """The Arrow schema of the columns (and their column types)."""
+    return pyarrow.schema([
+        pyarrow.field(column, _arrow_type(column_types[column]))
+        for column in columns
+    ])
+
+
+def _arrow_type(column_type):
+    """The Arrow data type of a column type."""
+    return {
+        'string': pyarrow.string,
+        'json': pyarrow.string,
+        'int': pyarrow.int64,
+        'float': pyarrow.float64,
+        'bool': pyarrow.bool_,
+    }[column_type]()
+
+
+def _value_type(value):
+    """The column type of a (non-null) JSON value."""
+    if isinstance(value, bool):
+        return 'bool'
+    if isinstance(value, numbers.Integral):
+        return 'int'
+    if isinstance(value, numbers.Real):
+        return 'float'
+    if isinstance(value, basestring):
+        return 'string'
+    return 'json'
+
+
+def infer_column_types(batch, columns, column_types=None):
+    """Infer the column types from a batch of items.
+
+    Types provided in `column_types` are used as is.  A column is typed by
+    the values it has in the batch: 'bool', 'int', 'float' (ints and floats),
+    'string' or 'json' (if any value is an object or a list); columns with no
+    values, or with values of other mixed types, are typed as strings.
+
+    """
+    types = {}
+    for column in columns:
+        if column_types and column in column_types:
+            types[column] = column_types[column]
+            continue
+        value_types = {_value_type(item.get(column)) for item in batch
+                       if item.get(column) is not None}
+        if 'json' in value_types:
+            types[column] = 'json'
+        elif value_types == {'int', 'float'}:
+            types[column] = 'float'
+        elif len(value_types) == 1:
+            types[column] = value_types.pop()
+        else:
+            types[column] = 'string'
+    return types
+
+
+def coerce_value(value, column_type, column=None):
+    """Convert a JSON value to a column's type (None is kept as a null).
+
+    Raises:
+        ValueError: If the value cannot be converted to the column's type.
+
+    """
+    if value is None:
+        return None
+    value_type = _value_type(value)
+    if column_type == 'json':
+        return _json_line(value)
+    if column_type == 'string':
+        return value if value_type == 'string' else _json_line(value)
+    if column_type == value_type:
+        return value
+    if column_type == 'float' and value_type == 'int':
+        return float(value)
+    if column_type == 'int' and value_type == 'float' and \
+            float(value).is_integer():
+        return int(value)
+    raise ValueError("The value {!r} of column {!r} cannot be stored in a "
+                     "{!r} column; pass the column's type in `column_types`."
+                     "".format(value, column, column_type))
@@ -0,0 +1,469 @@
+# -*- coding: utf-8 -*-
+"""HTTP response caches for revalidating (conditional) GET requests.
+
+Classes:
+    CachedResponse: A cached response; its validators and parsed JSON data.
+    ResponseCache: A size-bounded, in-memory LRU cache of GET responses.
+    DiskResponseCache: A ResponseCache persisted to a local directory.
+
+"""
+
+
+# Use future for Python v2 and v3 compatibility
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+from builtins import *
+from past.builtins import basestring
+
+
+__author__ = "Chris Lunsford"
+__author_email__ = "chrlunsf@cisco.com"
+__copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
+__license__ = "MIT"
+
+
+import atexit
+from collections import namedtuple, OrderedDict
+import hashlib
+import io
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import weakref
+
+from .utils import check_type, copy_json
+
+
+# Module Constants
+DEFAULT_RESPONSE_CACHE_MAX_ENTRIES = 1024
+DEFAULT_RESPONSE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_DISK_CACHE_MEMORY_ENTRIES = 128
+DISK_CACHE_INDEX_FILE = 'index.json'
+DISK_CACHE_INDEX_BATCH = 64         # Changes between index writes
+DISK_CACHE_INDEX_INTERVAL = 10      # Max. seconds between index writes
+DISK_CACHE_FILE_NAME = re.compile(r'^[0-9a-f]{40}\.json$')
+
+
+# Atomically replace a file (os.replace() is new in Python 3.3; os.rename()
+# replaces existing files on POSIX systems)
+_replace_file = getattr(os, 'replace', os.rename)
+
+
+# A clock unaffected by system time changes (time.monotonic() is new in
+# Python 3.3)
+_monotonic = getattr(time, 'monotonic', time.time)
+
+
+def _flush_at_exit(cache_reference):
+    """Write the index of a DiskResponseCache (if it still exists)."""
+    cache = cache_reference()
+    if cache is not None:
+        cache.flush()
+
+
+CachedResponse = namedtuple('CachedResponse',
+                            ['etag', 'last_modified', 'json_data'])
+
+
+class ResponseCache(object):
+    """Size-bounded, in-memory LRU cache of GET responses.
+
+    Responses carrying validators (an `ETag` and/or `Last-Modified` header)
+    are cached with their parsed JSON data.  Subsequent GETs for the same URL
+    (and parameters) are sent as conditional requests (`If-None-Match` /
+    `If-Modified-Since`); when Cisco Spark responds `304 Not Modified`, the
+    cached JSON data is served without downloading or parsing the body.
+
+    The cache keeps its own copy of the JSON data it stores; the cached JSON
+    data must not be modified (RestSession returns a copy of it to each
+    caller).  The cache is safe for use by multiple threads.
+
+    """
+
+    def __init__(self, max_entries=DEFAULT_RESPONSE_CACHE_MAX_ENTRIES):
+        """Initialize a new ResponseCache object.
+
+        Args:
+            max_entries(int): The maximum number of responses held by the
+                cache.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ValueError: If max_entries is less than one (1).
+
+        """
+        check_type(max_entries, int, may_be_none=False)
+        if max_entries < 1:
+            raise ValueError("max_entries must be greater than zero (0).")
+
+        super(ResponseCache, self).__init__()
+
+        self._max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._evictions = 0
+
+    @property
+    def max_entries(self):
+        """The maximum number of responses held by the cache."""
+        return self._max_entries
+
+    @property
+    def hits(self):
+        """The number of GETs served from the cache (304 responses)."""
+        return self._hits
+
+    @property
+    def misses(self):
+        """The number of GETs that downloaded a (new) response body."""
+        return self._misses
+
+    @staticmethod
+    def validators(response):
+        """The (ETag, Last-Modified) validators of a response, or None."""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            return etag, last_modified
+        return None
+
+    @staticmethod
+    def conditional_headers(cached_response):
+        """The conditional request headers used to revalidate a response."""
+        headers = {}
+        if cached_response.etag:
+            headers['If-None-Match'] = cached_response.etag
+        if cached_response.last_modified:
+            headers['If-Modified-Since'] = cached_response.last_modified
+        return headers
+
+    def get(self, key):
+        """Get a cached response (CachedResponse), or None."""
+        with self._lock:
+            cached_response = self._entries.pop(key, None)
+            if cached_response is not None:
+                # Re-insert the entry as the most-recently-used
+                self._entries[key] = cached_response
+            return cached_response
+
+    def record_hit(self, key):
+        """Record that a cached response was revalidated (304)."""
+        with self._lock:
+            self._hits += 1
+
+    def store(self, key, response, json_data):
+        """Cache a response's parsed JSON data, if it carries validators.
+
+        Args:
+            key: The cache key of the request (see `request_key()`).
+            response(requests.Response): The response.
+            json_data: The response's parsed JSON data.
+
+        """
+        validators = self.validators(response)
+        with self._lock:
+            self._misses += 1
+        if validators is None:
+            self.invalidate(key)
+            return
+
+        self._put(key, CachedResponse(validators[0], validators[1],
+                                      copy_json(json_data)))
+
+    def invalidate(self, key):
+        """Remove a response from the cache."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Remove all responses from the cache."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return a dictionary of the cache statistics."""
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'max_entries': self._max_entries,
+                'hits': self._hits,
+                'misses': self._misses,
+                'stores': self._stores,
+                'evictions': self._evictions,
+            }
+
+    def __len__(self):
+        """The number of responses currently held by the cache."""
+        return len(self._entries)
+
+    def _put(self, key, cached_response):
+        """Add a response to the cache; evict the least-recently-used."""
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = cached_response
+            self._stores += 1
+            while len(self._entries) > self._max_entries:
+                self._evict()
+
+    def _evict(self):
+        """Evict the least-recently-used entry (the lock must be held)."""
+        self._entries.popitem(last=False)
+        self._evictions += 1
+
+
+class DiskResponseCache(ResponseCache):
+    """ResponseCache persisted to a local directory.
+
+    Each cached response is stored as a JSON file in `directory`; so that
+    cached responses survive process restarts (i.e. nightly jobs).  The total
+    size of the stored files is bounded by `max_bytes`; the least-recently-
+    used responses are removed to stay within the limit.  The most recently
+    used responses are also kept (parsed) in memory, so that revalidated
+    responses are not read from disk again.
+
+    The files are written to a temporary file and then renamed into place; so
+    a response is never read while it is partially written.  The cache keys
+    (and their order) are kept in an index file, which is read when the cache
+    is created instead of every stored response.  The index is written after
+    every `DISK_CACHE_INDEX_BATCH` changes (or `DISK_CACHE_INDEX_INTERVAL`
+    seconds), by `flush()`, and when the interpreter exits; responses stored
+    after the last index write are discarded when the cache is next created.
+
+    """
+
+    def __init__(self, directory,
+                 max_entries=DEFAULT_RESPONSE_CACHE_MAX_ENTRIES,
+                 max_bytes=DEFAULT_RESPONSE_CACHE_MAX_BYTES,
+                 memory_entries=DEFAULT_DISK_CACHE_MEMORY_ENTRIES):
+        """Initialize a new DiskResponseCache object.
+
+        Args:
+            directory(basestring): The directory where the responses are
+                stored (created if it does not exist).
+            max_entries(int): The maximum number of responses held by the
+                cache.
+            max_bytes(int): The maximum total size (in bytes) of the stored
+                responses.
+            memory_entries(int): The maximum number of (parsed) responses
+                also kept in memory.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+
+        """
+        check_type(directory, basestring, may_be_none=False)
+        check_type(max_bytes, int, may_be_none=False)
+        check_type(memory_entries, int, may_be_none=False)
+
+        super(DiskResponseCache, self).__init__(max_entries=max_entries)
+
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._memory_entries = memory_entries
+        self._bytes = 0
+        # key -> (file name, size); the responses themselves are on disk
+        self._index = self._entries
+        # key -> (index entry, CachedResponse); the most recently used
+        self._parsed = OrderedDict()
+        self._index_changes = 0
+        self._index_written = _monotonic()
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self._load_index()
+        atexit.register(_flush_at_exit, weakref.ref(self))
+
+    @property
+    def directory(self):
+        """The directory where the responses are stored."""
+        return self._directory
+
+    def get(self, key):
+        """Get a cached response (CachedResponse), or None."""
+        with self._lock:
+            entry = self._index.pop(key, None)
+            if entry is None:
+                return None
+            self._index[key] = entry
+
+            parsed = self._parsed.pop(key, None)
+            if parsed is not None and parsed[0] is entry:
+                self._parsed[key] = parsed
+                return parsed[1]
+
+        try:
+            with io.open(self._path(entry[0]), 'r', encoding='utf-8') as file:
+                stored = json.load(file, object_pairs_hook=OrderedDict)
+        except (IOError, OSError, ValueError):
+            with self._lock:
+                # Unless the response has been stored again since
+                if self._index.get(key) is entry:
+                    del self._index[key]
+                    self._remove_file(entry)
+                    self._index_changed()
+            return None
+
+        cached_response = CachedResponse(stored['etag'],
+                                         stored['last_modified'],
+                                         stored['json_data'])
+        with self._lock:
+            if self._index.get(key) is entry:
+                self._remember(key, entry, cached_response)
+        return cached_response
+
+    def invalidate(self, key):
+        """Remove a response from the cache."""
+        with self._lock:
+            self._parsed.pop(key, None)
+            entry = self._index.pop(key, None)
+            if entry is not None:
+                self._remove_file(entry)
+                self._index_changed()
+
+    def clear(self):
+        """Remove all responses from the cache."""
+        with self._lock:
+            self._parsed.clear()
+            while self._index:
+                self._remove_file(self._index.popitem()[1])
+            self._write_index()
+
+    def flush(self):
+        """Write the index of the stored responses, if it has changed."""
+        with self._lock:
+            if self._index_changes:
+                self._write_index()
+
+    def stats(self):
+        """Return a dictionary of the cache statistics."""
+        stats = super(DiskResponseCache, self).stats()
+        stats['bytes'] = self._bytes
+        stats['max_bytes'] = self._max_bytes
+        return stats
+
+    def _put(self, key, cached_response):
+        """Write a response to disk; evict to stay within the size limits."""
+        file_name = hashlib.sha1(json.dumps(key).encode('utf-8')).hexdigest()
+        data = json.dumps({
+            'etag': cached_response.etag,
+            'last_modified': cached_response.last_modified,
+            'json_data': cached_response.json_data,
+        }).encode('utf-8')
+
+        # Write the response outside the lock; it is renamed into place below
+        temp_path = self._write_temp_file(data)
+
+        with self._lock:
+            entry = self._index.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry[1]
+
+            _replace_file(temp_path, self._path(file_name))
+
+            entry = (file_name, len(data))
+            self._index[key] = entry
+            self._bytes += len(data)
+            self._stores += 1
+            self._remember(key, entry, cached_response)
+
+            while self._index and (len(self._index) > self._max_entries or
+                                   self._bytes > self._max_bytes):
+                self._evict()
+            self._index_changed()
+
+    def _evict(self):
+        """Evict the least-recently-used entry (the lock must be held)."""
+        key, entry = self._index.popitem(last=False)
+        self._parsed.pop(key, None)
+        self._remove_file(entry)
+        self._evictions += 1
+
+    def _remember(self, key, entry, cached_response):
+        """Keep a parsed response in memory (the lock must be held)."""
+        self._parsed.pop(key, None)
+        self._parsed[key] = (entry, cached_response)
+        while len(self._parsed) > self._memory_entries:
+            self._parsed.popitem(last=False)
+
+    def _path(self, file_name):
+        """The path of a stored response file."""
+        return os.path.join(self._directory, file_name + '.json')
+
+    def _remove_file(self, entry):
+        """Delete a stored response file (the lock must be held)."""
+        self._bytes -= entry[1]
+        try:
+            os.remove(self._path(entry[0]))
+        except OSError:
+            pass
+
+    def _write_temp_file(self, data):
+        """Write data to a new temporary file in the cache directory."""
+        fd, temp_path = tempfile.mkstemp(dir=self._directory, suffix='.tmp')
+        try:
+            with io.open(fd, 'wb') as file:
+                file.write(data)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        return temp_path
+
+    def _index_changed(self):
+        """Record a change to the index; write it once enough have been made.
+
+        The lock must be held.
+        """
+        self._index_changes += 1
+        if (self._index_changes >= DISK_CACHE_INDEX_BATCH or
+                _monotonic() - self._index_written >=
+                DISK_CACHE_INDEX_INTERVAL):
+            self._write_index()
+
+    def _write_index(self):
+        """Write the keys of the stored responses (the lock must be held)."""
+        data = json.dumps([[key, file_name]
+                           for key, (file_name, _) in self._index.items()])
+        _replace_file(self._write_temp_file(data.encode('utf-8')),
+                      os.path.join(self._directory, DISK_CACHE_INDEX_FILE))
+        self._index_changes = 0
+        self._index_written = _monotonic()
+
+    def _load_index(self):
+        """Index the responses stored by a previous process (LRU first)."""
+        try:
+            with io.open(os.path.join(self._directory, DISK_CACHE_INDEX_FILE),
+                         'r', encoding='utf-8') as file:
+                index = json.load(file)
+        except (IOError, OSError, ValueError):
+            index = []
+
+        for key, file_name in index:
+            try:
+                size = os.path.getsize(self._path(file_name))
+            except OSError:
+                continue
+            key = (key[0], tuple(tuple(item) for item in key[1]))
+            self._index[key] = (file_name, size)
+            self._bytes += size
+
+        # Remove the responses (and temporary files) that were not indexed
+        indexed = set(file_name + '.json'
+                      for file_name, _ in self._index.values())
+        for name in os.listdir(self._directory):
+            if (DISK_CACHE_FILE_NAME.match(name) and name not in indexed or
+                    name.endswith('.tmp')):
+                try:
+                    os.remove(os.path.join(self._directory, name))
+                except OSError:
+                    pass
@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+"""Request-level instrumentation (metrics and tracing) for RestSession.
+
+Classes:
+    RequestEvent: The details of a completed (or failed) API request.
+    Instrumentation: Dispatches request events to pluggable sinks.
+    MetricsSink: Prometheus-style request counters and latency histograms.
+    TracingSink: Records each request as an OpenTelemetry (client) span.
+
+A sink is any callable that accepts a RequestEvent.  When a RestSession has no
+instrumentation, no events are created; so the overhead is a single attribute
+check per request.
+
+"""
+
+
+# Use future for Python v2 and v3 compatibility
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+from builtins import *
+
+
+__author__ = "Chris Lunsford"
+__author_email__ = "chrlunsf@cisco.com"
+__copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
+__license__ = "MIT"
+
+
+from collections import namedtuple
+import bisect
+import logging
+import threading
+
+try:
+    from opentelemetry import trace
+except ImportError:
+    trace = None
+
+from .exceptions import SparkApiError
+
+
+# Module Constants
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+                           2.5, 5.0, 10.0)
+METRICS_PREFIX = 'ciscosparkapi_'
+
+
+RequestEvent = namedtuple('RequestEvent', [
+    'method',           # The request method; i.e. 'GET'
+    'url',              # The absolute URL of the request
+    'endpoint',         # The endpoint template; i.e. 'rooms/{id}'
+    'status_code',      # The final response's status code (or None)
+    'request_bytes',    # The size of the request body (0 if unknown)
+    'response_bytes',   # The size of the final response's body
+    'attempts',         # The number of attempts (1 + retries)
+    'rate_limit_wait',  # The time spent waiting on rate limits (seconds)
+    'ttfb',             # The final attempt's time to the response headers
+    'duration',         # The total time, including retries and waits
+    'start_time',       # The time the request was started (epoch seconds)
+    'error',            # The exception raised by the request (or None)
+])
+
+
+def _error_message(error):
+    """A one-line description of the exception raised by a request."""
+    if isinstance(error, SparkApiError):
+        # i.e. "Response Code [404] Not Found - The room was not found."
+        return error.args[0]
+    return str(error).split('\n')[0]
+
+
+class Instrumentation(object):
+    """Dispatches request events to pluggable sinks.
+
+    Sinks are called, in the order they were added, on the thread that made
+    the request; exceptions raised by a sink are logged and do not affect the
+    request.
+
+    """
+
+    def __init__(self, *sinks):
+        """Initialize a new Instrumentation object.
+
+        Args:
+            *sinks(func): The sinks (callables accepting a RequestEvent) the
+                events are dispatched to.
+
+        """
+        super(Instrumentation, self).__init__()
+        for sink in sinks:
+            self._check_sink(sink)
+        self._sinks = tuple(sinks)
+        self._lock = threading.Lock()
+
+    @property
+    def sinks(self):
+        """The sinks the events are dispatched to (tuple)."""
+        return self._sinks
+
+    def add_sink(self, sink):
+        """Add a sink."""
+        self._check_sink(sink)
+        with self._lock:
+            self._sinks = self._sinks + (sink,)
+
+    def remove_sink(self, sink):
+        """Remove a sink."""
+        with self._lock:
+            self._sinks = tuple(s for s in self._sinks if s != sink)
+
+    def emit(self, event):
+        """Dispatch a request event to the sinks."""
+        for sink in self._sinks:
+            try:
+                sink(event)
+            except Exception:
+                logging.getLogger(__name__).exception(
+                    "Instrumentation sink {!r} failed.".format(sink)
+                )
+
+    @staticmethod
+    def _check_sink(sink):
+        if not callable(sink):
+            raise TypeError("Instrumentation sinks must be callable; "
+                            "received: {!r}".format(sink))
+
+
+class _Histogram(object):
+    """A cumulative (Prometheus-style) histogram."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self):
+        total = 0
+        for count in self.counts:
+            total += count
+            yield total
+
+
+class MetricsSink(object):
+    """Prometheus-style request counters and latency histograms.
+
+    Metrics (labelled by method, endpoint and status):
+        requests_total: The number of requests.
+        request_errors_total: The number of failed requests.
+        request_retries_total: The number of retried attempts.
+        request_bytes_total: The request body bytes sent.
+        response_bytes_total: The response body bytes received.
+        rate_limit_wait_seconds_total: The time spent waiting on rate limits.
+        request_duration_seconds: A histogram of the request durations.
+        request_ttfb_seconds: A histogram of the times to the response headers.
+
+    Use `render()` to produce the Prometheus text exposition format (i.e. for
+    a `/metrics` handler), or `snapshot()` for a dictionary of the values.
+
+    """
+
+    COUNTERS = ('requests_total', 'request_errors_total',
+                'request_retries_total', 'request_bytes_total',
+                'response_bytes_total', 'rate_limit_wait_seconds_total')
+    HISTOGRAMS = ('request_duration_seconds', 'request_ttfb_seconds')
+
+    def __init__(self, buckets=DEFAULT_LATENCY_BUCKETS,
+                 prefix=METRICS_PREFIX):
+        """Initialize a new MetricsSink object.
+
+        Args:
+            buckets(tuple): The upper bounds (seconds) of the latency
+                histogram buckets.
+            prefix(basestring): The prefix of the metric names.
+
+        """
+        super(MetricsSink, self).__init__()
+        self._buckets = tuple(sorted(buckets))
+        self._prefix = prefix
+        self._lock = threading.Lock()
+        self._counters = {name: {} for name in self.COUNTERS}
+        self._histograms = {name: {} for name in self.HISTOGRAMS}
+
+    def __call__(self, event):
+        """Record a request event."""
+        labels = (event.method, event.endpoint,
+                  str(event.status_code) if event.status_code else 'error')
+        with self._lock:
+            self._increment('requests_total', labels, 1)
+            if event.error is not None:
+                self._increment('request_errors_total', labels, 1)
+            self._increment('request_retries_total', labels,
+                            event.attempts - 1)
+            self._increment('request_bytes_total', labels,
+                            event.request_bytes)
+            self._increment('response_bytes_total', labels,
+                            event.response_bytes)
+            self._increment('rate_limit_wait_seconds_total', labels,
+                            event.rate_limit_wait)
+            self._observe('request_duration_seconds', labels, event.duration)
+            if event.ttfb is not None:
+                self._observe('request_ttfb_seconds', labels, event.ttfb)
+
+    def snapshot(self):
+        """Return a dictionary of the metric values.
+
+        Counters are returned as {labels: value}, and histograms as
+        {labels: {'count': ..., 'sum': ..., 'buckets': {bound: count}}};
+        where labels is a (method, endpoint, status) tuple.
+
+        """
+        with self._lock:
+            snapshot = {name: dict(values)
+                        for name, values in self._counters.items()}
+            for name, histograms in self._histograms.items():
+                snapshot[name] = {
+                    labels: {
+                        'count': histogram.count,
+                        'sum': histogram.sum,
+                        'buckets': dict(zip(self._buckets + (float('inf'),),
+                                            histogram.cumulative_counts())),
+                    }
+                    for labels, histogram in histograms.items()
+                }
+            return snapshot
+
+    def render(self):
+        """Render the metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name in self.COUNTERS:
+                metric = self._prefix + name
+                lines.append("# TYPE {} counter".format(metric))
+                for labels, value in sorted(self._counters[name].items()):
+                    lines.append("{}{{{}}} {}".format(
+                        metric, self._labels(labels), value
+                    ))
+            for name in self.HISTOGRAMS:
+                metric = self._prefix + name
+                lines.append("# TYPE {} histogram".format(metric))
+                histograms = sorted(self._histograms[name].items())
+                for labels, histogram in histograms:
+                    label_text = self._labels(labels)
+                    bounds = [str(bound) for bound in self._buckets] + ['+Inf']
+                    for bound, count in zip(bounds,
+                                            histogram.cumulative_counts()):
+                        lines.append('{}_bucket{{{},le="{}"}} {}'.format(
+                            metric, label_text, bound, count
+                        ))
+                    lines.append("{}_sum{{{}}} {}".format(metric, label_text,
+                                                          histogram.sum))
+                    lines.append("{}_count{{{}}} {}".format(
+                        metric, label_text, histogram.count
+                    ))
+        return "\n".join(lines) + "\n"
+
+    def _increment(self, name, labels, value):
+        """Increment a counter (the lock must be held)."""
+        if value:
+            counter = self._counters[name]
+            counter[labels] = counter.get(labels, 0) + value
+
+    def _observe(self, name, labels, value):
+        """Observe a histogram value (the lock must be held)."""
+        histograms = self._histograms[name]
+        histogram = histograms.get(labels)
+        if histogram is None:
+            histogram = histograms[labels] = _Histogram(self._buckets)
+        histogram.observe(value)
+
+    @staticmethod
+    def _labels(labels):
+        return 'method="{}",endpoint="{}",status="{}"'.format(*labels)
+
+
+class TracingSink(object):
+    """Records each request as an OpenTelemetry (client) span.
+
+    The spans follow the OpenTelemetry HTTP client semantic conventions
+    (`http.request.method`, `url.full`, `http.response.status_code`, ...), and
+    carry the request's retry and rate-limit details as `spark.*` attributes.
+    Requires the opentelemetry-api package (and a configured tracer provider).
+
+    """
+
+    def __init__(self, tracer=None):
+        """Initialize a new TracingSink object.
+
+        Args:
+            tracer(opentelemetry.trace.Tracer): The tracer used to record
+                the spans.  Defaults to the global tracer provider's tracer
+                for this package.
+
+        Raises:
+            ImportError: If a tracer is not provided and the opentelemetry
+                package is not installed.
+
+        """
+        if tracer is None:
+            if trace is None:
+                raise ImportError("TracingSink requires the opentelemetry-api "
+                                  "package.")
+            tracer = trace.get_tracer('ciscosparkapi')
+
+        super(TracingSink, self).__init__()
+        self._tracer = tracer
+
+    def __call__(self, event):
+        """Record a request event as a span."""
+        attributes = {
+            'http.request.method': event.method,
+            'url.full': event.url,
+            'http.route': event.endpoint,
+            'http.request.body.size': event.request_bytes,
+            'http.response.body.size': event.response_bytes,
+            'spark.attempts': event.attempts,
+            'spark.rate_limit_wait': event.rate_limit_wait,
+        }
+        if event.status_code is not None:
+            attributes['http.response.status_code'] = event.status_code
+        if event.ttfb is not None:
+            attributes['spark.ttfb'] = event.ttfb
+        if event.error is not None:
+            attributes['error.type'] = type(event.error).__name__
+
+        kwargs = {}
+        if trace is not None:
+            kwargs['kind'] = trace.SpanKind.CLIENT
+        start_time = int(event.start_time * 1e9)
+        span = self._tracer.start_span(
+            "{} {}".format(event.method, event.endpoint),
+            start_time=start_time,
+            attributes=attributes,
+            **kwargs
+        )
+        if event.error is not None:
+            message = _error_message(event.error)
+            if trace is not None:
+                span.set_status(trace.Status(trace.StatusCode.ERROR, message))
+            # As span.record_exception(); which would render the (lazily
+            # built) SparkApiError report with str()
+            span.add_event('exception', attributes={
+                'exception.type': type(event.error).__name__,
+                'exception.message': message,
+            })
+        span.end(end_time=start_time + int(event.duration * 1e9))
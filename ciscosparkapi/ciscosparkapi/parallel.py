@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""Helpers for running sharded list queries in parallel.
+
+Functions:
+    parallel_items: Run a list query for each shard of the query space on a
+        worker pool, and yield the merged results.
+    parallel_calls: Call a function with each set of keyword arguments on a
+        worker pool, and return the results.
+    chunked: Split a sequence into lists of a maximum size.
+
+"""
+
+
+# Use future for Python v2 and v3 compatibility
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+from builtins import *
+
+
+__author__ = "Chris Lunsford"
+__author_email__ = "chrlunsf@cisco.com"
+__copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
+__license__ = "MIT"
+
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+import queue
+import threading
+
+from .utils import check_type
+
+
+# Module Constants
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_SHARD_BUFFER_SIZE = 1000
+
+# Marks the end of a shard's items
+_SHARD_DONE = object()
+
+
+def chunked(sequence, size):
+    """Split a sequence into lists of (at most) `size` items."""
+    sequence = list(sequence)
+    return [sequence[i:i + size] for i in range(0, len(sequence), size)]
+
+
+def parallel_items(list_function, shards,
+                   max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                   buffer_size=DEFAULT_SHARD_BUFFER_SIZE):
+    """Run a list query per shard on a worker pool; yield the merged items.
+
+    Each shard's query (`list_function(**shard)`) follows its own chain of
+    RFC5988 'next' links, on its own connection; at most `max_concurrency`
+    shards are queried at a time.  The items are yielded in shard order (all
+    of the first shard's items, then all of the second shard's items, etc.),
+    as they arrive.
+
+    Each shard's items are passed to the consumer through a queue of (at
+    most) `buffer_size` items; a shard's query is paused while its queue is
+    full.  A shard is only started once the shards `max_concurrency` places
+    before it have been consumed; so the memory used is bounded by
+    `max_concurrency` times `buffer_size` items (plus the pages being parsed)
+    however many, and however large, the shards are.
+
+    Args:
+        list_function(func): The list function (i.e. `memberships.list`)
+            called for each shard.
+        shards(list): The keyword arguments (dicts) passed to the list
+            function for each shard of the query space.
+        max_concurrency(int): The maximum number of shards queried at a time.
+        buffer_size(int): The maximum number of items buffered per shard.
+
+    Raises:
+        TypeError: If the parameter types are incorrect.
+        ValueError: If max_concurrency or buffer_size is less than one (1).
+        SparkApiError: If the Cisco Spark cloud returns an error.
+
+    """
+    check_type(max_concurrency, int, may_be_none=False)
+    check_type(buffer_size, int, may_be_none=False)
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be greater than zero (0).")
+    if buffer_size < 1:
+        raise ValueError("buffer_size must be greater than zero (0).")
+
+    stopped = threading.Event()
+
+    def put(buffer, entry):
+        # Block while the buffer is full, unless the consumer has stopped
+        while not stopped.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def query(shard, buffer):
+        try:
+            for item in list_function(**shard):
+                if not put(buffer, (item, None)):
+                    return
+        except Exception as e:
+            put(buffer, (None, e))
+        else:
+            put(buffer, (_SHARD_DONE, None))
+
+    # The shards are started in shard order, in a window of (at most)
+    # `max_concurrency` unconsumed shards; the shard being consumed is always
+    # running, while the following shards in the window fill their buffers
+    shards = iter(shards)
+    window = deque()
+    executor = ThreadPoolExecutor(max_concurrency)
+    futures = []
+
+    def start_shards():
+        for shard in islice(shards, max_concurrency - len(window)):
+            buffer = queue.Queue(maxsize=buffer_size)
+            futures.append(executor.submit(query, shard, buffer))
+            window.append(buffer)
+
+    try:
+        start_shards()
+        while window:
+            buffer = window[0]
+            while True:
+                item, error = buffer.get()
+                if error is not None:
+                    raise error
+                if item is _SHARD_DONE:
+                    break
+                yield item
+            window.popleft()
+            start_shards()
+    finally:
+        stopped.set()
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def parallel_calls(function, calls, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+    """Call a function with each set of keyword arguments on a worker pool.
+
+    At most `max_concurrency` calls are made at a time.  If any call fails,
+    the calls that have not yet started are cancelled, and the (first, in
+    call order) exception is raised once the running calls have completed.
+
+    Args:
+        function(func): The function (i.e. `messages.create`) to be called.
+        calls(list): The keyword arguments (dicts) of each call.
+        max_concurrency(int): The maximum number of calls made at a time.
+
+    Returns:
+        list: The results of the calls, in call order.
+
+    Raises:
+        TypeError: If the parameter types are incorrect.
+        ValueError: If max_concurrency is less than one (1).
+
+    """
+    check_type(max_concurrency, int, may_be_none=False)
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be greater than zero (0).")
+
+    executor = ThreadPoolExecutor(max_concurrency)
+    futures = [executor.submit(function, **call) for call in calls]
+    try:
+        return [future.result() for future in futures]
+    finally:
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""Client-side rate limiting for the Cisco Spark APIs.
+
+Classes:
+    TokenBucket: A thread-safe token bucket that paces calls to a configured
+        rate, and adapts the rate when the server responds with rate-limit
+        errors.
+    RateLimiter: Paces requests per API endpoint (messages, people, rooms,
+        etc.) using a TokenBucket per endpoint.
+
+"""
+
+
+# Use future for Python v2 and v3 compatibility
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+from builtins import *
+from past.builtins import basestring
+
+
+__author__ = "Chris Lunsford"
+__author_email__ = "chrlunsf@cisco.com"
+__copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
+__license__ = "MIT"
+
+
+import threading
+import time
+
+from .utils import check_type
+
+
+# Module Constants
+DEFAULT_RATE = 5.0
+DEFAULT_BURST = 10
+RATE_LIMIT_BACKOFF_FACTOR = 0.5
+RATE_RECOVERY_FACTOR = 0.05
+MINIMUM_RATE = 0.1
+
+
+class TokenBucket(object):
+    """Thread-safe token bucket.
+
+    Tokens are added to the bucket at `rate` tokens per second, up to the
+    bucket's `burst` capacity, and each call consumes a token.  When the
+    bucket is empty, callers wait until a token becomes available.
+
+    The bucket learns from the server's rate-limit responses: a rate-limit
+    response (see `penalize()`) empties the bucket, holds all callers until
+    the server's `Retry-After` period has elapsed and multiplicatively reduces
+    the rate; each successful call (see `reward()`) then additively restores
+    the rate toward the configured rate.
+
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST):
+        """Initialize a new TokenBucket object.
+
+        Args:
+            rate(int, float): The configured rate (tokens per second).
+            burst(int): The bucket capacity; the number of calls that may be
+                made back-to-back when the bucket is full.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ValueError: If the rate or burst values are not positive.
+
+        """
+        check_type(rate, (int, float), may_be_none=False)
+        check_type(burst, int, may_be_none=False)
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate and burst must be positive values.")
+
+        super(TokenBucket, self).__init__()
+
+        self._configured_rate = float(rate)
+        self._rate = float(rate)
+        self._burst = burst
+        self._tokens = float(burst)
+        self._last = time.time()
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self):
+        """The current (adapted) rate, in tokens per second."""
+        return self._rate
+
+    @property
+    def configured_rate(self):
+        """The configured rate, in tokens per second."""
+        return self._configured_rate
+
+    @property
+    def burst(self):
+        """The bucket capacity."""
+        return self._burst
+
+    def reserve(self):
+        """Consume a token; return the time (in seconds) to wait for it."""
+        with self._lock:
+            now = time.time()
+            elapsed = now - self._last
+            if elapsed > 0:
+                self._tokens = min(self._burst,
+                                   self._tokens + elapsed * self._rate)
+                self._last = now
+
+            self._tokens -= 1
+            # self._last may be in the future, if the bucket is being held
+            # following a rate-limit response
+            wait = (self._last - now) - min(self._tokens, 0) / self._rate
+
+            return max(wait, 0)
+
+    def acquire(self):
+        """Wait for (and consume) a token; return the time waited."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def penalize(self, retry_after=None):
+        """Adapt to a rate-limit response from the server.
+
+        Args:
+            retry_after(int, float): The time (in seconds) the server asked us
+                to wait before retrying.
+
+        """
+        with self._lock:
+            self._rate = max(MINIMUM_RATE,
+                             self._rate * RATE_LIMIT_BACKOFF_FACTOR)
+            self._tokens = 0
+            if retry_after:
+                self._last = max(self._last, time.time() + float(retry_after))
+
+    def reward(self):
+        """Adapt to a successful (not rate-limited) call."""
+        if self._rate < self._configured_rate:
+            with self._lock:
+                self._rate = min(
+                    self._configured_rate,
+                    self._rate + self._configured_rate * RATE_RECOVERY_FACTOR,
+                )
+
+
+class RateLimiter(object):
+    """Paces requests per API endpoint.
+
+    Each endpoint (i.e. 'messages', 'people', 'rooms') is paced by its own
+    TokenBucket; so that a burst of requests to one endpoint (or a rate-limit
+    response from it) does not hold up the requests to the other endpoints.
+
+    Example:
+        >>> limiter = RateLimiter(rates={'messages': (2, 5)}, default_rate=10)
+        >>> api = CiscoSparkAPI(rate_limiter=limiter)
+
+    """
+
+    def __init__(self, rates=None, default_rate=DEFAULT_RATE,
+                 default_burst=DEFAULT_BURST):
+        """Initialize a new RateLimiter object.
+
+        Args:
+            rates(dict): Per-endpoint rates; the values may be a rate (calls
+                per second) or a (rate, burst) tuple.  For example:
+                {'messages': 2, 'people': (10, 20)}
+            default_rate(int, float): The rate (calls per second) for
+                endpoints not listed in `rates`.
+            default_burst(int): The burst capacity for endpoints not listed
+                in `rates` (or listed with a rate only).
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+
+        """
+        check_type(rates, dict)
+        check_type(default_rate, (int, float), may_be_none=False)
+        check_type(default_burst, int, may_be_none=False)
+
+        super(RateLimiter, self).__init__()
+
+        self._rates = dict(rates or {})
+        self._default_rate = default_rate
+        self._default_burst = default_burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, endpoint):
+        """Get the TokenBucket for an endpoint (created on first use)."""
+        bucket = self._buckets.get(endpoint)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(endpoint)
+                if bucket is None:
+                    rate = self._rates.get(endpoint, self._default_rate)
+                    if isinstance(rate, tuple):
+                        rate, burst = rate
+                    else:
+                        burst = self._default_burst
+                    bucket = TokenBucket(rate, burst)
+                    self._buckets[endpoint] = bucket
+        return bucket
+
+    def acquire(self, endpoint):
+        """Wait until a request may be sent to the endpoint.
+
+        Args:
+            endpoint(basestring): The API endpoint; i.e. 'messages'.
+
+        Returns:
+            float: The time (in seconds) waited.
+
+        """
+        assert isinstance(endpoint, basestring)
+        return self.bucket(endpoint).acquire()
+
+    def on_rate_limit(self, endpoint, retry_after=None):
+        """Record a rate-limit response received from the endpoint."""
+        self.bucket(endpoint).penalize(retry_after)
+
+    def on_success(self, endpoint):
+        """Record a successful (not rate-limited) request to the endpoint."""
+        self.bucket(endpoint).reward()
+
+    def rates(self):
+        """Return a dictionary of the current rate of each endpoint."""
+        with self._lock:
+            return {endpoint: bucket.rate
+                    for endpoint, bucket in self._buckets.items()}
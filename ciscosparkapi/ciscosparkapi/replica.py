@@ -0,0 +1,361 @@
+# -*- coding: utf-8 -*-
+"""ReplicaStore class for serving room and membership reads from memory.
+
+Classes:
+    ReplicaStore: An in-process replica of the rooms (and their memberships)
+        visible to the person accessing the API; bootstrapped from the list
+        APIs and kept current by feeding it webhook events.
+
+"""
+
+
+# Use future for Python v2 and v3 compatibility
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+from builtins import *
+from past.builtins import basestring
+
+
+__author__ = "Chris Lunsford"
+__author_email__ = "chrlunsf@cisco.com"
+__copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
+__license__ = "MIT"
+
+
+import threading
+
+from .api.memberships import Membership
+from .api.rooms import Room
+from .api.webhooks import WebhookEvent
+from .exceptions import ciscosparkapiException
+from .utils import check_type
+
+
+# Module Constants
+REPLICATED_EVENTS = frozenset([
+    ('rooms', 'created'),
+    ('rooms', 'updated'),
+    ('rooms', 'deleted'),
+    ('memberships', 'created'),
+    ('memberships', 'updated'),
+    ('memberships', 'deleted'),
+    ('messages', 'created'),
+])
+
+
+class ReplicaStore(object):
+    """In-process replica of rooms and room memberships.
+
+    The replica is bootstrapped from the rooms and memberships list APIs, and
+    is then kept current by feeding it the `rooms`, `memberships` and
+    `messages` webhook events received by the application (see
+    `process_event()`).  Room and membership reads are served from memory.
+
+    If the replica was created with an API object, reads for rooms (or room
+    memberships) that are not in the replica fall back to the Cisco Spark
+    APIs, and the results are added to the replica.  Without an API object,
+    the replica is fed entirely by webhook events; which makes it possible to
+    test offline by replaying recorded webhook JSON.
+
+    The replica is safe for use by multiple threads.
+
+    """
+
+    def __init__(self, api=None):
+        """Initialize a new ReplicaStore object.
+
+        Args:
+            api(CiscoSparkAPI): The API object used to bootstrap the replica
+                and serve reads that miss the replica.  Defaults to None (the
+                replica is fed exclusively by webhook events).
+
+        """
+        super(ReplicaStore, self).__init__()
+
+        self._api = api
+        self._lock = threading.RLock()
+        self._rooms = {}
+        self._memberships = {}
+        # roomId -> {membershipId: Membership}; only for rooms whose complete
+        # membership list has been loaded
+        self._room_memberships = {}
+        # The events received by process_event() during bootstrap() calls
+        self._event_buffers = []
+        self._me_id = None
+
+    def __len__(self):
+        """The number of rooms in the replica."""
+        return len(self._rooms)
+
+    def bootstrap(self, **room_filters):
+        """(Re)load the replica from the rooms and memberships list APIs.
+
+        The rooms' memberships are listed in parallel (see
+        `memberships.list_parallel()`).  The webhook events processed while
+        the replica is being loaded are applied to the loaded rooms and
+        memberships; so that they are not lost when the loaded data replaces
+        the replica's.
+
+        Args:
+            **room_filters: Passed on to `rooms.list()` to restrict the rooms
+                that are loaded (i.e. `type='group'`).
+
+        Raises:
+            ciscosparkapiException: If the replica does not have an API object.
+            SparkApiError: If the Cisco Spark cloud returns an error.
+
+        """
+        api = self._require_api()
+
+        events = []
+        with self._lock:
+            self._event_buffers.append(events)
+
+        try:
+            rooms = {room.id: room for room in api.rooms.list(**room_filters)}
+            memberships = {}
+            room_memberships = {room_id: {} for room_id in rooms}
+            for membership in api.memberships.list_parallel(list(rooms)):
+                memberships[membership.id] = membership
+                room_memberships[membership.roomId][membership.id] = membership
+
+            with self._lock:
+                self._rooms = rooms
+                self._memberships = memberships
+                self._room_memberships = room_memberships
+                # Re-apply the events received while the data was loading
+                for event_args in events:
+                    self._apply_event(*event_args)
+
+        finally:
+            with self._lock:
+                self._event_buffers = [buffer for buffer
+                                       in self._event_buffers
+                                       if buffer is not events]
+
+    def process_event(self, event):
+        """Apply a webhook event to the replica.
+
+        When the replica has an API object, a `memberships` `created` event
+        for the person accessing the API (who has been added to a room) adds
+        the room to the replica; and a `deleted` event removes it.
+
+        Args:
+            event(WebhookEvent, dict, basestring): The webhook event, or the
+                webhook JSON data POSTed by Cisco Spark.
+
+        Returns:
+            bool: True if the event was applied to the replica; False if the
+                event's resource or event type is not replicated.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+
+        """
+        check_type(event, (WebhookEvent, dict, basestring), may_be_none=False)
+        if not isinstance(event, WebhookEvent):
+            event = WebhookEvent(event)
+
+        data = event.data
+        if data is None or (event.resource, event.event) \
+                not in REPLICATED_EVENTS:
+            return False
+
+        # Requests to Cisco Spark are made before the replica is locked
+        my_id = room = None
+        if event.resource == 'memberships':
+            my_id = self._my_id()
+            if event.event == 'created' and data.personId == my_id:
+                # The person accessing the API has been added to a room
+                with self._lock:
+                    known_room = data.roomId in self._rooms
+                if not known_room:
+                    room = self._api.rooms.get(data.roomId)
+
+        with self._lock:
+            for buffer in self._event_buffers:
+                buffer.append((event, my_id, room))
+            self._apply_event(event, my_id, room)
+
+        return True
+
+    def get_room(self, roomId):
+        """Get the details of a room, by ID.
+
+        Args:
+            roomId(basestring): The ID of the room.
+
+        Returns:
+            Room: The Room from the replica; or None if the room is not in the
+                replica and the replica does not have an API object.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            SparkApiError: If the Cisco Spark cloud returns an error.
+
+        """
+        check_type(roomId, basestring, may_be_none=False)
+
+        with self._lock:
+            room = self._rooms.get(roomId)
+
+        if room is None and self._api is not None:
+            room = self._api.rooms.get(roomId)
+            self._put_room(room)
+
+        return room
+
+    def rooms(self):
+        """List the rooms in the replica."""
+        with self._lock:
+            return list(self._rooms.values())
+
+    def get_membership(self, membershipId):
+        """Get the details of a membership, by ID (None if not replicated)."""
+        check_type(membershipId, basestring, may_be_none=False)
+
+        with self._lock:
+            return self._memberships.get(membershipId)
+
+    def memberships(self, roomId):
+        """List the memberships of a room.
+
+        Args:
+            roomId(basestring): The ID of the room.
+
+        Returns:
+            list: The room's Membership objects.  If the room's memberships are
+                not in the replica, they are loaded from Cisco Spark (if the
+                replica has an API object) or an empty list is returned.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            SparkApiError: If the Cisco Spark cloud returns an error.
+
+        """
+        check_type(roomId, basestring, may_be_none=False)
+
+        with self._lock:
+            room_memberships = self._room_memberships.get(roomId)
+            if room_memberships is not None:
+                return list(room_memberships.values())
+
+        if self._api is None:
+            return []
+
+        memberships = list(self._api.memberships.list(roomId=roomId))
+        with self._lock:
+            self._room_memberships[roomId] = {m.id: m for m in memberships}
+            for membership in memberships:
+                self._memberships[membership.id] = membership
+
+        return memberships
+
+    def is_member(self, roomId, personId):
+        """Is the person (by ID) a member of the room."""
+        check_type(personId, basestring, may_be_none=False)
+        return any(membership.personId == personId
+                   for membership in self.memberships(roomId))
+
+    def _apply_event(self, event, my_id, room):
+        """Apply a (replicated) event to the replica; the lock must be held.
+
+        Args:
+            event(WebhookEvent): The webhook event.
+            my_id(basestring): The ID of the person accessing the API (or
+                None); for `memberships` events.
+            room(Room): The room the person accessing the API was added to
+                (or None); for `memberships` `created` events.
+
+        """
+        data = event.data
+
+        if event.resource == 'rooms':
+            if event.event == 'created':
+                # A new room's (complete) membership list starts out empty
+                self._put_room(data, new=True)
+            elif event.event == 'updated':
+                self._put_room(data)
+            else:
+                self._remove_room(data.id)
+
+        elif event.resource == 'memberships':
+            if event.event in ('created', 'updated'):
+                if room is not None and room.id not in self._rooms:
+                    self._put_room(room)
+                self._put_membership(data)
+            else:
+                self._remove_membership(data, my_id)
+
+        else:
+            self._touch_room(data.roomId, data.created)
+
+    def _my_id(self):
+        """The ID of the person accessing the API (None without an API)."""
+        if self._api is not None and self._me_id is None:
+            self._me_id = self._api.me.id
+        return self._me_id
+
+    def _require_api(self):
+        """Return the API object; raise an exception if there isn't one."""
+        if self._api is None:
+            raise ciscosparkapiException("This ReplicaStore was not created "
+                                         "with an API object.")
+        return self._api
+
+    def _put_room(self, room, new=False):
+        """Add or replace a room in the replica."""
+        if not isinstance(room, Room):
+            room = Room(room.json_data)
+        with self._lock:
+            self._rooms[room.id] = room
+            if new:
+                self._room_memberships.setdefault(room.id, {})
+
+    def _remove_room(self, roomId):
+        """Remove a room, and its memberships, from the replica."""
+        with self._lock:
+            self._rooms.pop(roomId, None)
+            self._room_memberships.pop(roomId, None)
+            for membership_id in [m.id for m in self._memberships.values()
+                                  if m.roomId == roomId]:
+                del self._memberships[membership_id]
+
+    def _touch_room(self, roomId, lastActivity):
+        """Update the lastActivity of a room when a message is posted."""
+        with self._lock:
+            room = self._rooms.get(roomId)
+            if room is not None and lastActivity:
+                json_data = room.json_data
+                json_data['lastActivity'] = lastActivity
+                self._rooms[roomId] = Room(json_data)
+
+    def _put_membership(self, membership):
+        """Add or replace a membership in the replica."""
+        if not isinstance(membership, Membership):
+            membership = Membership(membership.json_data)
+        with self._lock:
+            self._memberships[membership.id] = membership
+            room_memberships = self._room_memberships.get(membership.roomId)
+            if room_memberships is not None:
+                room_memberships[membership.id] = membership
+
+    def _remove_membership(self, membership, my_id=None):
+        """Remove a membership from the replica.
+
+        If the membership belongs to the person accessing the API (`my_id`),
+        they have left the room; and the room is removed from the replica.
+
+        """
+        with self._lock:
+            self._memberships.pop(membership.id, None)
+            room_memberships = self._room_memberships.get(membership.roomId)
+            if room_memberships is not None:
+                room_memberships.pop(membership.id, None)
+
+            if my_id is not None and membership.personId == my_id:
+                self._remove_room(membership.roomId)
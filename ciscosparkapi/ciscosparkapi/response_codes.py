@@ -22,6 +22,7 @@ __license__ = "MIT"
 SPARK_RESPONSE_CODES = {
     200: "OK",
     204: "Member deleted.",
+    304: "Not Modified.",
     400: "The request was invalid or cannot be otherwise served. An "
          "accompanying error message will explain further.",
     401: "Authentication credentials were missing or incorrect.",
@@ -47,6 +48,8 @@ SPARK_RESPONSE_CODES = {
 
 RATE_LIMIT_RESPONSE_CODE = 429
 
+NOT_MODIFIED_RESPONSE_CODE = 304
+
 EXPECTED_RESPONSE_CODE = {
     'GET': 200,
     'POST': 200,
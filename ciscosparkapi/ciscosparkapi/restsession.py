@@ -21,29 +21,63 @@ __copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
 __license__ = "MIT"
 
 
+from concurrent.futures import Future
+import json
 import logging
+import queue
+import threading
 import time
 import urllib.parse
 import warnings
 
+from collections import OrderedDict
+
 import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
 
+from .cache import EntityCache
 from .exceptions import (
     ciscosparkapiException,
     SparkApiError,
     SparkRateLimitError,
 )
-from .response_codes import EXPECTED_RESPONSE_CODE
+from .httpcache import ResponseCache
+from .instrumentation import Instrumentation, RequestEvent
+from .ratelimit import RateLimiter
+from .response_codes import (
+    EXPECTED_RESPONSE_CODE,
+    NOT_MODIFIED_RESPONSE_CODE,
+)
+from .retry import RetryPolicy
+from .scheduler import DeferredExecutor
+from .singleflight import SingleFlight, coalescing_key, request_key
+from .transports import HTTP2Adapter
 from .utils import (
+    DEFAULT_JSON_DECODER,
     validate_base_url,
     check_response_code,
-    extract_and_parse_json,
+    copy_json,
+    get_json_decoder,
+    iter_json_items,
 )
 
 
 # Module Constants
 DEFAULT_SINGLE_REQUEST_TIMEOUT = 60
 DEFAULT_WAIT_ON_RATE_LIMIT = True
+DEFAULT_RETRY_POLICY = None
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 64
+DEFAULT_POOL_BLOCK = False
+DEFAULT_KEEP_ALIVE = True
+DEFAULT_HTTP2 = False
+DEFAULT_PREFETCH_PAGES = 0
+DEFAULT_COALESCE_GETS = False
+DEFAULT_STREAM_ITEMS = False
+DEFAULT_RAW_JSON = False
+STREAM_CHUNK_SIZE = 16 * 1024
+MULTI_SEGMENT_ENDPOINTS = ('team/memberships',)
 
 
 # Helper Functions
@@ -89,13 +123,145 @@ def _fix_next_url(next_url):
     return urllib.parse.urlunparse(parsed_url)
 
 
+def _api_endpoint(abs_url, base_url):
+    """Return the API endpoint (i.e. 'rooms') of an absolute API URL.
+
+    Args:
+        abs_url(basestring): An absolute API URL.
+        base_url(basestring): The base URL for the API endpoints.
+
+    Returns:
+        basestring: The name of the API endpoint; i.e. 'rooms' for the URL
+            'https://api.ciscospark.com/v1/rooms/<roomId>'.
+
+    """
+    path = urllib.parse.urlparse(abs_url).path
+    base_path = urllib.parse.urlparse(base_url).path
+    if path.startswith(base_path):
+        path = path[len(base_path):]
+    segments = path.strip('/').split('/')
+    if '/'.join(segments[:2]) in MULTI_SEGMENT_ENDPOINTS:
+        return '/'.join(segments[:2])
+    return segments[0]
+
+
+def _endpoint_template(abs_url, base_url):
+    """Return the endpoint template (i.e. 'rooms/{id}') of an API URL.
+
+    The path segments following the API endpoint are replaced with '{id}'
+    (except 'me'); so that the requests for different entities share a
+    template, and metrics labelled by template have a bounded cardinality.
+
+    """
+    endpoint = _api_endpoint(abs_url, base_url)
+    path = urllib.parse.urlparse(abs_url).path
+    base_path = urllib.parse.urlparse(base_url).path
+    if path.startswith(base_path):
+        path = path[len(base_path):]
+    segments = path.strip('/').split('/')[len(endpoint.split('/')):]
+    return '/'.join([endpoint] + [segment if segment == 'me' else '{id}'
+                                  for segment in segments if segment])
+
+
+def _request_body_size(request):
+    """Return the number of bytes in (or sent from) a request's body."""
+    body = request.body
+    if body is None:
+        return 0
+    if isinstance(body, (bytes, bytearray)):
+        return len(body)
+    if isinstance(body, basestring):
+        return len(body.encode('utf-8'))
+    # Streamed bodies; i.e. file uploads sent with chunked transfer-encoding
+    bytes_sent = getattr(body, 'bytes_sent', None)
+    if bytes_sent is not None:
+        return bytes_sent
+    return int(request.headers.get('Content-Length') or 0)
+
+
+def _error_summary(error):
+    """Return a short (single line) description of a request error."""
+    if isinstance(error, SparkApiError):
+        return "Response Code [{}]".format(error.response.status_code)
+    return type(error).__name__
+
+
+def _read_ahead(iterator, depth):
+    """Iterate `iterator` in a background thread, up to `depth` items ahead.
+
+    The first item is retrieved by the consumer's thread (there is nothing for
+    it to overlap with); the background thread is started once it has been
+    retrieved.  Exceptions raised by the iterator are re-raised to the
+    consumer, in order.  If the consumer stops iterating (or the generator is
+    closed), the background thread stops after its current item.
+
+    """
+    iterator = iter(iterator)
+    try:
+        first = next(iterator)
+    except StopIteration:
+        return
+
+    buffer = queue.Queue(maxsize=depth)
+    stopped = threading.Event()
+
+    def put(entry):
+        # Block while the buffer is full, unless the consumer has stopped
+        while not stopped.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterator:
+                if not put((item, None)):
+                    return
+        except Exception as e:
+            put((None, e))
+        else:
+            put((None, StopIteration()))
+
+    thread = threading.Thread(target=produce, name="ciscosparkapiReadAhead")
+    thread.daemon = True
+    thread.start()
+
+    try:
+        yield first
+        while True:
+            item, error = buffer.get()
+            if isinstance(error, StopIteration):
+                return
+            elif error is not None:
+                raise error
+            yield item
+    finally:
+        stopped.set()
+
+
 # Main module interface
 class RestSession(object):
     """RESTful HTTP session class for making calls to the Cisco Spark APIs."""
 
     def __init__(self, access_token, base_url, timeout=None,
                  single_request_timeout=DEFAULT_SINGLE_REQUEST_TIMEOUT,
-                 wait_on_rate_limit=DEFAULT_WAIT_ON_RATE_LIMIT):
+                 wait_on_rate_limit=DEFAULT_WAIT_ON_RATE_LIMIT,
+                 entity_cache=None, rate_limiter=None,
+                 deferred_executor=None,
+                 retry_policy=DEFAULT_RETRY_POLICY,
+                 pool_connections=DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 pool_block=DEFAULT_POOL_BLOCK,
+                 keep_alive=DEFAULT_KEEP_ALIVE,
+                 http_adapter=None, http2=DEFAULT_HTTP2,
+                 prefetch_pages=DEFAULT_PREFETCH_PAGES,
+                 coalesce_gets=DEFAULT_COALESCE_GETS,
+                 response_cache=None, json_decoder=DEFAULT_JSON_DECODER,
+                 stream_items=DEFAULT_STREAM_ITEMS,
+                 raw_json=DEFAULT_RAW_JSON, instrumentation=None):
         """Initialize a new RestSession object.
 
         Args:
@@ -108,6 +274,53 @@ class RestSession(object):
                 HTTP REST API request.
             wait_on_rate_limit(bool): Enable or disable automatic rate-limit
                 handling.
+            entity_cache(EntityCache): The cache used to serve single entity
+                GETs (see `get_entity()`).  Defaults to no caching.
+            rate_limiter(RateLimiter): Paces the requests sent to each API
+                endpoint.  Defaults to no client-side rate limiting.
+            deferred_executor(DeferredExecutor): Runs the requests made with
+                `submit()`.  Defaults to an executor created on first use.
+            retry_policy(RetryPolicy): Retries requests that fail with
+                transient errors (server errors, connection errors and
+                timeouts).  Defaults to `None`; no retries.
+            pool_connections(int): The number of connection pools (one per
+                host) cached by the HTTP adapter.
+            pool_maxsize(int): The maximum number of connections kept open
+                to a host; size this to (at least) the number of threads
+                making concurrent requests.
+            pool_block(bool): When all of a host's connections are in use,
+                block until a connection is available (True), or open an
+                extra connection that is discarded after use (False).
+            keep_alive(bool): Reuse connections for subsequent requests.
+                Disabling keep-alive closes each connection after its request.
+            http_adapter(requests.adapters.HTTPAdapter): A custom transport
+                adapter mounted for all requests.  When provided, the pool
+                and HTTP/2 parameters are ignored.
+            http2(bool): Send requests over HTTP/2 (see `HTTP2Adapter`),
+                multiplexing concurrent requests over a single connection.
+                Requires the optional `httpx` package.
+            prefetch_pages(int): The number of pages `get_pages()` (and
+                `get_items()`) request ahead of the consumer, in a background
+                thread.  `0` (the default) disables read-ahead.  Read-ahead
+                only helps consumers that spend time processing each page;
+                one (1) page is usually enough.
+            coalesce_gets(bool): Coalesce identical concurrent GET requests
+                (see `get()`).
+            response_cache(ResponseCache): Caches GET responses carrying
+                validators (ETag / Last-Modified) and revalidates them with
+                conditional requests.  Defaults to no response caching.
+            json_decoder(basestring, func): The decoder used to parse the
+                JSON data of the responses; 'auto', 'fast', 'orjson', 'compat'
+                or a function (see `utils.get_json_decoder()`).
+            stream_items(bool): `get_items()` streams the response bodies,
+                and yields the items as they are parsed (see `get_items()`);
+                unless `json_decoder` is a function.
+            raw_json(bool): `get_entity()` returns the raw (unparsed) JSON
+                response bodies (see `get_entity()`).
+            instrumentation(Instrumentation): Emits a RequestEvent (timings,
+                sizes, retries and rate-limit waits) to its sinks for each
+                request made with `request()` or `submit()`.  Defaults to no
+                instrumentation.
 
         """
         assert isinstance(access_token, basestring)
@@ -116,6 +329,26 @@ class RestSession(object):
         assert (single_request_timeout is None or
                 isinstance(single_request_timeout, (int, float)))
         assert isinstance(wait_on_rate_limit, bool)
+        assert entity_cache is None or isinstance(entity_cache, EntityCache)
+        assert rate_limiter is None or isinstance(rate_limiter, RateLimiter)
+        assert (deferred_executor is None or
+                isinstance(deferred_executor, DeferredExecutor))
+        assert retry_policy is None or isinstance(retry_policy, RetryPolicy)
+        assert isinstance(pool_connections, int) and pool_connections > 0
+        assert isinstance(pool_maxsize, int) and pool_maxsize > 0
+        assert isinstance(pool_block, bool)
+        assert isinstance(keep_alive, bool)
+        assert isinstance(http2, bool)
+        assert isinstance(prefetch_pages, int) and prefetch_pages >= 0
+        assert isinstance(coalesce_gets, bool)
+        assert isinstance(stream_items, bool)
+        assert isinstance(raw_json, bool)
+        assert (instrumentation is None or
+                isinstance(instrumentation, Instrumentation))
+        assert (response_cache is None or
+                isinstance(response_cache, ResponseCache))
+        assert (http_adapter is None or
+                isinstance(http_adapter, requests.adapters.BaseAdapter))
 
         super(RestSession, self).__init__()
 
@@ -124,15 +357,44 @@ class RestSession(object):
         self._access_token = str(access_token)
         self._single_request_timeout = single_request_timeout
         self._wait_on_rate_limit = wait_on_rate_limit
+        self._entity_cache = entity_cache
+        self._rate_limiter = rate_limiter
+        self._deferred_executor = deferred_executor
+        self._deferred_executor_lock = threading.Lock()
+        self._retry_policy = retry_policy
+        self._keep_alive = keep_alive
+        self._prefetch_pages = prefetch_pages
+        self._coalesce_gets = coalesce_gets
+        self._singleflight = SingleFlight(copy_result=copy_json)
+        self._response_cache = response_cache
+        self._json_decoder = json_decoder
+        self._decode_json = get_json_decoder(json_decoder)
+        self._stream_items = stream_items
+        self._raw_json = raw_json
+        self._instrumentation = instrumentation
+        self._headers_lock = threading.Lock()
         if timeout:
             self.timeout = timeout
 
         # Initialize a new `requests` session
         self._req_session = requests.session()
 
+        # Mount a transport adapter sized for concurrent use
+        if http_adapter is None and http2:
+            http_adapter = HTTP2Adapter()
+        elif http_adapter is None:
+            http_adapter = HTTPAdapter(pool_connections=pool_connections,
+                                       pool_maxsize=pool_maxsize,
+                                       pool_block=pool_block)
+        self._http_adapter = http_adapter
+        self._req_session.mount('https://', http_adapter)
+        self._req_session.mount('http://', http_adapter)
+
         # Update the headers of the `requests` session
         self.update_headers({'Authorization': 'Bearer ' + access_token,
                              'Content-type': 'application/json;charset=utf-8'})
+        if not keep_alive:
+            self.update_headers({'Connection': 'close'})
 
     @property
     def base_url(self):
@@ -201,6 +463,122 @@ class RestSession(object):
         assert isinstance(value, bool)
         self._wait_on_rate_limit = value
 
+    @property
+    def entity_cache(self):
+        """The EntityCache used to serve single entity GETs (or None)."""
+        return self._entity_cache
+
+    @property
+    def rate_limiter(self):
+        """The RateLimiter pacing the requests to the API endpoints (or None).
+
+        When a rate limiter is in use, rate-limit responses are fed back to the
+        limiter; which holds the endpoint's requests until the `Retry-After`
+        period has elapsed and slows the pace of the requests sent to it.
+
+        """
+        return self._rate_limiter
+
+    @property
+    def retry_policy(self):
+        """The RetryPolicy for transient request failures (or None)."""
+        return self._retry_policy
+
+    @retry_policy.setter
+    def retry_policy(self, value):
+        """Set (or disable, with None) the RetryPolicy."""
+        assert value is None or isinstance(value, RetryPolicy)
+        self._retry_policy = value
+
+    @property
+    def deferred_executor(self):
+        """The DeferredExecutor running the requests made with `submit()`."""
+        if self._deferred_executor is None:
+            with self._deferred_executor_lock:
+                if self._deferred_executor is None:
+                    self._deferred_executor = DeferredExecutor()
+        return self._deferred_executor
+
+    @property
+    def prefetch_pages(self):
+        """The number of pages requested ahead of the consumer (0 = off)."""
+        return self._prefetch_pages
+
+    @prefetch_pages.setter
+    def prefetch_pages(self, value):
+        """Set the number of pages requested ahead of the consumer."""
+        assert isinstance(value, int) and value >= 0
+        self._prefetch_pages = value
+
+    @property
+    def stream_items(self):
+        """`get_items()` yields the items as the responses are streamed."""
+        return self._stream_items
+
+    @stream_items.setter
+    def stream_items(self, value):
+        """Enable or disable streaming `get_items()` responses."""
+        assert isinstance(value, bool)
+        self._stream_items = value
+
+    @property
+    def raw_json(self):
+        """`get_entity()` returns the raw (unparsed) JSON response bodies."""
+        return self._raw_json
+
+    @raw_json.setter
+    def raw_json(self, value):
+        """Enable or disable returning raw JSON from `get_entity()`."""
+        assert isinstance(value, bool)
+        self._raw_json = value
+
+    @property
+    def instrumentation(self):
+        """The instrumentation the request events are emitted to."""
+        return self._instrumentation
+
+    @instrumentation.setter
+    def instrumentation(self, value):
+        """Set (or remove, with None) the session's instrumentation."""
+        assert value is None or isinstance(value, Instrumentation)
+        self._instrumentation = value
+
+    @property
+    def json_decoder(self):
+        """The decoder used to parse the JSON data of the responses."""
+        return self._json_decoder
+
+    @property
+    def response_cache(self):
+        """The ResponseCache used to revalidate GET responses (or None)."""
+        return self._response_cache
+
+    @property
+    def coalesce_gets(self):
+        """Identical concurrent GET requests are coalesced."""
+        return self._coalesce_gets
+
+    @coalesce_gets.setter
+    def coalesce_gets(self, value):
+        """Enable or disable coalescing identical concurrent GETs."""
+        assert isinstance(value, bool)
+        self._coalesce_gets = value
+
+    @property
+    def singleflight(self):
+        """The SingleFlight coalescing identical concurrent GETs."""
+        return self._singleflight
+
+    @property
+    def keep_alive(self):
+        """Connections are reused for subsequent requests."""
+        return self._keep_alive
+
+    @property
+    def http_adapter(self):
+        """The transport adapter used for all requests."""
+        return self._http_adapter
+
     @property
     def headers(self):
         """The HTTP headers used for requests in this session."""
@@ -214,12 +592,20 @@ class RestSession(object):
         new key-value pairs and/or updating the values of existing keys. The
         session headers are not replaced by the provided dictionary.
 
+        The session headers are updated copy-on-write: the merged headers are
+        built in a new dictionary, which then replaces the session headers; so
+        that requests being made by other threads never see a partially
+        updated (or changing) headers dictionary.
+
         Args:
              headers(dict): Updates to the current session headers.
 
         """
         assert isinstance(headers, dict)
-        self._req_session.headers.update(headers)
+        with self._headers_lock:
+            new_headers = CaseInsensitiveDict(self._req_session.headers)
+            new_headers.update(headers)
+            self._req_session.headers = new_headers
 
     def abs_url(self, url):
         """Given a relative or absolute URL; return an absolute URL.
@@ -246,14 +632,19 @@ class RestSession(object):
             * Expands the API endpoint URL to an absolute URL
             * Makes the actual HTTP request to the API endpoint
             * Provides support for Spark rate-limiting
+            * Retries transient failures, as permitted by the retry policy
             * Inspects response codes and raises exceptions as appropriate
+            * Emits a RequestEvent to the session's instrumentation (if any)
 
         Args:
             method(basestring): The request-method type ('GET', 'POST', etc.).
             url(basestring): The URL of the API endpoint to be called.
             erc(int): The expected response code that should be returned by the
                 Cisco Spark API endpoint to indicate success.
-            **kwargs: Passed on to the requests package.
+            **kwargs:
+                retry_policy(RetryPolicy): Overrides the session's retry
+                    policy for this request (None disables retries).
+                others: Passed on to the requests package.
 
         Raises:
             SparkApiError: If anything other than the expected response code is
@@ -267,41 +658,304 @@ class RestSession(object):
 
         # Update request kwargs with session defaults
         kwargs.setdefault('timeout', self.single_request_timeout)
+        retry_policy = kwargs.pop('retry_policy', self._retry_policy)
+
+        rate_limiter = self._rate_limiter
+        if rate_limiter is not None:
+            endpoint = _api_endpoint(abs_url, self.base_url)
 
+        instrumentation = self._instrumentation
+        if instrumentation is not None:
+            start_time = time.time()
+        rate_limit_wait = 0.0
+
+        # Rate-limit retries do not count against the retry policy's attempts
+        attempt = 1
+        attempts = 0
         while True:
-            # Make the HTTP request to the API endpoint
-            response = self._req_session.request(method, abs_url, **kwargs)
+            attempts += 1
+
+            # Pace the requests sent to the API endpoint
+            if rate_limiter is not None:
+                rate_limit_wait += rate_limiter.acquire(endpoint)
 
             try:
+                # Make the HTTP request to the API endpoint
+                response = self._req_session.request(method, abs_url,
+                                                     **kwargs)
+
                 # Check the response code for error conditions
                 check_response_code(response, erc)
 
             except SparkRateLimitError as e:
                 # Catch rate-limit errors
+                if rate_limiter is not None:
+                    rate_limiter.on_rate_limit(endpoint, e.retry_after)
 
                 # Wait and retry if automatic rate-limit handling is enabled
                 if self.wait_on_rate_limit and e.retry_after:
                     logger.info("Received rate-limit message; "
                                 "waiting {0} seconds."
                                 "".format(e.retry_after))
-                    time.sleep(e.retry_after)
+                    if rate_limiter is None:
+                        time.sleep(e.retry_after)
+                        rate_limit_wait += e.retry_after
+                    # else: the rate limiter holds the retry (and the other
+                    # requests to this endpoint) until retry_after has elapsed
                     continue
 
                 else:
                     # Re-raise the SparkRateLimitError
+                    if instrumentation is not None:
+                        self._emit_request_event(
+                            instrumentation, method, abs_url, e.response,
+                            kwargs, attempts, rate_limit_wait, start_time, e,
+                        )
+                    raise
+
+            except (SparkApiError, requests.exceptions.RequestException) as e:
+                # Retry transient failures if permitted by the retry policy
+                if (retry_policy is not None and
+                        retry_policy.should_retry(method, attempt, e)):
+                    backoff = retry_policy.backoff(attempt)
+                    logger.info("Request failed ({0}); retrying in {1:.2f} "
+                                "seconds.".format(_error_summary(e), backoff))
+                    time.sleep(backoff)
+                    attempt += 1
+                    continue
+
+                else:
+                    if instrumentation is not None:
+                        self._emit_request_event(
+                            instrumentation, method, abs_url,
+                            getattr(e, 'response', None), kwargs, attempts,
+                            rate_limit_wait, start_time, e,
+                        )
                     raise
 
             else:
+                if rate_limiter is not None:
+                    rate_limiter.on_success(endpoint)
+                if instrumentation is not None:
+                    self._emit_request_event(
+                        instrumentation, method, abs_url, response, kwargs,
+                        attempts, rate_limit_wait, start_time, None,
+                    )
                 return response
 
+    def _emit_request_event(self, instrumentation, method, abs_url, response,
+                            kwargs, attempts, rate_limit_wait, start_time,
+                            error):
+        """Build a RequestEvent for a completed request, and emit it."""
+        duration = time.time() - start_time
+        request = getattr(response, 'request', None) or \
+            getattr(error, 'request', None)
+        request_bytes = 0
+        if request is not None:
+            request_bytes = _request_body_size(request)
+
+        status_code = ttfb = None
+        response_bytes = 0
+        if response is not None:
+            status_code = response.status_code
+            ttfb = response.elapsed.total_seconds()
+            content_length = response.headers.get('Content-Length')
+            if content_length:
+                response_bytes = int(content_length)
+            elif not kwargs.get('stream'):
+                # Reading a streamed body here would consume it
+                response_bytes = len(response.content or b'')
+
+        instrumentation.emit(RequestEvent(
+            method=method.upper(),
+            url=abs_url,
+            endpoint=_endpoint_template(abs_url, self.base_url),
+            status_code=status_code,
+            request_bytes=request_bytes,
+            response_bytes=response_bytes,
+            attempts=attempts,
+            rate_limit_wait=rate_limit_wait,
+            ttfb=ttfb,
+            duration=duration,
+            start_time=start_time,
+            error=error,
+        ))
+
+    def submit(self, method, url, erc=None, **kwargs):
+        """Make a request in the background; return a Future for its result.
+
+        Unlike `request()`, rate-limited requests do not hold up the calling
+        thread (or a worker thread) while they wait to be retried.  When
+        automatic rate-limit handling is enabled, a rate-limited request is
+        parked in the deferred executor's queue and retried when its
+        `Retry-After` deadline arrives; while the requests to the other API
+        endpoints continue to be served.  When a rate limiter is in use,
+        requests waiting for the endpoint's pace are parked in the same way.
+
+        Args:
+            method(basestring): The request-method type ('GET', 'POST', etc.).
+            url(basestring): The URL of the API endpoint to be called.
+            erc(int): The expected response code that should be returned by the
+                Cisco Spark API endpoint to indicate success.  Defaults to the
+                expected response code for the request method.
+            **kwargs: Passed on to the requests package.
+
+        Returns:
+            concurrent.futures.Future: A future for the parsed JSON data
+            returned by the API endpoint (None, if the response has no body).
+            If the request fails, the future's result raises the exception.
+
+        """
+        assert isinstance(method, basestring)
+        assert isinstance(url, basestring)
+        assert erc is None or isinstance(erc, int)
+
+        if erc is None:
+            erc = EXPECTED_RESPONSE_CODE[method.upper()]
+
+        abs_url = self.abs_url(url)
+        kwargs.setdefault('timeout', self.single_request_timeout)
+        retry_policy = kwargs.pop('retry_policy', self._retry_policy)
+        endpoint = _api_endpoint(abs_url, self.base_url)
+
+        future = Future()
+        self.deferred_executor.call_soon(self._deferred_request, future,
+                                         method, abs_url, erc, endpoint,
+                                         retry_policy, kwargs,
+                                         start_time=time.time())
+        return future
+
+    def _deferred_request(self, future, method, abs_url, erc, endpoint,
+                          retry_policy, kwargs, attempt=1, paced=False,
+                          attempts=1, rate_limit_wait=0.0, start_time=None):
+        """Make a single attempt at a request submitted with `submit()`.
+
+        If the request has to wait (for the endpoint's pace, a `Retry-After`
+        period or a retry backoff), the attempt is re-scheduled on the deferred
+        executor instead of sleeping.  `attempt` counts the retry policy's
+        attempts, and `attempts` all of the attempts (including rate-limit
+        retries); a RequestEvent is emitted when the request completes.
+
+        """
+        logger = logging.getLogger(__name__)
+
+        if future.cancelled():
+            return
+
+        if start_time is None:
+            start_time = time.time()
+        state = dict(attempt=attempt, attempts=attempts,
+                     rate_limit_wait=rate_limit_wait, start_time=start_time)
+        instrumentation = self._instrumentation
+
+        # Pace the requests sent to the API endpoint
+        rate_limiter = self._rate_limiter
+        if rate_limiter is not None and not paced:
+            wait = rate_limiter.bucket(endpoint).reserve()
+            if wait > 0:
+                state['rate_limit_wait'] += wait
+                self._defer_request(
+                    wait, future, method, abs_url, erc, endpoint,
+                    retry_policy, kwargs, paced=True, **state
+                )
+                return
+
+        try:
+            response = self._req_session.request(method, abs_url, **kwargs)
+            check_response_code(response, erc)
+
+        except SparkRateLimitError as e:
+            if rate_limiter is not None:
+                rate_limiter.on_rate_limit(endpoint, e.retry_after)
+
+            if self.wait_on_rate_limit and e.retry_after:
+                logger.info("Received rate-limit message; retrying in {0} "
+                            "seconds.".format(e.retry_after))
+                # The rate limiter (if any) holds the endpoint until
+                # retry_after has elapsed; so the retry is not paced again
+                state['attempts'] += 1
+                state['rate_limit_wait'] += e.retry_after
+                self._defer_request(
+                    e.retry_after, future, method, abs_url, erc, endpoint,
+                    retry_policy, kwargs, paced=True, **state
+                )
+            else:
+                if instrumentation is not None:
+                    self._emit_request_event(
+                        instrumentation, method, abs_url, e.response, kwargs,
+                        attempts, rate_limit_wait, start_time, e,
+                    )
+                future.set_exception(e)
+
+        except Exception as e:
+            if (retry_policy is not None and
+                    retry_policy.should_retry(method, attempt, e)):
+                backoff = retry_policy.backoff(attempt)
+                logger.info("Request failed ({0}); retrying in {1:.2f} "
+                            "seconds.".format(_error_summary(e), backoff))
+                state['attempt'] += 1
+                state['attempts'] += 1
+                self._defer_request(
+                    backoff, future, method, abs_url, erc, endpoint,
+                    retry_policy, kwargs, **state
+                )
+            else:
+                if instrumentation is not None:
+                    self._emit_request_event(
+                        instrumentation, method, abs_url,
+                        getattr(e, 'response', None), kwargs, attempts,
+                        rate_limit_wait, start_time, e,
+                    )
+                future.set_exception(e)
+
+        else:
+            if rate_limiter is not None:
+                rate_limiter.on_success(endpoint)
+            if instrumentation is not None:
+                self._emit_request_event(
+                    instrumentation, method, abs_url, response, kwargs,
+                    attempts, rate_limit_wait, start_time, None,
+                )
+            try:
+                result = self._decode_json(response) \
+                    if response.content else None
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+    def _defer_request(self, delay, future, *args, **kwargs):
+        """Re-schedule a `_deferred_request()` attempt after `delay` seconds.
+
+        If the deferred executor has been shut down, the request's future is
+        failed instead; so that its callers are not left waiting.
+
+        """
+        try:
+            self.deferred_executor.call_later(delay, self._deferred_request,
+                                              future, *args, **kwargs)
+        except RuntimeError as e:
+            future.set_exception(e)
+
     def get(self, url, params=None, **kwargs):
         """Sends a GET request.
 
+        When a response cache is in use, GETs for cached responses are sent
+        as conditional requests, and the cached JSON data is returned if Cisco
+        Spark responds `304 Not Modified`.
+
+        When coalescing is enabled, identical concurrent GET requests (same
+        URL, parameters, expected response code, headers and request options)
+        made by multiple threads are coalesced: only one request is sent, and
+        each of the callers gets its own copy of the parsed JSON data.
+
         Args:
             url(basestring): The URL of the API endpoint.
             params(dict): The parameters for the HTTP GET request.
             **kwargs:
                 erc(int): The expected (success) response code for the request.
+                coalesce(bool): Overrides the session's `coalesce_gets`
+                    setting for this request.
                 others: Passed on to the requests package.
 
         Raises:
@@ -315,19 +969,150 @@ class RestSession(object):
         # Expected response code
         erc = kwargs.pop('erc', EXPECTED_RESPONSE_CODE['GET'])
 
+        coalesce = kwargs.pop('coalesce', self._coalesce_gets)
+        if coalesce:
+            key = coalescing_key(self.abs_url(url), params, erc, **kwargs)
+            return self._singleflight.do(key, self._get, url, params, erc,
+                                         **kwargs)
+
+        return self._get(url, params, erc, **kwargs)
+
+    def _get(self, url, params, erc, **kwargs):
+        """Send a GET request; return the parsed JSON data."""
+        response_cache = self._response_cache
+        if response_cache is None:
+            response = self.request('GET', url, erc, params=params, **kwargs)
+            return self._decode_json(response)
+
+        key = request_key(self.abs_url(url), params)
+        cached_response = response_cache.get(key)
+        if cached_response is not None:
+            # Revalidate the cached response
+            headers = dict(kwargs.pop('headers', None) or {})
+            headers.update(response_cache.conditional_headers(cached_response))
+            kwargs['headers'] = headers
+            erc = (erc, NOT_MODIFIED_RESPONSE_CODE)
+
         response = self.request('GET', url, erc, params=params, **kwargs)
-        return extract_and_parse_json(response)
+
+        if (cached_response is not None and
+                response.status_code == NOT_MODIFIED_RESPONSE_CODE):
+            response_cache.record_hit(key)
+            # The cached JSON data is shared; each caller gets its own copy
+            return copy_json(cached_response.json_data)
+
+        json_data = self._decode_json(response)
+        response_cache.store(key, response, json_data)
+        return json_data
+
+    def get_raw(self, url, params=None, **kwargs):
+        """Sends a GET request; returns the raw (unparsed) JSON body (bytes).
+
+        The response body is returned as received, without being parsed; and
+        is not cached in the response cache.  Identical concurrent requests
+        are coalesced, when coalescing is enabled (see `get()`).
+
+        Args:
+            url(basestring): The URL of the API endpoint.
+            params(dict): The parameters for the HTTP GET request.
+            **kwargs:
+                erc(int): The expected (success) response code for the request.
+                coalesce(bool): Overrides the session's `coalesce_gets`
+                    setting for this request.
+                others: Passed on to the requests package.
+
+        Raises:
+            SparkApiError: If anything other than the expected response code is
+                returned by the Cisco Spark API endpoint.
+
+        """
+        assert isinstance(url, basestring)
+        assert params is None or isinstance(params, dict)
+
+        # Expected response code
+        erc = kwargs.pop('erc', EXPECTED_RESPONSE_CODE['GET'])
+
+        def get_content():
+            return self.request('GET', url, erc, params=params,
+                                **kwargs).content
+
+        if kwargs.pop('coalesce', self._coalesce_gets):
+            key = coalescing_key(self.abs_url(url), params, erc,
+                                 **kwargs) + ('raw',)
+            return self._singleflight.do(key, get_content)
+
+        return get_content()
+
+    def get_entity(self, resource, entity_id, **kwargs):
+        """GET a single entity, by ID, using the entity cache (if enabled).
+
+        In raw JSON mode, the entity's raw (unparsed) JSON response body is
+        returned (see `get_raw()`); the SparkData models accept either, and
+        only parse raw JSON when their data is accessed.
+
+        Args:
+            resource(basestring): The resource (API endpoint) of the entity;
+                i.e. 'people', 'rooms', etc.
+            entity_id(basestring): The ID of the entity.
+            **kwargs:
+                raw_json(bool): Overrides the session's `raw_json` setting for
+                    this request.
+                others: Passed on to `get()`.
+
+        Raises:
+            SparkApiError: If anything other than the expected response code is
+                returned by the Cisco Spark API endpoint.
+
+        """
+        assert isinstance(resource, basestring)
+        assert isinstance(entity_id, basestring)
+
+        if self._entity_cache is not None:
+            json_data = self._entity_cache.get(resource, entity_id)
+            if json_data is not None:
+                return json_data
+
+        if kwargs.pop('raw_json', self._raw_json):
+            json_data = self.get_raw(resource + '/' + entity_id, **kwargs)
+        else:
+            json_data = self.get(resource + '/' + entity_id, **kwargs)
+
+        if self._entity_cache is not None:
+            self._entity_cache.set(resource, entity_id, json_data)
+
+        return json_data
+
+    def invalidate_entity(self, resource, entity_id):
+        """Remove an entity from the entity cache (if enabled).
+
+        Args:
+            resource(basestring): The resource (API endpoint) of the entity.
+            entity_id(basestring): The ID of the entity.
+
+        """
+        if self._entity_cache is not None:
+            self._entity_cache.invalidate(resource, entity_id)
 
     def get_pages(self, url, params=None, **kwargs):
         """Return a generator that GETs and yields pages of data.
 
         Provides native support for RFC5988 Web Linking.
 
+        With read-ahead enabled, the following pages are requested (and
+        parsed) in a background thread while the consumer processes the
+        current page; up to `prefetch` pages ahead of the consumer.  This
+        overlaps the network latency of a page with the consumer's processing
+        of the previous page; when the consumer does little per page, the
+        thread hand-off costs more than it saves (see the `PrefetchSuite`
+        benchmarks).
+
         Args:
             url(basestring): The URL of the API endpoint.
             params(dict): The parameters for the HTTP GET request.
             **kwargs:
                 erc(int): The expected (success) response code for the request.
+                prefetch(int): The number of pages to request ahead of the
+                    consumer.  Defaults to the session's `prefetch_pages`.
                 others: Passed on to the requests package.
 
         Raises:
@@ -341,11 +1126,23 @@ class RestSession(object):
         # Expected response code
         erc = kwargs.pop('erc', EXPECTED_RESPONSE_CODE['GET'])
 
+        prefetch = kwargs.pop('prefetch', self._prefetch_pages)
+        assert isinstance(prefetch, int) and prefetch >= 0
+
+        pages = self._get_pages(url, params, erc, **kwargs)
+        if prefetch:
+            pages = _read_ahead(pages, prefetch)
+
+        for page in pages:
+            yield page
+
+    def _get_pages(self, url, params, erc, **kwargs):
+        """GET and yield pages of data, following the RFC5988 next links."""
         # First request
         response = self.request('GET', url, erc, params=params, **kwargs)
 
         while True:
-            yield extract_and_parse_json(response)
+            yield self._decode_json(response)
 
             if response.links.get('next'):
                 next_url = response.links.get('next').get('url')
@@ -370,11 +1167,22 @@ class RestSession(object):
         generator will request additional pages as needed until all items have
         been returned.
 
+        In streaming mode, each page is read from the network incrementally
+        (`stream=True`), and its items are parsed and yielded as they arrive;
+        rather than after the whole page has been received and parsed.  This
+        reduces the time to the first item and the peak memory used by large
+        pages (i.e. `max=1000`).  Pages are not read ahead in streaming mode.
+        Items can only be streamed by the standard library's decoder; when the
+        session's `json_decoder` is a function, the pages are not streamed
+        and are parsed whole by that function.
+
         Args:
             url(basestring): The URL of the API endpoint.
             params(dict): The parameters for the HTTP GET request.
             **kwargs:
                 erc(int): The expected (success) response code for the request.
+                stream_items(bool): Overrides the session's `stream_items`
+                    setting for this request.
                 others: Passed on to the requests package.
 
         Raises:
@@ -384,6 +1192,12 @@ class RestSession(object):
                 top-level dictionary with an 'items' key.
 
         """
+        stream_items = kwargs.pop('stream_items', self._stream_items)
+        if stream_items and not callable(self._json_decoder):
+            for item in self._stream_items_from_pages(url, params, **kwargs):
+                yield item
+            return
+
         # Get generator for pages of JSON data
         pages = self.get_pages(url, params=params, **kwargs)
 
@@ -401,6 +1215,30 @@ class RestSession(object):
                 for item in items:
                     yield item
 
+    def _stream_items_from_pages(self, url, params, **kwargs):
+        """GET pages with streamed responses; yield items as they arrive."""
+        erc = kwargs.pop('erc', EXPECTED_RESPONSE_CODE['GET'])
+        kwargs.pop('prefetch', None)
+
+        if self._json_decoder == 'compat':
+            decoder = json.JSONDecoder(object_hook=OrderedDict)
+        else:
+            decoder = json.JSONDecoder()
+
+        while url:
+            response = self.request('GET', url, erc, params=params,
+                                    stream=True, **kwargs)
+            try:
+                chunks = response.iter_content(STREAM_CHUNK_SIZE)
+                for item in iter_json_items(chunks, decoder=decoder):
+                    yield item
+            finally:
+                response.close()
+
+            next_link = response.links.get('next')
+            url = _fix_next_url(next_link['url']) if next_link else None
+            params = None
+
     def post(self, url, json=None, data=None, **kwargs):
         """Sends a POST request.
 
@@ -424,7 +1262,7 @@ class RestSession(object):
 
         response = self.request('POST', url, erc, json=json, data=data,
                                 **kwargs)
-        return extract_and_parse_json(response)
+        return self._decode_json(response)
 
     def put(self, url, json=None, data=None, **kwargs):
         """Sends a PUT request.
@@ -449,7 +1287,7 @@ class RestSession(object):
 
         response = self.request('PUT', url, erc, json=json, data=data,
                                 **kwargs)
-        return extract_and_parse_json(response)
+        return self._decode_json(response)
 
     def delete(self, url, **kwargs):
         """Sends a DELETE request.
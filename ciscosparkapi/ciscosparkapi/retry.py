@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""RetryPolicy class for retrying failed requests to the Cisco Spark APIs.
+
+Classes:
+    RetryPolicy: Decides which failed requests are retried, and how long to
+        wait (exponential backoff with jitter) before each retry.
+
+"""
+
+
+# Use future for Python v2 and v3 compatibility
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+from builtins import *
+
+
+__author__ = "Chris Lunsford"
+__author_email__ = "chrlunsf@cisco.com"
+__copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
+__license__ = "MIT"
+
+
+import random
+
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from .exceptions import SparkApiError, SparkRateLimitError
+from .utils import check_type
+
+
+# Module Constants
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+DEFAULT_BACKOFF_MAX = 30
+RETRY_RESPONSE_CODES = (500, 502, 503, 504)
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+
+
+def _connection_not_established(error):
+    """Did a request fail because its connection couldn't be established.
+
+    i.e. the connection attempt timed out, or was refused (or the host name
+    could not be resolved); in which case the request was never sent.
+    """
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(error, requests.exceptions.ConnectionError) and error.args:
+        reason = error.args[0]
+        if isinstance(reason, MaxRetryError):
+            reason = reason.reason
+        return isinstance(reason, NewConnectionError)
+    return False
+
+
+class RetryPolicy(object):
+    """Retry policy for transient request failures.
+
+    Requests that fail with a server error (500, 502, 503 or 504 by default),
+    a connection error or a timeout are retried, up to `max_attempts` attempts
+    in total, waiting a random ("full jitter") backoff time between attempts:
+    a random time between zero and `backoff_factor * 2 ** (attempt - 1)`
+    seconds (capped at `backoff_max`).
+
+    Only idempotent requests are retried after they may have reached the
+    server; non-idempotent requests (i.e. POSTs to `messages`) are only
+    retried if the connection to the server could not be established, so that
+    retries never duplicate a message.
+
+    Rate-limit (429) responses are not handled by the retry policy; see
+    `wait_on_rate_limit`.
+
+    """
+
+    def __init__(self, max_attempts=DEFAULT_MAX_ATTEMPTS,
+                 backoff_factor=DEFAULT_BACKOFF_FACTOR,
+                 backoff_max=DEFAULT_BACKOFF_MAX,
+                 status_codes=RETRY_RESPONSE_CODES,
+                 methods=IDEMPOTENT_METHODS):
+        """Initialize a new RetryPolicy object.
+
+        Args:
+            max_attempts(int): The maximum number of attempts (including the
+                first attempt) made for a request.
+            backoff_factor(int, float): The backoff time base (in seconds).
+            backoff_max(int, float): The maximum backoff time (in seconds).
+            status_codes(tuple): The response codes that are retried.
+            methods(tuple): The (idempotent) request methods that are retried
+                after the request may have reached the server.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ValueError: If max_attempts is less than one (1).
+
+        """
+        check_type(max_attempts, int, may_be_none=False)
+        check_type(backoff_factor, (int, float), may_be_none=False)
+        check_type(backoff_max, (int, float), may_be_none=False)
+        check_type(status_codes, (tuple, list, set, frozenset),
+                   may_be_none=False)
+        check_type(methods, (tuple, list, set, frozenset), may_be_none=False)
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be greater than zero (0).")
+
+        super(RetryPolicy, self).__init__()
+
+        self._max_attempts = max_attempts
+        self._backoff_factor = backoff_factor
+        self._backoff_max = backoff_max
+        self._status_codes = frozenset(status_codes)
+        self._methods = frozenset(method.upper() for method in methods)
+
+    @property
+    def max_attempts(self):
+        """The maximum number of attempts made for a request."""
+        return self._max_attempts
+
+    def is_retryable(self, method, error):
+        """Is a request that failed with `error` safe (and worth) retrying.
+
+        Args:
+            method(basestring): The request-method type ('GET', 'POST', etc.).
+            error(Exception): The exception raised by the failed attempt.
+
+        Returns:
+            bool: True if the request may be retried.
+
+        """
+        if _connection_not_established(error):
+            # The request wasn't sent
+            return True
+
+        idempotent = method.upper() in self._methods
+
+        if isinstance(error, (requests.exceptions.ConnectionError,
+                              requests.exceptions.Timeout)):
+            return idempotent
+
+        if isinstance(error, SparkRateLimitError):
+            return False
+
+        if isinstance(error, SparkApiError):
+            return (idempotent and
+                    error.response.status_code in self._status_codes)
+
+        return False
+
+    def should_retry(self, method, attempt, error):
+        """Should a failed attempt (attempt number `attempt`) be retried."""
+        return (attempt < self._max_attempts and
+                self.is_retryable(method, error))
+
+    def backoff(self, attempt):
+        """The time (in seconds) to wait after attempt number `attempt`."""
+        ceiling = min(self._backoff_max,
+                      self._backoff_factor * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
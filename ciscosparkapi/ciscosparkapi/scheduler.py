@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""DeferredExecutor class for running calls now or at a later time.
+
+Classes:
+    DeferredExecutor: A thread pool that can also run calls at a scheduled
+        time, without holding a worker thread while the call is waiting.
+
+"""
+
+
+# Use future for Python v2 and v3 compatibility
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+from builtins import *
+
+
+__author__ = "Chris Lunsford"
+__author_email__ = "chrlunsf@cisco.com"
+__copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
+__license__ = "MIT"
+
+
+from concurrent.futures import Future, ThreadPoolExecutor
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+from .utils import check_type
+
+
+# Module Constants
+DEFAULT_DEFERRED_MAX_WORKERS = 8
+
+
+class DeferredExecutor(object):
+    """Run calls on a thread pool, immediately or at a scheduled time.
+
+    Scheduled calls are held in a queue (ordered by their deadlines) by a
+    single timer thread, and are handed to the worker pool when their
+    deadlines arrive; so that waiting calls do not hold worker threads.
+
+    """
+
+    def __init__(self, max_workers=DEFAULT_DEFERRED_MAX_WORKERS):
+        """Initialize a new DeferredExecutor object.
+
+        Args:
+            max_workers(int): The number of worker threads.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+
+        """
+        check_type(max_workers, int, may_be_none=False)
+
+        super(DeferredExecutor, self).__init__()
+
+        self._executor = ThreadPoolExecutor(max_workers)
+        self._queue = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._timer = None
+        self._shutdown = False
+
+    @property
+    def pending(self):
+        """The number of calls waiting for their scheduled time."""
+        return len(self._queue)
+
+    def call_soon(self, function, *args, **kwargs):
+        """Run a call on the worker pool as soon as a worker is available."""
+        self._executor.submit(self._run, function, args, kwargs)
+
+    def call_at(self, deadline, function, *args, **kwargs):
+        """Run a call on the worker pool at (or after) a scheduled time.
+
+        Args:
+            deadline(float): The time (as returned by `time.time()`) when the
+                call should be run.
+            function(func): The function to be called.
+            *args: The arguments passed to the function.
+            **kwargs: The keyword arguments passed to the function.
+
+        """
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("Cannot schedule calls after shutdown.")
+
+            heapq.heappush(self._queue, (deadline, next(self._sequence),
+                                         function, args, kwargs))
+
+            if self._timer is None:
+                self._timer = threading.Thread(target=self._run_timer,
+                                               name="DeferredExecutorTimer")
+                self._timer.daemon = True
+                self._timer.start()
+
+            self._condition.notify()
+
+    def call_later(self, delay, function, *args, **kwargs):
+        """Run a call on the worker pool after `delay` seconds."""
+        self.call_at(time.time() + delay, function, *args, **kwargs)
+
+    def shutdown(self, wait=True):
+        """Stop the timer thread and shut down the worker pool.
+
+        Calls waiting for their scheduled time are discarded; any (pending)
+        Future passed as an argument to a discarded call is failed with a
+        RuntimeError, so that its callers are not left waiting.
+
+        """
+        with self._condition:
+            self._shutdown = True
+            discarded, self._queue = self._queue, []
+            self._condition.notify()
+
+        error = RuntimeError("The deferred executor was shut down before the "
+                             "call was run.")
+        for _, _, _, args, kwargs in discarded:
+            for argument in itertools.chain(args, kwargs.values()):
+                if isinstance(argument, Future) and not argument.done():
+                    argument.set_exception(error)
+
+        self._executor.shutdown(wait=wait)
+
+    def _run_timer(self):
+        """Hand scheduled calls to the worker pool when they are due."""
+        with self._condition:
+            while not self._shutdown:
+                if not self._queue:
+                    self._condition.wait()
+                    continue
+
+                delay = self._queue[0][0] - time.time()
+                if delay > 0:
+                    self._condition.wait(delay)
+                    continue
+
+                _, _, function, args, kwargs = heapq.heappop(self._queue)
+                self._executor.submit(self._run, function, args, kwargs)
+
+    @staticmethod
+    def _run(function, args, kwargs):
+        """Run a call; log (rather than lose) any unhandled exceptions."""
+        try:
+            function(*args, **kwargs)
+        except Exception:
+            logger = logging.getLogger(__name__)
+            logger.exception("Unhandled exception in a deferred call.")
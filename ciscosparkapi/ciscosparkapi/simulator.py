@@ -0,0 +1,707 @@
+# -*- coding: utf-8 -*-
+"""Offline (localhost) Cisco Spark API simulator.
+
+Classes:
+    SparkSimulator: A local, in-memory Cisco Spark API server for offline
+        load and performance testing.
+
+The simulator implements the API endpoints used by the ciscosparkapi package
+(people, rooms, memberships, messages, teams, team memberships, webhooks,
+organizations, licenses and roles) against an in-memory data store; with
+RFC5988 (Link header) pagination, conditional GETs (ETags), configurable
+response latency, and rate-limit (429 + Retry-After) and server error (5xx)
+fault injection.  Faults are injected at configurable rates (using a seeded
+random number generator) or explicitly for the next N requests, so that
+performance features can be measured deterministically without access to the
+Cisco Spark cloud.
+
+Example:
+    >>> with SparkSimulator(latency=0.01, rate_limit_rate=0.05) as simulator:
+    ...     simulator.populate(rooms=10, messages_per_room=500)
+    ...     api = simulator.api()
+    ...     rooms = list(api.rooms.list())
+
+"""
+
+
+# Use future for Python v2 and v3 compatibility
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+from builtins import *
+from past.builtins import basestring
+from future import standard_library
+standard_library.install_aliases()
+
+
+__author__ = "Chris Lunsford"
+__author_email__ = "chrlunsf@cisco.com"
+__copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
+__license__ = "MIT"
+
+
+import base64
+from collections import OrderedDict
+import email.parser
+import hashlib
+import json
+import random
+import threading
+import time
+import urllib.parse
+
+from future.moves import socketserver
+from future.moves.http import server as http_server
+
+from .utils import check_type
+
+
+# Module Constants
+DEFAULT_ACCESS_TOKEN = 'simulator-access-token'
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+DEFAULT_RETRY_AFTER = 1
+DEFAULT_ERROR_STATUS = 503
+
+# Resource (API endpoint) -> (ID type, list query filters)
+RESOURCES = OrderedDict([
+    ('people', ('PEOPLE', ('id', 'email', 'displayName', 'orgId'))),
+    ('rooms', ('ROOM', ('teamId', 'type'))),
+    ('memberships', ('MEMBERSHIP', ('roomId', 'personId', 'personEmail'))),
+    ('messages', ('MESSAGE', ('roomId', 'mentionedPeople'))),
+    ('teams', ('TEAM', ())),
+    ('team/memberships', ('TEAM_MEMBERSHIP', ('teamId',))),
+    ('webhooks', ('WEBHOOK', ())),
+    ('organizations', ('ORGANIZATION', ())),
+    ('licenses', ('LICENSE', ('orgId',))),
+    ('roles', ('ROLE', ())),
+])
+
+# Fields required to create (POST) an item
+REQUIRED_FIELDS = {
+    'rooms': (('title',),),
+    'memberships': (('roomId',), ('personId', 'personEmail')),
+    'messages': (('roomId', 'toPersonId', 'toPersonEmail'),),
+    'teams': (('name',),),
+    'team/memberships': (('teamId',), ('personId', 'personEmail')),
+    'webhooks': (('name',), ('targetUrl',), ('resource',), ('event',)),
+    'people': (('emails',),),
+}
+
+
+class SimulatedError(Exception):
+    """An API error response returned by the simulator."""
+
+    def __init__(self, status_code, message, headers=None):
+        super(SimulatedError, self).__init__(message)
+        self.status_code = status_code
+        self.message = message
+        self.headers = headers or {}
+
+
+def _timestamp():
+    """The current time as an ISO8601 (Spark format) timestamp."""
+    return time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime())
+
+
+class SparkSimulator(object):
+    """A local, in-memory Cisco Spark API server.
+
+    The simulator serves the Cisco Spark API on a localhost port (in a
+    background thread) and may be used as a context manager, which starts
+    and stops the server.  Point a CiscoSparkAPI object at the simulator's
+    `url` (or use `api()`) to exercise the client without network access.
+
+    """
+
+    def __init__(self, access_token=DEFAULT_ACCESS_TOKEN, host='127.0.0.1',
+                 port=0, latency=0.0, jitter=0.0, rate_limit_rate=0.0,
+                 retry_after=DEFAULT_RETRY_AFTER, error_rate=0.0,
+                 error_status=DEFAULT_ERROR_STATUS,
+                 page_size=DEFAULT_PAGE_SIZE, seed=None):
+        """Initialize a new SparkSimulator object.
+
+        Args:
+            access_token(basestring): The access token accepted by the
+                simulator (as the `Authorization: Bearer` credential).
+            host(basestring): The host (interface) the simulator listens on.
+            port(int): The port the simulator listens on; zero (0) picks a
+                free port.
+            latency(int, float): The time (in seconds) the simulator waits
+                before responding to each request.
+            jitter(int, float): A random time (in seconds), between zero and
+                `jitter`, added to each request's latency.
+            rate_limit_rate(float): The fraction (0.0 - 1.0) of requests that
+                are rejected with a 429 (rate limited) response.
+            retry_after(int): The `Retry-After` (seconds) of the simulated
+                429 responses.
+            error_rate(float): The fraction (0.0 - 1.0) of requests that
+                fail with a server error (`error_status`) response.
+            error_status(int): The status code of the simulated server
+                errors.
+            page_size(int): The number of items per page of list responses,
+                when the request does not specify `max`.
+            seed(int): The seed of the random number generator used for
+                fault injection and latency jitter.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+
+        """
+        check_type(access_token, basestring, may_be_none=False)
+        check_type(host, basestring, may_be_none=False)
+        check_type(port, int, may_be_none=False)
+        check_type(latency, (int, float), may_be_none=False)
+        check_type(jitter, (int, float), may_be_none=False)
+        check_type(rate_limit_rate, (int, float), may_be_none=False)
+        check_type(retry_after, int, may_be_none=False)
+        check_type(error_rate, (int, float), may_be_none=False)
+        check_type(error_status, int, may_be_none=False)
+        check_type(page_size, int, may_be_none=False)
+        check_type(seed, int)
+
+        super(SparkSimulator, self).__init__()
+
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.page_size = page_size
+
+        self._access_token = access_token
+        self._host = host
+        self._port = port
+        self._random = random.Random(seed)
+        self._lock = threading.RLock()
+        self._server = None
+        self._thread = None
+
+        self._items = {resource: OrderedDict() for resource in RESOURCES}
+        self._contents = {}
+        self._next_id = 0
+        self._faults = []
+        self._stats = {
+            'requests': 0,
+            'rate_limited': 0,
+            'errors': 0,
+            'not_modified': 0,
+            'endpoints': {},
+        }
+
+        self._me = self.create('people', emails=['simulator@example.com'],
+                               displayName='Spark Simulator')
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @property
+    def access_token(self):
+        """The access token accepted by the simulator."""
+        return self._access_token
+
+    @property
+    def url(self):
+        """The base URL of the simulated API (i.e. for `base_url`)."""
+        if self._server is None:
+            raise RuntimeError("The simulator has not been started.")
+        return 'http://{}:{}/v1/'.format(self._host,
+                                         self._server.server_address[1])
+
+    @property
+    def me(self):
+        """The person (dict) authenticated by the simulator's access token."""
+        return self._me
+
+    def start(self):
+        """Start serving the simulated API in a background thread."""
+        if self._server is not None:
+            return
+        self._server = _ThreadingHTTPServer((self._host, self._port),
+                                            _SimulatorRequestHandler)
+        self._server.simulator = self
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name='SparkSimulator')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Stop the simulator's server."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        self._thread = None
+
+    def api(self, **kwargs):
+        """A CiscoSparkAPI object connected to the simulator.
+
+        Args:
+            **kwargs: Passed on to `CiscoSparkAPI()`.
+
+        """
+        from . import CiscoSparkAPI
+        return CiscoSparkAPI(access_token=self._access_token,
+                             base_url=self.url, **kwargs)
+
+    def create(self, resource, **fields):
+        """Add an item to the simulator's data store (no request is made).
+
+        Args:
+            resource(basestring): The resource (API endpoint); i.e. 'rooms'.
+            **fields: The item's JSON attributes.
+
+        Returns:
+            dict: The created item.
+
+        Raises:
+            ValueError: If the resource is not simulated.
+
+        """
+        if resource not in RESOURCES:
+            raise ValueError("Unknown resource {!r}.".format(resource))
+
+        with self._lock:
+            self._next_id += 1
+            id_type = RESOURCES[resource][0]
+            item_id = base64.urlsafe_b64encode('ciscospark://us/{}/{:012d}'
+                                               ''.format(id_type,
+                                                         self._next_id)
+                                               .encode('utf-8'))
+            item = OrderedDict([('id', item_id.decode('utf-8').rstrip('='))])
+            item.update(self._defaults(resource, fields))
+            item.update((key, value) for key, value in fields.items()
+                        if key != 'id')
+            item.setdefault('created', _timestamp())
+            self._items[resource][item['id']] = item
+            return item
+
+    def populate(self, people=0, rooms=0, members_per_room=0,
+                 messages_per_room=0):
+        """Add generated people, rooms, memberships and messages.
+
+        Args:
+            people(int): The number of people to add.
+            rooms(int): The number of rooms to add.
+            members_per_room(int): The number of (generated) people added to
+                each room, in addition to the simulator's user.
+            messages_per_room(int): The number of messages posted in each
+                room.
+
+        Returns:
+            list: The IDs of the rooms that were added.
+
+        """
+        with self._lock:
+            offset = len(self._items['people'])
+            people_ids = [
+                self.create('people',
+                            emails=['person{}@example.com'.format(offset + i)],
+                            displayName='Person {}'.format(offset + i))['id']
+                for i in range(max(people, members_per_room))
+            ]
+
+            room_ids = []
+            for i in range(rooms):
+                room = self.create('rooms', title='Room {}'.format(i))
+                room_ids.append(room['id'])
+                for person_id in [self._me['id']] + \
+                        people_ids[:members_per_room]:
+                    self.create('memberships', roomId=room['id'],
+                                personId=person_id)
+                for j in range(messages_per_room):
+                    self.create('messages', roomId=room['id'],
+                                text='Message {}'.format(j))
+            return room_ids
+
+    def inject(self, status_code, count=1, retry_after=None):
+        """Fail the next `count` requests with an error response.
+
+        Args:
+            status_code(int): The status code of the error responses; i.e.
+                429 or 503.
+            count(int): The number of requests to fail.
+            retry_after(int): The `Retry-After` of 429 responses.  Defaults to
+                the simulator's `retry_after`.
+
+        """
+        check_type(status_code, int, may_be_none=False)
+        check_type(count, int, may_be_none=False)
+        check_type(retry_after, int)
+        with self._lock:
+            self._faults.extend([(status_code, retry_after)] * count)
+
+    def stats(self):
+        """Return a dictionary of the simulator's request statistics."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['endpoints'] = dict(self._stats['endpoints'])
+            return stats
+
+    def items(self, resource):
+        """The items (dicts) of a resource, in the order they were created."""
+        with self._lock:
+            return list(self._items[resource].values())
+
+    # Request handling
+
+    def handle(self, method, path, headers, body):
+        """Handle a simulated API request.
+
+        Returns:
+            tuple: (status code, headers dict, body bytes)
+
+        """
+        parsed_url = urllib.parse.urlparse(path)
+        params = OrderedDict(urllib.parse.parse_qsl(parsed_url.query))
+        path = parsed_url.path
+        if path.startswith('/v1/'):
+            path = path[len('/v1/'):]
+        path = path.strip('/')
+
+        if path.startswith('team/memberships'):
+            resource = 'team/memberships'
+        else:
+            resource = path.split('/')[0]
+        item_id = path[len(resource) + 1:] or None
+
+        self._record(resource)
+        self._delay()
+
+        try:
+            self._inject_fault()
+            if resource == 'contents' and method == 'GET':
+                return self._content(item_id)
+            self._authenticate(headers)
+            if resource not in RESOURCES:
+                raise SimulatedError(404, "Unknown API endpoint.")
+
+            extra_headers = {}
+            if method == 'GET' and item_id is None:
+                data, extra_headers = self._list(resource, params, path)
+            elif method == 'GET':
+                data = self._get(resource, item_id)
+            elif method == 'POST' and item_id is None:
+                data = self._post(resource, headers, body)
+            elif method == 'PUT' and item_id is not None:
+                data = self._put(resource, item_id, body)
+            elif method == 'DELETE' and item_id is not None:
+                self._delete(resource, item_id)
+                return 204, {}, b''
+            else:
+                raise SimulatedError(405, "Method not allowed.")
+
+        except SimulatedError as error:
+            body = json.dumps({
+                'message': error.message,
+                'trackingId': 'SIMULATOR_{}'.format(self._next_id),
+            }).encode('utf-8')
+            return error.status_code, error.headers, body
+
+        body = json.dumps(data).encode('utf-8')
+        etag = '"{}"'.format(hashlib.sha1(body).hexdigest())
+        extra_headers['ETag'] = etag
+        if method == 'GET' and headers.get('If-None-Match') == etag:
+            with self._lock:
+                self._stats['not_modified'] += 1
+            return 304, extra_headers, b''
+        return 200, extra_headers, body
+
+    def _record(self, resource):
+        """Count a request."""
+        with self._lock:
+            self._stats['requests'] += 1
+            endpoints = self._stats['endpoints']
+            endpoints[resource] = endpoints.get(resource, 0) + 1
+
+    def _delay(self):
+        """Wait for the simulated latency."""
+        delay = self.latency
+        if self.jitter:
+            with self._lock:
+                delay += self._random.uniform(0, self.jitter)
+        if delay:
+            time.sleep(delay)
+
+    def _inject_fault(self):
+        """Raise an injected or (randomly) simulated fault, if any."""
+        with self._lock:
+            if self._faults:
+                status_code, retry_after = self._faults.pop(0)
+            elif self.rate_limit_rate and \
+                    self._random.random() < self.rate_limit_rate:
+                status_code, retry_after = 429, None
+            elif self.error_rate and self._random.random() < self.error_rate:
+                status_code, retry_after = self.error_status, None
+            else:
+                return
+
+            if status_code == 429:
+                self._stats['rate_limited'] += 1
+            else:
+                self._stats['errors'] += 1
+
+        if status_code == 429:
+            retry_after = self.retry_after if retry_after is None \
+                else retry_after
+            raise SimulatedError(429, "Too many requests.",
+                                 {'Retry-After': str(retry_after)})
+        raise SimulatedError(status_code, "Simulated server error.")
+
+    def _authenticate(self, headers):
+        """Check the request's access token."""
+        if headers.get('Authorization') != 'Bearer ' + self._access_token:
+            raise SimulatedError(401, "Authentication credentials were "
+                                      "missing or incorrect.")
+
+    def _defaults(self, resource, fields):
+        """The default attributes of a new item."""
+        me = getattr(self, '_me', None) or {}
+        if resource == 'people':
+            return OrderedDict([('emails', []), ('displayName', ''),
+                                ('orgId', 'SIMULATOR_ORG'),
+                                ('type', 'person')])
+        if resource == 'rooms':
+            return OrderedDict([('type', 'group'), ('isLocked', False),
+                                ('lastActivity', _timestamp()),
+                                ('creatorId', me.get('id'))])
+        if resource in ('memberships', 'team/memberships'):
+            person = self._find_person(fields.get('personId'),
+                                       fields.get('personEmail'))
+            defaults = OrderedDict([
+                ('personId', person['id'] if person else
+                 fields.get('personId')),
+                ('personEmail', person['emails'][0]
+                 if person and person['emails'] else
+                 fields.get('personEmail')),
+                ('personDisplayName', person['displayName']
+                 if person else None),
+                ('isModerator', False),
+            ])
+            if resource == 'memberships':
+                defaults['isMonitor'] = False
+            return defaults
+        if resource == 'messages':
+            room = self._items['rooms'].get(fields.get('roomId')) or {}
+            return OrderedDict([
+                ('roomType', room.get('type', 'direct')),
+                ('personId', me.get('id')),
+                ('personEmail', (me.get('emails') or [None])[0]),
+            ])
+        if resource == 'teams':
+            return OrderedDict([('creatorId', me.get('id'))])
+        if resource == 'webhooks':
+            return OrderedDict([('status', 'active'),
+                                ('createdBy', me.get('id'))])
+        return OrderedDict()
+
+    def _find_person(self, person_id=None, person_email=None):
+        """Find a person by ID or email address."""
+        if person_id:
+            return self._items['people'].get(person_id)
+        if person_email:
+            for person in self._items['people'].values():
+                if person_email in person['emails']:
+                    return person
+        return None
+
+    def _matches(self, resource, item, key, value):
+        """Check if an item matches a list query filter."""
+        if resource == 'people' and key == 'id':
+            return item['id'] in value.split(',')
+        if resource == 'people' and key == 'email':
+            return value in item['emails']
+        if resource == 'people' and key == 'displayName':
+            return item['displayName'].startswith(value)
+        if key == 'mentionedPeople':
+            value = self._me['id'] if value == 'me' else value
+            return value in (item.get('mentionedPeople') or [])
+        return item.get(key) == value
+
+    def _list(self, resource, params, path):
+        """List (a page of) a resource's items."""
+        if resource == 'messages' and 'roomId' not in params:
+            raise SimulatedError(400, "roomId is required.")
+
+        try:
+            page_size = int(params.get('max', self.page_size))
+            cursor = int(params.get('cursor', 0))
+        except ValueError:
+            raise SimulatedError(400, "Invalid max or cursor parameter.")
+        page_size = min(max(page_size, 1), MAX_PAGE_SIZE)
+
+        filters = [(key, value) for key, value in params.items()
+                   if key in RESOURCES[resource][1]]
+        with self._lock:
+            items = [item for item in self._items[resource].values()
+                     if all(self._matches(resource, item, key, value)
+                            for key, value in filters)]
+        if resource == 'messages':
+            # Messages are listed newest first
+            items.reverse()
+
+        headers = {}
+        if cursor + page_size < len(items):
+            next_params = OrderedDict(params)
+            next_params['cursor'] = str(cursor + page_size)
+            headers['Link'] = '<{}{}?{}>; rel="next"'.format(
+                self.url, path, urllib.parse.urlencode(next_params)
+            )
+        return {'items': items[cursor:cursor + page_size]}, headers
+
+    def _get(self, resource, item_id):
+        """Get an item by ID."""
+        if resource == 'people' and item_id == 'me':
+            return self._me
+        with self._lock:
+            item = self._items[resource].get(item_id)
+        if item is None:
+            raise SimulatedError(404, "The requested resource could not be "
+                                      "found.")
+        return item
+
+    def _post(self, resource, headers, body):
+        """Create an item from a JSON or multipart (file upload) request."""
+        content_type = headers.get('Content-Type') or ''
+        if content_type.startswith('multipart/form-data'):
+            fields = self._parse_multipart(content_type, body)
+        else:
+            try:
+                fields = json.loads(body.decode('utf-8') or '{}')
+            except ValueError:
+                raise SimulatedError(400, "The request body is not valid "
+                                          "JSON.")
+
+        for alternatives in REQUIRED_FIELDS.get(resource, ()):
+            if not any(fields.get(field) for field in alternatives):
+                raise SimulatedError(400, "{} is required."
+                                          "".format(" or ".join(alternatives)))
+
+        if resource in ('memberships', 'team/memberships'):
+            parent = 'roomId' if resource == 'memberships' else 'teamId'
+            person = self._find_person(fields.get('personId'),
+                                       fields.get('personEmail'))
+            if person is not None:
+                attribute, value = 'personId', person['id']
+            else:
+                attribute, value = 'personEmail', fields.get('personEmail')
+            with self._lock:
+                for membership in self._items[resource].values():
+                    if value and membership.get(parent) == fields[parent] \
+                            and membership.get(attribute) == value:
+                        raise SimulatedError(409, "The person is already a "
+                                                  "member.")
+
+        return self.create(resource, **fields)
+
+    def _parse_multipart(self, content_type, body):
+        """Parse a multipart/form-data body; store any uploaded file."""
+        message = email.parser.BytesParser().parsebytes(
+            b'Content-Type: ' + content_type.encode('utf-8') + b'\r\n\r\n' +
+            body
+        )
+        fields = {}
+        for part in message.get_payload():
+            name = part.get_param('name', header='content-disposition')
+            value = part.get_payload(decode=True)
+            if part.get_filename():
+                with self._lock:
+                    self._next_id += 1
+                    content_id = str(self._next_id)
+                    self._contents[content_id] = (part.get_content_type(),
+                                                  value)
+                fields[name] = [self.url + 'contents/' + content_id]
+            else:
+                fields[name] = value.decode('utf-8')
+        return fields
+
+    def _put(self, resource, item_id, body):
+        """Update an item."""
+        try:
+            fields = json.loads(body.decode('utf-8') or '{}')
+        except ValueError:
+            raise SimulatedError(400, "The request body is not valid JSON.")
+        with self._lock:
+            item = self._get(resource, item_id)
+            item.update((key, value) for key, value in fields.items()
+                        if key != 'id')
+            return item
+
+    def _delete(self, resource, item_id):
+        """Delete an item."""
+        with self._lock:
+            if self._items[resource].pop(item_id, None) is None:
+                raise SimulatedError(404, "The requested resource could not "
+                                          "be found.")
+
+    def _content(self, content_id):
+        """Download an uploaded file."""
+        with self._lock:
+            content = self._contents.get(content_id)
+        if content is None:
+            raise SimulatedError(404, "The requested file could not be "
+                                      "found.")
+        return 200, {'Content-Type': content[0]}, content[1]
+
+
+class _ThreadingHTTPServer(socketserver.ThreadingMixIn,
+                           http_server.HTTPServer):
+    """HTTP server handling each connection in its own (daemon) thread."""
+
+    daemon_threads = True
+
+
+class _SimulatorRequestHandler(http_server.BaseHTTPRequestHandler):
+    """Passes the HTTP requests to the server's SparkSimulator."""
+
+    protocol_version = 'HTTP/1.1'
+    # Send the headers and body without waiting for delayed ACKs
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def _read_body(self):
+        """Read the request body (sent with a length, or chunked)."""
+        if 'chunked' in (self.headers.get('Transfer-Encoding') or ''):
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().split(b';')[0], 16)
+                chunk = self.rfile.read(size)
+                self.rfile.readline()
+                if not size:
+                    return b''.join(chunks)
+                chunks.append(chunk)
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b''
+
+    def _handle(self):
+        body = self._read_body()
+        status, headers, body = self.server.simulator.handle(
+            self.command, self.path, self.headers, body
+        )
+
+        self.send_response(status)
+        if body and 'Content-Type' not in headers:
+            self.send_header('Content-Type', 'application/json;charset=UTF-8')
+        for header, value in headers.items():
+            self.send_header(header, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    do_GET = _handle
+    do_POST = _handle
+    do_PUT = _handle
+    do_DELETE = _handle
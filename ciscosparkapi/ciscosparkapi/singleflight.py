@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""SingleFlight class for coalescing identical concurrent calls.
+
+Classes:
+    SingleFlight: Coalesces identical (same key) concurrent calls made by
+        multiple threads, so that only one call is in flight per key and all
+        of the callers share its result.
+
+Functions:
+    request_key: The key of a GET request's URL and query parameters.
+    coalescing_key: The coalescing key of a GET request.
+
+"""
+
+
+# Use future for Python v2 and v3 compatibility
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+from builtins import *
+
+
+__author__ = "Chris Lunsford"
+__author_email__ = "chrlunsf@cisco.com"
+__copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
+__license__ = "MIT"
+
+
+import threading
+
+
+def request_key(abs_url, params=None):
+    """The key of a GET request's URL and query parameters."""
+    return abs_url, tuple(sorted((str(key), str(value))
+                                 for key, value in (params or {}).items()))
+
+
+def coalescing_key(abs_url, params=None, erc=None, headers=None, **kwargs):
+    """The coalescing key of a GET request.
+
+    Only requests with the same URL, query parameters, expected response
+    code(s), headers (names are case-insensitive) and other request options
+    (timeouts, etc.) may share a response.
+    """
+    return request_key(abs_url, params) + (
+        repr(erc),
+        tuple(sorted((str(name).lower(), str(value))
+                     for name, value in (headers or {}).items())),
+        tuple(sorted((str(name), repr(value))
+                     for name, value in kwargs.items())),
+    )
+
+
+class _Call(object):
+    """An in-flight call, and the outcome shared with its waiters."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """Coalesces identical concurrent calls made by multiple threads.
+
+    The first caller for a key (the leader) makes the call; callers arriving
+    with the same key while the call is in flight wait for, and share, its
+    result (or exception).  Once the call completes, the next caller for the
+    key makes a new call; results are not cached.
+
+    """
+
+    def __init__(self, copy_result=None):
+        """Initialize a new SingleFlight object.
+
+        Args:
+            copy_result(func): Applied to the result handed to each waiting
+                caller; i.e. to give each caller its own copy of a mutable
+                result.  The leader receives the result itself.
+
+        """
+        super(SingleFlight, self).__init__()
+
+        self._copy_result = copy_result
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._coalesced = 0
+
+    @property
+    def coalesced(self):
+        """The number of calls served by sharing an in-flight call."""
+        return self._coalesced
+
+    def do(self, key, function, *args, **kwargs):
+        """Make a call, or wait for an identical call already in flight.
+
+        Args:
+            key: A hashable key identifying identical calls.
+            function(func): The function to be called.
+            *args: The arguments passed to the function.
+            **kwargs: The keyword arguments passed to the function.
+
+        Returns:
+            The value returned by the (leader's) call.
+
+        Raises:
+            Exception: The exception raised by the (leader's) call.
+
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+            else:
+                self._coalesced += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            if self._copy_result is not None:
+                return self._copy_result(call.result)
+            return call.result
+
+        try:
+            call.result = function(*args, **kwargs)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result
@@ -1,142 +1,198 @@
-# -*- coding: utf-8 -*-
-"""SparkData (base-class) models Spark JSON objects as native Python objects.
-
-Classes:
-    SparkData: Models Spark JSON objects as native Python objects.
-
-The SparkData class models any JSON object passed to it as a string or Python
-dictionary as a native Python object; providing attribute access using native
-dot-syntax (`object.attribute`).
-
-SparkData is intended to serve as a base-class, which provides inheritable
-functionality, for concrete sub-classes that model specific Cisco Spark data
-objects (rooms, messages, webhooks, etc.).  The SparkData base-class provides
-attribute access to any additional JSON attributes received from the Cisco
-Spark cloud, which haven't been implemented by the concrete sub-classes.  This
-provides a measure of future-proofing when additional data attributes are added
-to objects by the Cisco Spark cloud.
-
-"""
-
-
-# Use future for Python v2 and v3 compatibility
-from __future__ import (
-    absolute_import,
-    division,
-    print_function,
-    unicode_literals,
-)
-from builtins import *
-from past.builtins import basestring
-
-
-__author__ = "Chris Lunsford"
-__author_email__ = "chrlunsf@cisco.com"
-__copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
-__license__ = "MIT"
-
-
-import json as json_pkg
-
-from collections import OrderedDict
-
-
-def _json_dict(json):
-    """Given a dictionary or JSON string; return a dictionary.
-
-    Args:
-        json(dict, str): Input JSON object.
-
-    Returns:
-        A Python dictionary with the contents of the JSON object.
-
-    Raises:
-        TypeError: If the input object is not a dictionary or string.
-
-    """
-    if isinstance(json, dict):
-        return json
-    elif isinstance(json, basestring):
-        return json_pkg.loads(json, object_hook=OrderedDict)
-    else:
-        error = "'json' must be a dictionary or valid JSON string; " \
-                "received: {!r}".format(json)
-        raise TypeError(error)
-
-
-class SparkData(object):
-    """Model Spark JSON objects as native Python objects."""
-
-    def __init__(self, json):
-        """Init a new SparkData object from a dictionary or JSON string.
-
-        Args:
-            json(dict, str): Input JSON object.
-
-        Raises:
-            TypeError: If the input object is not a dictionary or string.
-
-        """
-        super(SparkData, self).__init__()
-        self._json_data = _json_dict(json)
-
-    def __getattr__(self, item):
-        """Provide native attribute access to the JSON object attributes.
-
-        This method is called when attempting to access a object attribute that
-        hasn't been defined for the object.  For example trying to access
-        object.attribute1 when attribute1 hasn't been defined.
-
-        SparkData.__getattr__() checks the original JSON object to see if the
-        attribute exists, and if it does, it returns the attribute's value
-        from the original JSON object.  This provides native access to all of
-        the JSON object's attributes.
-
-        Args:
-            item(str): Name of the Attribute being accessed.
-
-        Raises:
-            AttributeError:  If the JSON object does not contain the attribute
-                requested.
-
-        """
-        if item in list(self._json_data.keys()):
-            item_data = self._json_data[item]
-            if isinstance(item_data, dict):
-                return SparkData(item_data)
-            else:
-                return item_data
-        else:
-            error = "'{}' object has no attribute " \
-                    "'{}'".format(self.__class__.__name__, item)
-            raise AttributeError(error)
-
-    def __str__(self):
-        """A human-readable string representation of this object."""
-        class_str = self.__class__.__name__
-        json_str = json_pkg.dumps(self._json_data, indent=2)
-        return "{}:\n{}".format(class_str, json_str)
-
-    def __repr__(self):
-        """A string representing this object as valid Python expression."""
-        class_str = self.__class__.__name__
-        json_str = json_pkg.dumps(self._json_data, ensure_ascii=False)
-        return "{}({})".format(class_str, json_str)
-
-    @property
-    def json_data(self):
-        """A copy of the Spark data object's JSON data (OrderedDict)."""
-        return self._json_data.copy()
-
-    def to_dict(self):
-        """Convert the Spark data to a dictionary."""
-        return dict(self._json_data)
-
-    def to_json(self, **kwargs):
-        """Convert the Spark data to JSON.
-
-        Any keyword arguments provided are passed through the Python JSON
-        encoder.
-
-        """
-        return json_pkg.dumps(self._json_data, **kwargs)
+# -*- coding: utf-8 -*-
+"""SparkData (base-class) models Spark JSON objects as native Python objects.
+
+Classes:
+    SparkData: Models Spark JSON objects as native Python objects.
+
+The SparkData class models any JSON object passed to it as a string or Python
+dictionary as a native Python object; providing attribute access using native
+dot-syntax (`object.attribute`).
+
+SparkData is intended to serve as a base-class, which provides inheritable
+functionality, for concrete sub-classes that model specific Cisco Spark data
+objects (rooms, messages, webhooks, etc.).  The SparkData base-class provides
+attribute access to any additional JSON attributes received from the Cisco
+Spark cloud, which haven't been implemented by the concrete sub-classes.  This
+provides a measure of future-proofing when additional data attributes are added
+to objects by the Cisco Spark cloud.
+
+SparkData objects created from a JSON string (or bytes) retain the original
+JSON, which is only parsed when the object's data is first accessed; and
+`to_json()` returns the original JSON.  Objects that are only relayed (i.e. by
+a proxy service) are never parsed or re-serialized.
+
+"""
+
+
+# Use future for Python v2 and v3 compatibility
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+from builtins import *
+from past.builtins import basestring
+
+
+__author__ = "Chris Lunsford"
+__author_email__ = "chrlunsf@cisco.com"
+__copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
+__license__ = "MIT"
+
+
+import json as json_pkg
+import sys
+
+from collections import OrderedDict
+
+from .utils import to_unicode
+
+
+def _json_dict(json):
+    """Given a dictionary or JSON string; return a dictionary.
+
+    Args:
+        json(dict, str): Input JSON object.
+
+    Returns:
+        A Python dictionary with the contents of the JSON object.
+
+    Raises:
+        TypeError: If the input object is not a dictionary or string.
+
+    """
+    if isinstance(json, dict):
+        return json
+    elif isinstance(json, basestring):
+        return json_pkg.loads(json, object_hook=OrderedDict)
+    else:
+        error = "'json' must be a dictionary or valid JSON string; " \
+                "received: {!r}".format(json)
+        raise TypeError(error)
+
+
+class SparkData(object):
+    """Model Spark JSON objects as native Python objects.
+
+    SparkData objects are compact: they are slotted (`__slots__`; no
+    per-instance `__dict__`), and only hold a reference to their JSON data
+    (and the original JSON string, if they were created from one).
+    Concrete sub-classes must declare their own `__slots__` (an empty tuple,
+    or the names of any additional instance attributes).
+
+    """
+
+    __slots__ = ('_json_data', '_nested', '_raw_json')
+
+    def __init__(self, json):
+        """Init a new SparkData object from a dictionary or JSON string.
+
+        A JSON string (or bytes) is retained, and is parsed when the object's
+        data is first accessed; invalid JSON raises a ValueError at that time.
+
+        Args:
+            json(dict, basestring): Input JSON object.
+
+        Raises:
+            TypeError: If the input object is not a dictionary or string.
+
+        """
+        super(SparkData, self).__init__()
+        if isinstance(json, basestring):
+            # Parsed on first access; see __getattr__()
+            self._raw_json = json
+        else:
+            self._json_data = _json_dict(json)
+            self._raw_json = None
+        # Nested JSON objects wrapped as SparkData objects; created on demand
+        self._nested = None
+
+    def __getattr__(self, item):
+        """Provide native attribute access to the JSON object attributes.
+
+        This method is called when attempting to access a object attribute that
+        hasn't been defined for the object.  For example trying to access
+        object.attribute1 when attribute1 hasn't been defined.
+
+        SparkData.__getattr__() checks the original JSON object to see if the
+        attribute exists, and if it does, it returns the attribute's value
+        from the original JSON object.  This provides native access to all of
+        the JSON object's attributes.  Nested JSON objects (dictionaries) are
+        wrapped as SparkData objects the first time they are accessed; and the
+        same wrapped object is returned on subsequent accesses.
+
+        Args:
+            item(str): Name of the Attribute being accessed.
+
+        Raises:
+            AttributeError:  If the JSON object does not contain the attribute
+                requested.
+
+        """
+        if item == '_json_data':
+            raw_json = object.__getattribute__(self, '_raw_json')
+            if raw_json is None:
+                raise AttributeError(item)
+            # Parse the retained JSON on first access; as the 'fast' decoder,
+            # into plain dictionaries (and from bytes directly, if supported)
+            if sys.version_info < (3, 6):
+                raw_json = to_unicode(raw_json)
+            self._json_data = json_pkg.loads(raw_json)
+            return self._json_data
+
+        if item in SparkData.__slots__:
+            # Slot not (yet) initialized; i.e. while unpickling or copying
+            raise AttributeError(item)
+
+        try:
+            item_data = self._json_data[item]
+        except KeyError:
+            error = "'{}' object has no attribute " \
+                    "'{}'".format(self.__class__.__name__, item)
+            raise AttributeError(error)
+
+        if isinstance(item_data, dict):
+            if self._nested is None:
+                self._nested = {}
+            nested = self._nested.get(item)
+            if nested is None or nested._json_data is not item_data:
+                nested = SparkData(item_data)
+                self._nested[item] = nested
+            return nested
+        else:
+            return item_data
+
+    def __str__(self):
+        """A human-readable string representation of this object."""
+        class_str = self.__class__.__name__
+        json_str = json_pkg.dumps(self._json_data, indent=2)
+        return "{}:\n{}".format(class_str, json_str)
+
+    def __repr__(self):
+        """A string representing this object as valid Python expression."""
+        class_str = self.__class__.__name__
+        json_str = json_pkg.dumps(self._json_data, ensure_ascii=False)
+        return "{}({})".format(class_str, json_str)
+
+    @property
+    def json_data(self):
+        """A copy of the Spark data object's JSON data (OrderedDict)."""
+        return self._json_data.copy()
+
+    def to_dict(self):
+        """Convert the Spark data to a dictionary."""
+        return dict(self._json_data)
+
+    def to_json(self, **kwargs):
+        """Convert the Spark data to JSON.
+
+        Any keyword arguments provided are passed through the Python JSON
+        encoder.  If the object was created from a JSON string (or bytes), and
+        no keyword arguments are provided, the original JSON is returned
+        unchanged (without being parsed or re-serialized).
+
+        """
+        if self._raw_json is not None and not kwargs:
+            return self._raw_json
+        return json_pkg.dumps(self._json_data, **kwargs)
@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+"""Transport adapters for making HTTP requests to the Cisco Spark APIs.
+
+By default, RestSession sends requests through `requests`' own HTTP/1.1
+connection pools.  The adapters in this module plug into the same `requests`
+session (as transport adapters), so that the rest of the package continues to
+work with `requests.Response` objects regardless of the transport used.
+
+Classes:
+    HTTP2Adapter: A `requests` transport adapter that sends requests through
+        an `httpx` client with HTTP/2 enabled; so that concurrent requests
+        share a single multiplexed connection per host.
+
+"""
+
+
+# Use future for Python v2 and v3 compatibility
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+from builtins import *
+from past.builtins import basestring
+
+
+__author__ = "Chris Lunsford"
+__author_email__ = "chrlunsf@cisco.com"
+__copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
+__license__ = "MIT"
+
+
+import datetime
+import os
+import ssl
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers, select_proxy
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+# Module Constants
+DEFAULT_HTTP2_MAX_CONNECTIONS = 10
+# Connection-specific headers; which may not be sent over HTTP/2 (RFC 7540)
+HOP_BY_HOP_HEADERS = frozenset([
+    'connection', 'keep-alive', 'proxy-connection', 'transfer-encoding',
+    'upgrade',
+])
+
+
+def _ssl_context(verify, cert):
+    """The `httpx` verify setting for a `requests` verify and cert setting."""
+    if verify is False and cert is None:
+        return False
+    if verify is False:
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    elif verify is True:
+        context = ssl.create_default_context()
+    elif os.path.isdir(verify):
+        context = ssl.create_default_context(capath=verify)
+    else:
+        context = ssl.create_default_context(cafile=verify)
+    if cert is not None:
+        if isinstance(cert, basestring):
+            context.load_cert_chain(cert)
+        else:
+            context.load_cert_chain(*cert)
+    return context
+
+
+class _HTTPXRawStream(object):
+    """Exposes a streamed `httpx.Response` as a `requests` raw response."""
+
+    def __init__(self, httpx_response):
+        self._response = httpx_response
+        self._iterator = None
+        self._buffer = b''
+
+    def stream(self, chunk_size=None, decode_content=True):
+        for chunk in self._response.iter_bytes(chunk_size):
+            yield chunk
+
+    def read(self, amt=None, **kwargs):
+        if self._iterator is None:
+            self._iterator = self._response.iter_bytes()
+        while amt is None or len(self._buffer) < amt:
+            try:
+                self._buffer += next(self._iterator)
+            except StopIteration:
+                break
+        if amt is None:
+            data, self._buffer = self._buffer, b''
+        else:
+            data, self._buffer = self._buffer[:amt], self._buffer[amt:]
+        return data
+
+    def close(self):
+        self._response.close()
+
+    def release_conn(self):
+        self._response.close()
+
+
+class HTTP2Adapter(requests.adapters.BaseAdapter):
+    """Transport adapter that sends requests over HTTP/2 using `httpx`.
+
+    Requests made by many threads are multiplexed over a single connection
+    per host, instead of each request occupying a pooled HTTP/1.1 connection;
+    which reduces the number of TLS handshakes and avoids head-of-line
+    blocking between requests.  Servers that do not support HTTP/2 are spoken
+    to over HTTP/1.1.
+
+    Requires the optional `httpx` package, with HTTP/2 support:
+    `pip install ciscosparkapi[http2]`.
+
+    Example:
+        >>> api = CiscoSparkAPI(http_adapter=HTTP2Adapter())
+
+    """
+
+    def __init__(self, max_connections=DEFAULT_HTTP2_MAX_CONNECTIONS,
+                 verify=True, client=None):
+        """Initialize a new HTTP2Adapter object.
+
+        Each request is sent with its own (`requests` session or environment)
+        `verify`, `cert` and proxy settings; the adapter keeps an `httpx`
+        client for each distinct combination of those settings.
+
+        Args:
+            max_connections(int): The maximum number of connections (not
+                requests) each client will open.
+            verify(bool): Verify the server's TLS certificates.  If False,
+                certificates are not verified, whatever the requests' own
+                `verify` setting.
+            client(httpx.Client): A preconfigured `httpx` client, used to send
+                every request instead of the adapter's own clients.  The
+                client's TLS and proxy settings apply; requests that disable
+                certificate verification, or that use a client certificate or
+                a proxy, raise a ValueError.
+
+        Raises:
+            ImportError: If the `httpx` package is not installed.
+
+        """
+        if httpx is None:
+            raise ImportError("HTTP2Adapter requires the 'httpx' package; "
+                              "install it with: "
+                              "pip install ciscosparkapi[http2]")
+
+        super(HTTP2Adapter, self).__init__()
+
+        self._max_connections = max_connections
+        self._verify = verify
+        self._client = client
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        """The `httpx` client used to send requests with default settings."""
+        if self._client is not None:
+            return self._client
+        return self._get_client(True, None, None)
+
+    def send(self, request, stream=False, timeout=None, verify=True,
+             cert=None, proxies=None):
+        """Send a `requests.PreparedRequest`; return a `requests.Response`.
+
+        Raises:
+            ValueError: If the adapter was created with an `httpx` client, and
+                the request's `verify`, `cert` or proxy settings cannot be
+                applied to it.
+
+        """
+        proxy = select_proxy(request.url, proxies or {})
+        if self._client is not None:
+            self._check_settings(verify, cert, proxy)
+            client = self._client
+        else:
+            client = self._get_client(verify if self._verify else False,
+                                      cert, proxy)
+
+        if isinstance(timeout, tuple):
+            connect_timeout, read_timeout = timeout
+            timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+
+        headers = [(header, value) for header, value in request.headers.items()
+                   if header.lower() not in HOP_BY_HOP_HEADERS]
+
+        try:
+            httpx_request = client.build_request(
+                request.method,
+                request.url,
+                headers=headers,
+                content=request.body,
+                timeout=timeout,
+            )
+            start = time.time()
+            response = client.send(httpx_request, stream=stream)
+            elapsed = datetime.timedelta(seconds=time.time() - start)
+
+        except httpx.ConnectTimeout as e:
+            raise requests.exceptions.ConnectTimeout(e, request=request)
+
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.ReadTimeout(e, request=request)
+
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(e, request=request)
+
+        response = self.build_response(request, response, stream=stream)
+        # httpx only measures `elapsed` once the response stream is closed
+        response.elapsed = elapsed
+        return response
+
+    def _get_client(self, verify, cert, proxy):
+        """Get (or create) the client for a set of TLS and proxy settings."""
+        key = (verify, tuple(cert) if isinstance(cert, list) else cert, proxy)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                transport = httpx.HTTPTransport(
+                    http2=True,
+                    verify=_ssl_context(verify, cert),
+                    limits=httpx.Limits(max_connections=self._max_connections),
+                    proxy=proxy,
+                )
+                client = httpx.Client(transport=transport, trust_env=False)
+                self._clients[key] = client
+        return client
+
+    def _check_settings(self, verify, cert, proxy):
+        """Raise if a request's settings cannot be applied to `client`."""
+        for name, unsupported in (('verify', verify is False),
+                                  ('cert', cert is not None),
+                                  ('proxies', proxy is not None)):
+            if unsupported:
+                raise ValueError(
+                    "HTTP2Adapter cannot apply the request's {} setting to "
+                    "the httpx client it was created with; configure the "
+                    "client instead.".format(name)
+                )
+
+    def build_response(self, request, httpx_response, stream=False):
+        """Build a `requests.Response` from an `httpx.Response`."""
+        response = requests.Response()
+        response.status_code = httpx_response.status_code
+        response.reason = httpx_response.reason_phrase
+        response.headers = CaseInsensitiveDict(httpx_response.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        if stream:
+            response.raw = _HTTPXRawStream(httpx_response)
+        else:
+            response._content = httpx_response.content
+        response.url = str(httpx_response.url)
+        response.request = request
+        response.connection = self
+        response.http_version = httpx_response.http_version
+        return response
+
+    def close(self):
+        """Close the `httpx` clients and their connections."""
+        with self._lock:
+            clients, self._clients = list(self._clients.values()), {}
+        if self._client is not None:
+            clients.append(self._client)
+        for client in clients:
+            client.close()
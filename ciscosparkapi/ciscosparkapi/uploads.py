@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""Streaming multipart/form-data uploads.
+
+Classes:
+    MultipartUpload: A multipart/form-data request body that streams a file
+        (from a path, a file object, bytes or an iterator) in bounded chunks.
+
+Functions:
+    is_upload_source: Check whether an object can be uploaded as a file.
+
+"""
+
+
+# Use future for Python v2 and v3 compatibility
+from __future__ import (
+    absolute_import,
+    division,
+    print_function,
+    unicode_literals,
+)
+from builtins import *
+from past.builtins import basestring
+
+
+__author__ = "Chris Lunsford"
+__author_email__ = "chrlunsf@cisco.com"
+__copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
+__license__ = "MIT"
+
+
+import io
+import mimetypes
+import os
+import uuid
+
+from .utils import EncodableFile, check_type, to_bytes
+
+
+# Module Constants
+DEFAULT_UPLOAD_CHUNK_SIZE = 64 * 1024
+DEFAULT_UPLOAD_FILE_NAME = 'file'
+DEFAULT_UPLOAD_FIELD_NAME = 'files'
+
+
+def is_upload_source(source):
+    """Check whether an object can be uploaded as a file.
+
+    Files may be uploaded from a local file path, a (binary) file object,
+    bytes, a bytearray, a memoryview, an iterator (i.e. a generator) of bytes
+    chunks, or an EncodableFile tuple wrapping one of these.  Other iterables
+    (lists, tuples, dicts, etc.) are not upload sources.
+
+    """
+    if isinstance(source, EncodableFile):
+        source = source.file_object
+    if isinstance(source, basestring) and not isinstance(source, bytes):
+        return os.path.isfile(source)
+    return isinstance(source, (bytes, bytearray, memoryview)) or \
+        hasattr(source, 'read') or _is_iterator(source)
+
+
+def _is_iterator(source):
+    """Is an object an iterator (rather than a container of values)."""
+    try:
+        return iter(source) is source
+    except TypeError:
+        return False
+
+
+def _quote(value):
+    """Quote a multipart header parameter value (as browsers do)."""
+    return value.replace('"', '%22').replace('\r', '%0D').replace('\n', '%0A')
+
+
+class MultipartUpload(object):
+    """A multipart/form-data request body that streams a file in chunks.
+
+    The body is an iterable of bytes chunks (of at most `chunk_size` bytes),
+    which `requests` sends as they are produced; so the memory used does not
+    depend on the size of the file.  When the size of the file can be
+    determined (paths, bytes, and seekable file objects, or when `size` is
+    provided) the body is sent with a Content-Length, otherwise it is sent
+    with chunked transfer encoding.
+
+    Bodies uploaded from paths, bytes and seekable file objects may be sent
+    more than once (i.e. when a request is retried after a rate-limit
+    response); bodies uploaded from iterators and non-seekable file objects
+    may only be sent once.
+
+    Example:
+        >>> upload = MultipartUpload({'roomId': room_id}, 'report.pdf')
+        >>> session.post('messages', data=upload,
+        ...              headers={'Content-type': upload.content_type})
+
+    """
+
+    def __init__(self, fields, source, file_name=None, content_type=None,
+                 size=None, chunk_size=DEFAULT_UPLOAD_CHUNK_SIZE,
+                 progress=None, field_name=DEFAULT_UPLOAD_FIELD_NAME):
+        """Initialize a new MultipartUpload object.
+
+        Args:
+            fields(dict): The (text) form fields sent before the file.
+            source: The file to be uploaded; a local file path, a (binary)
+                file object, bytes, a bytearray, a memoryview, an iterator
+                (i.e. a generator) of bytes chunks, or an EncodableFile tuple
+                wrapping one of these.
+            file_name(basestring): The name of the uploaded file.  Defaults to
+                the (base) name of the path or file object.
+            content_type(basestring): The content type of the uploaded file.
+                Defaults to the type guessed from the file name.
+            size(int): The size (in bytes) of the file, when it cannot be
+                determined from the source (i.e. for an iterator).
+            chunk_size(int): The maximum size (in bytes) of the chunks read
+                from the source and sent.
+            progress(func): Called, as `progress(bytes_sent, total_bytes)`,
+                after each chunk of the body is sent; total_bytes is None if
+                the size of the body is unknown.
+            field_name(basestring): The name of the file's form field.
+
+        Raises:
+            TypeError: If the parameter types are incorrect.
+            ValueError: If the source is not a file path, file object, bytes
+                or iterator; or if chunk_size is less than one (1).
+
+        """
+        check_type(fields, dict, may_be_none=False)
+        check_type(file_name, basestring)
+        check_type(content_type, basestring)
+        check_type(size, int)
+        check_type(chunk_size, int, may_be_none=False)
+        check_type(field_name, basestring, may_be_none=False)
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be greater than zero (0).")
+        if progress is not None and not callable(progress):
+            raise TypeError("progress must be callable; received: {!r}"
+                            "".format(progress))
+        if not is_upload_source(source):
+            raise ValueError("The upload source must be a path to a local "
+                             "file, a file object, bytes or an iterator of "
+                             "bytes; received: {!r}".format(source))
+
+        if isinstance(source, EncodableFile):
+            file_name = file_name or source.file_name
+            content_type = content_type or source.content_type
+            source = source.file_object
+
+        if isinstance(source, (bytes, bytearray)):
+            source = memoryview(source)
+        if isinstance(source, basestring):
+            default_name = source
+        else:
+            default_name = getattr(source, 'name', None)
+            if not isinstance(default_name, basestring):
+                default_name = None
+        file_name = file_name or (os.path.basename(default_name)
+                                  if default_name else
+                                  DEFAULT_UPLOAD_FILE_NAME)
+        content_type = content_type or \
+            mimetypes.guess_type(file_name)[0] or 'text/plain'
+
+        super(MultipartUpload, self).__init__()
+        self._source = source
+        self._chunk_size = chunk_size
+        self._progress = progress
+        self._start_position = None
+        self._sent = False
+        # The number of bytes of the body sent (by its latest sending)
+        self.bytes_sent = 0
+        self.file_name = file_name
+        self.boundary = uuid.uuid4().hex
+        self.content_type = 'multipart/form-data; boundary=' + self.boundary
+
+        self._preamble = self._encode_preamble(fields, field_name, file_name,
+                                               content_type)
+        self._epilogue = to_bytes('\r\n--{}--\r\n'.format(self.boundary))
+
+        if size is None:
+            size = self._source_size()
+        # `len` is used by `requests` for the Content-Length header
+        self.len = None if size is None else \
+            len(self._preamble) + size + len(self._epilogue)
+
+    @property
+    def replayable(self):
+        """Whether the body may be sent more than once (bool)."""
+        return isinstance(self._source, (basestring, memoryview)) or \
+            self._start_position is not None
+
+    def __iter__(self):
+        """Yield the chunks of the body; reporting the progress."""
+        if self._sent and not self.replayable:
+            raise ValueError("The upload of {!r} cannot be sent again; its "
+                             "source is an iterator or a non-seekable file."
+                             "".format(self.file_name))
+        self._sent = True
+
+        self.bytes_sent = 0
+        for chunk in self._chunks():
+            yield chunk
+            self.bytes_sent += len(chunk)
+            if self._progress is not None:
+                self._progress(self.bytes_sent, self.len)
+
+    def _chunks(self):
+        """Yield the body, in chunks of at most `chunk_size` bytes."""
+        yield self._preamble
+
+        source = self._source
+        chunk_size = self._chunk_size
+        if isinstance(source, memoryview):
+            for offset in range(0, source.nbytes, chunk_size):
+                yield source[offset:offset + chunk_size].tobytes()
+
+        elif isinstance(source, basestring):
+            with io.open(source, 'rb') as file_object:
+                for chunk in self._read_chunks(file_object):
+                    yield chunk
+
+        elif hasattr(source, 'read'):
+            if self._start_position is not None:
+                source.seek(self._start_position)
+            for chunk in self._read_chunks(source):
+                yield chunk
+
+        else:
+            for data in source:
+                data = memoryview(to_bytes(data) if isinstance(data, str)
+                                  else data)
+                for offset in range(0, data.nbytes, chunk_size):
+                    yield data[offset:offset + chunk_size].tobytes()
+
+        yield self._epilogue
+
+    def _read_chunks(self, file_object):
+        """Read a file object in chunks of at most `chunk_size` bytes."""
+        while True:
+            chunk = file_object.read(self._chunk_size)
+            if not chunk:
+                break
+            if not isinstance(chunk, bytes):
+                raise TypeError("Uploaded files must be opened in binary "
+                                "mode.")
+            yield chunk
+
+    def _source_size(self):
+        """The size of the source, if it can be determined; else None."""
+        source = self._source
+        if isinstance(source, memoryview):
+            return source.nbytes
+        if isinstance(source, basestring):
+            return os.path.getsize(source)
+        if hasattr(source, 'read'):
+            try:
+                start_position = source.tell()
+                source.seek(0, io.SEEK_END)
+                size = source.tell() - start_position
+                source.seek(start_position)
+            except (AttributeError, IOError, OSError):
+                return None
+            self._start_position = start_position
+            return size
+        return None
+
+    def _encode_preamble(self, fields, field_name, file_name, content_type):
+        """Encode the form fields and the file part's headers."""
+        parts = []
+        for name, value in fields.items():
+            parts.append(
+                '--{}\r\nContent-Disposition: form-data; name="{}"\r\n\r\n'
+                '{}\r\n'.format(self.boundary, _quote(name), value)
+            )
+        parts.append(
+            '--{}\r\nContent-Disposition: form-data; name="{}"; '
+            'filename="{}"\r\nContent-Type: {}\r\n\r\n'
+            ''.format(self.boundary, _quote(field_name), _quote(file_name),
+                      content_type)
+        )
+        return to_bytes(''.join(parts))
@@ -20,12 +20,19 @@ __license__ = "MIT"
 
 
 from collections import namedtuple, OrderedDict
+import codecs
 import json
 import mimetypes
 import os
+import re
 import sys
 import urllib.parse
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 from .exceptions import (
     ciscosparkapiException,
@@ -35,6 +42,13 @@ from .exceptions import (
 from .response_codes import RATE_LIMIT_RESPONSE_CODE
 
 
+# Module Constants
+DEFAULT_JSON_DECODER = 'auto'
+JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# The characters a JSON number may continue with
+JSON_NUMBER_CHARACTERS = frozenset('0123456789.eE+-')
+
+
 EncodableFile = namedtuple('EncodableFile',
                            ['file_name', 'file_object', 'content_type'])
 
@@ -165,6 +179,21 @@ def dict_from_items_with_values(*dictionaries, **items):
     return result
 
 
+def copy_json(json_data):
+    """Return a deep copy of parsed JSON data (dicts, lists and scalars).
+
+    Much faster than `copy.deepcopy()`, as only the (mutable) dicts and lists
+    are copied; the type of each dict (i.e. OrderedDict) is preserved.
+
+    """
+    if isinstance(json_data, dict):
+        return type(json_data)((key, copy_json(value))
+                               for key, value in json_data.items())
+    if isinstance(json_data, list):
+        return [copy_json(value) for value in json_data]
+    return json_data
+
+
 def raise_if_extra_kwargs(kwargs):
     """Raise a TypeError if kwargs is not empty."""
     if kwargs:
@@ -180,15 +209,20 @@ def check_response_code(response, expected_response_code):
     Args:
         response(requests.response): The response object returned by a request
             using the requests package.
-        expected_response_code(int): The expected response code (HTTP response
-            code).
+        expected_response_code(int, tuple): The expected response code (HTTP
+            response code); or a tuple of acceptable response codes.
 
     Raises:
         SparkApiError: If the requests.response.status_code does not match the
             provided expected response code (erc).
 
      """
-    if response.status_code == expected_response_code:
+    if isinstance(expected_response_code, tuple):
+        expected = response.status_code in expected_response_code
+    else:
+        expected = response.status_code == expected_response_code
+
+    if expected:
         pass
     elif response.status_code == RATE_LIMIT_RESPONSE_CODE:
         raise SparkRateLimitError(response)
@@ -196,15 +230,239 @@ def check_response_code(response, expected_response_code):
         raise SparkApiError(response)
 
 
-def extract_and_parse_json(response):
+def _decode_json_compat(response):
+    """Decode the response text; build an OrderedDict per JSON object."""
+    return json.loads(response.text, object_hook=OrderedDict)
+
+
+def _decode_json_fast(response):
+    """Decode the response bytes directly; build plain dictionaries."""
+    if sys.version_info >= (3, 6):
+        # json.loads() detects the encoding of (and decodes) bytes itself
+        return json.loads(response.content)
+    else:
+        return json.loads(response.content.decode(response.encoding or
+                                                  'utf-8'))
+
+
+def _decode_json_orjson(response):
+    """Decode the response bytes with the (C-accelerated) orjson package."""
+    return orjson.loads(response.content)
+
+
+JSON_DECODERS = {
+    'compat': _decode_json_compat,
+    'fast': _decode_json_fast,
+    'orjson': _decode_json_orjson,
+}
+
+
+def get_json_decoder(decoder):
+    """Resolve a JSON decoder name (or function) to a decoder function.
+
+    Args:
+        decoder(basestring, func): One of:
+            'auto': orjson, if it is installed; otherwise 'fast' on Python
+                3.7+ (where dictionaries preserve insertion order) and
+                'compat' on earlier versions.
+            'fast': The standard library decoder, parsing the response bytes
+                into plain dictionaries.
+            'orjson': The orjson package's (C-accelerated) decoder.
+            'compat': The original decoder, parsing the response text into
+                OrderedDicts.
+            A function, called with the response body (bytes), that returns
+                the parsed JSON data (i.e. `ujson.loads`).
+
+    Returns:
+        func: A function that parses the JSON data of a requests.response.
+
+    Raises:
+        ValueError: If the decoder name is not recognized.
+        ImportError: If the 'orjson' decoder is requested but the orjson
+            package is not installed.
+
+    """
+    if callable(decoder):
+        return lambda response: decoder(response.content)
+
+    if decoder == 'auto':
+        if orjson is not None:
+            decoder = 'orjson'
+        elif sys.version_info >= (3, 7):
+            decoder = 'fast'
+        else:
+            decoder = 'compat'
+
+    if decoder == 'orjson' and orjson is None:
+        raise ImportError("The 'orjson' JSON decoder requires the orjson "
+                          "package.")
+
+    try:
+        return JSON_DECODERS[decoder]
+    except KeyError:
+        raise ValueError("Unknown JSON decoder {!r}; expected one of: 'auto', "
+                         "{}.".format(decoder,
+                                      ", ".join(repr(name) for name
+                                                in sorted(JSON_DECODERS))))
+
+
+def extract_and_parse_json(response, decoder=DEFAULT_JSON_DECODER):
     """Extract and parse the JSON data from an requests.response object.
 
     Args:
         response(requests.response): The response object returned by a request
             using the requests package.
+        decoder(basestring, func): The JSON decoder (see `get_json_decoder()`).
 
     Returns:
         The parsed JSON data as the appropriate native Python data type.
 
     """
-    return json.loads(response.text, object_hook=OrderedDict)
+    return get_json_decoder(decoder)(response)
+
+
+class _JSONChunkReader(object):
+    """Reads (and parses) a JSON document incrementally, from its chunks.
+
+    The text that has been parsed is discarded as the chunks are read.  When
+    a value spans many chunks, it is only parsed again once the text buffered
+    for it has doubled; so that the time spent parsing a large value is
+    proportional to its size, rather than to its size times its chunk count.
+
+    """
+
+    def __init__(self, chunks, decoder):
+        self._chunks = iter(chunks)
+        self._decoder = decoder
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._position = 0
+        self._pending = []
+        self._pending_length = 0
+        self._exhausted = False
+
+    def _read(self):
+        """Read the next chunk; return False if there are no more chunks."""
+        if self._exhausted:
+            return False
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            chunk = b''
+            self._exhausted = True
+        text = self._text_decoder.decode(chunk, final=self._exhausted)
+        self._pending.append(text)
+        self._pending_length += len(text)
+        return True
+
+    def _join(self):
+        """Add the pending chunks to the buffer; discard the parsed text."""
+        if self._pending:
+            self._buffer = self._buffer[self._position:] + \
+                           ''.join(self._pending)
+            self._position = 0
+            self._pending = []
+            self._pending_length = 0
+
+    def peek(self):
+        """Skip whitespace; return the next character ('' at the end)."""
+        while True:
+            self._position = JSON_WHITESPACE.match(self._buffer,
+                                                   self._position).end()
+            if self._position < len(self._buffer) or not self._read():
+                return self._buffer[self._position:self._position + 1]
+            self._join()
+
+    def expect(self, characters):
+        """Consume and return the next character; one of `characters`."""
+        character = self.peek()
+        if not character or character not in characters:
+            raise ValueError("Expecting one of {!r} in JSON data; got {!r}."
+                             "".format(characters, character or 'EOF'))
+        self._position += 1
+        return character
+
+    def decode(self):
+        """Parse and return the next JSON value."""
+        self.peek()
+        attempted = 0
+        while True:
+            available = len(self._buffer) - self._position + \
+                        self._pending_length
+            if self._exhausted or available >= 2 * attempted:
+                self._join()
+                try:
+                    value, end = self._decoder.raw_decode(self._buffer,
+                                                          self._position)
+                except ValueError:
+                    # Incomplete value; unless there is no more data
+                    if self._exhausted:
+                        raise
+                    attempted = available
+                else:
+                    # A number may continue in the next chunk; unless it is
+                    # followed by a character that cannot be part of it
+                    if self._exhausted or \
+                            not isinstance(value, (int, float)) or \
+                            (end < len(self._buffer) and
+                             self._buffer[end] not in JSON_NUMBER_CHARACTERS):
+                        self._position = end
+                        return value
+                    attempted = available
+            self._read()
+
+
+def iter_json_items(chunks, decoder=None):
+    """Incrementally parse and yield the `items` of a JSON {'items': [...]}.
+
+    The items are parsed (and yielded) as the chunks of the document arrive,
+    rather than after the whole document has been received and parsed.  Only
+    the top-level 'items' key is used; the values of the keys preceding it
+    are parsed and discarded.
+
+    Args:
+        chunks(iterable): The chunks (bytes) of the JSON document; i.e.
+            `response.iter_content()`.
+        decoder(json.JSONDecoder): The decoder used to parse the items; any
+            object with a `json.JSONDecoder` compatible `raw_decode()`
+            method.  Defaults to a plain `json.JSONDecoder()`.
+
+    Raises:
+        TypeError: If the decoder does not have a `raw_decode()` method.
+        ciscosparkapiException: If the document does not contain an `items`
+            array.
+        ValueError: If the document is not valid JSON.
+
+    """
+    decoder = decoder or json.JSONDecoder()
+    if not callable(getattr(decoder, 'raw_decode', None)):
+        raise TypeError("The decoder must be a json.JSONDecoder (with a "
+                        "raw_decode() method); got {!r}.".format(decoder))
+
+    reader = _JSONChunkReader(chunks, decoder)
+    error_message = "'items' array not found in JSON data."
+
+    # Find the top-level 'items' key
+    reader.expect('{')
+    if reader.peek() == '}':
+        raise ciscosparkapiException(error_message)
+    while True:
+        key = reader.decode()
+        if not isinstance(key, basestring):
+            raise ValueError("Expecting a JSON object key; got "
+                             "{!r}.".format(key))
+        reader.expect(':')
+        if key == 'items':
+            break
+        reader.decode()
+        if reader.expect(',}') == '}':
+            raise ciscosparkapiException(error_message)
+
+    # Yield the items; separated by exactly one comma
+    reader.expect('[')
+    if reader.peek() == ']':
+        return
+    while True:
+        yield reader.decode()
+        if reader.expect(',]') == ']':
+            return
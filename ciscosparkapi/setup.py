@@ -67,5 +67,12 @@ setup(
             'future',
             'requests>=2.4.2',
             'requests-toolbelt',
+            'futures; python_version < "3"',
     ],
+
+    extras_require={
+            'http2': ['httpx[http2]'],
+            'export': ['pyarrow'],
+            'tracing': ['opentelemetry-api'],
+    },
 )
@@ -242,3 +242,15 @@ class TestMembershipsAPI(object):
         membership = memberships[0]
         assert is_valid_membership(membership)
         assert membership.roomId == group_room_with_members.id
+
+    def test_list_memberships_in_parallel(self, api, group_room_with_members,
+                                          authenticated_user_memberships):
+        room_ids = [m.roomId for m in authenticated_user_memberships]
+        memberships = list(api.memberships.list_parallel(room_ids,
+                                                         max_concurrency=4))
+        assert are_valid_memberships(memberships)
+        assert set(m.roomId for m in memberships) == set(room_ids)
+        sequential = get_room_membership_list(api, group_room_with_members)
+        assert (set(m.id for m in memberships
+                    if m.roomId == group_room_with_members.id) ==
+                set(m.id for m in sequential))
@@ -13,6 +13,7 @@ import itertools
 import pytest
 
 import ciscosparkapi
+from ciscosparkapi.api.people import PeopleAPI
 from tests.conftest import TEST_FILE_URL
 
 
@@ -176,6 +177,21 @@ class TestPeopleAPI(object):
     def test_get_my_details(self, me):
         assert is_valid_person(me)
 
+    def test_my_details_are_not_cached_by_default(self, api):
+        assert api.people.me() is not api.people.me()
+
+    def test_my_details_are_cached(self, api):
+        people = PeopleAPI(api._session, me_cache_ttl=300)
+        assert people.me() is people.me()
+
+    def test_refresh_my_details(self, api):
+        people = PeopleAPI(api._session, me_cache_ttl=300)
+        cached = people.me()
+        refreshed = people.me(refresh=True)
+        assert is_valid_person(refreshed)
+        assert refreshed.id == cached.id
+        assert people.me() is refreshed
+
     def test_get_person_details(self, api, test_people):
         person_id = test_people["not_a_member"].id
         person = get_person_by_id(api, person_id)
@@ -210,3 +226,15 @@ class TestPeopleAPI(object):
         people_list = list(itertools.islice(people, num_people))
         assert len(people_list) == num_people
         assert are_valid_people(people_list)
+
+    def test_list_people_in_parallel(self, api, test_people):
+        ids = [person.id for person in test_people.list()]
+        people = list(api.people.list_parallel(ids, max_concurrency=2))
+        assert are_valid_people(people)
+        assert set(person.id for person in people) == set(ids)
+
+    def test_get_many_people(self, api, test_people):
+        ids = [person.id for person in test_people.list()]
+        people = api.people.get_many(ids + [ids[0]])
+        assert set(people) == set(ids)
+        assert are_valid_people(people.values())
@@ -14,6 +14,7 @@ import tempfile
 
 import pytest
 
+from ciscosparkapi.simulator import SparkSimulator
 from tests.utils import download_file
 
 
@@ -50,7 +51,7 @@ def new_email_generator():
 
 # pytest Fixtures
 
-@pytest.fixture("session")
+@pytest.fixture(scope="session")
 def temp_directory():
     directory_abs_path = tempfile.mkdtemp()
 
@@ -59,7 +60,7 @@ def temp_directory():
     os.rmdir(directory_abs_path)
 
 
-@pytest.fixture("session")
+@pytest.fixture(scope="session")
 def local_file(temp_directory):
         file = download_file(TEST_FILE_URL, temp_directory)
 
@@ -76,3 +77,14 @@ def get_new_email_address():
         return next(generator)
 
     return inner_function
+
+
+@pytest.fixture
+def simulator():
+    with SparkSimulator(seed=0) as simulator:
+        yield simulator
+
+
+@pytest.fixture
+def simulated_api(simulator):
+    return simulator.api(retry_policy=None)
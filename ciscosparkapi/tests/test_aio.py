@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""ciscosparkapi/aio.py Fixtures & Tests"""
+
+
+__author__ = "Chris Lunsford"
+__author_email__ = "chrlunsf@cisco.com"
+__copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
+__license__ = "MIT"
+
+
+import asyncio
+import sys
+
+import pytest
+
+import ciscosparkapi
+
+
+pytestmark = pytest.mark.skipif(sys.version_info < (3, 6),
+                                reason="requires Python 3.6+")
+
+
+# Helper Functions
+
+def run(loop, coroutine):
+    return loop.run_until_complete(coroutine)
+
+
+def collect(loop, async_iterable):
+    iterator = async_iterable.__aiter__()
+    items = []
+    while True:
+        try:
+            items.append(run(loop, iterator.__anext__()))
+        except StopAsyncIteration:
+            return items
+
+
+# pytest Fixtures
+
+@pytest.fixture(scope="module")
+def event_loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="module")
+def async_api():
+    api = ciscosparkapi.AsyncCiscoSparkAPI()
+    yield api
+    api.close()
+
+
+# AsyncCiscoSparkAPI Tests
+
+class TestAsyncCiscoSparkAPI:
+    """Test the asyncio interface."""
+
+    def test_get_my_details(self, event_loop, async_api):
+        me = run(event_loop, async_api.people.me())
+        assert isinstance(me, ciscosparkapi.Person)
+        assert me.id is not None
+
+    def test_concurrent_gets(self, event_loop, async_api, group_room):
+        coroutines = [async_api.rooms.get(group_room.id) for _ in range(5)]
+        rooms = run(event_loop, asyncio.gather(*coroutines))
+        assert all(room.id == group_room.id for room in rooms)
+
+    def test_list_rooms_with_paging(self, event_loop, async_api, rooms_list):
+        rooms = collect(event_loop, async_api.rooms.list(max=1))
+        assert len(rooms) == len(rooms_list)
+        assert all(isinstance(room, ciscosparkapi.Room) for room in rooms)
+
+    def test_get_items(self, event_loop, async_api):
+        items = collect(event_loop,
+                        async_api.session.get_items('rooms',
+                                                    params={'max': 1}))
+        assert all(isinstance(item, dict) for item in items)
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""ciscosparkapi/cache.py Fixtures & Tests"""
+
+
+__author__ = "Chris Lunsford"
+__author_email__ = "chrlunsf@cisco.com"
+__copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
+__license__ = "MIT"
+
+
+import time
+
+import pytest
+
+import ciscosparkapi
+
+
+# pytest Fixtures
+
+@pytest.fixture
+def entity_cache():
+    return ciscosparkapi.EntityCache(max_size=3, ttl=60,
+                                     resource_ttls={'messages': 0,
+                                                    'people': 0.05})
+
+
+# EntityCache Tests
+
+class TestEntityCache:
+    """Test the EntityCache class."""
+
+    def test_hit_and_miss_counters(self, entity_cache):
+        assert entity_cache.get('rooms', 'r1') is None
+        entity_cache.set('rooms', 'r1', {'id': 'r1'})
+        assert entity_cache.get('rooms', 'r1') == {'id': 'r1'}
+        assert entity_cache.hits == 1
+        assert entity_cache.misses == 1
+
+    def test_least_recently_used_entry_is_evicted(self, entity_cache):
+        for room_id in ('r1', 'r2', 'r3'):
+            entity_cache.set('rooms', room_id, {'id': room_id})
+        entity_cache.get('rooms', 'r1')
+        entity_cache.set('rooms', 'r4', {'id': 'r4'})
+        assert len(entity_cache) == 3
+        assert entity_cache.get('rooms', 'r2') is None
+        assert entity_cache.get('rooms', 'r1') is not None
+        assert entity_cache.evictions == 1
+
+    def test_resource_ttls(self, entity_cache):
+        entity_cache.set('messages', 'm1', {'id': 'm1'})
+        entity_cache.set('people', 'p1', {'id': 'p1'})
+        assert entity_cache.get('messages', 'm1') is None
+        assert entity_cache.get('people', 'p1') is not None
+        time.sleep(0.1)
+        assert entity_cache.get('people', 'p1') is None
+
+    def test_invalidate(self, entity_cache):
+        entity_cache.set('rooms', 'r1', {'id': 'r1'})
+        entity_cache.invalidate('rooms', 'r1')
+        assert entity_cache.get('rooms', 'r1') is None
+
+    def test_clear_resource(self, entity_cache):
+        entity_cache.set('rooms', 'r1', {'id': 'r1'})
+        entity_cache.set('teams', 't1', {'id': 't1'})
+        entity_cache.clear('rooms')
+        assert entity_cache.get('rooms', 'r1') is None
+        assert entity_cache.get('teams', 't1') is not None
+
+    def test_invalid_max_size(self):
+        with pytest.raises(ValueError):
+            ciscosparkapi.EntityCache(max_size=0)
+
+
+class TestEntityCacheSession:
+    """Test the entity cache with the API wrappers."""
+
+    def test_get_room_is_cached(self, group_room):
+        api = ciscosparkapi.CiscoSparkAPI(
+            entity_cache=ciscosparkapi.EntityCache()
+        )
+        first = api.rooms.get(group_room.id)
+        second = api.rooms.get(group_room.id)
+        assert first.id == second.id == group_room.id
+        assert api.entity_cache.hits == 1
+        assert api.entity_cache.misses == 1
+
+    def test_update_room_invalidates_cache(self, group_room):
+        api = ciscosparkapi.CiscoSparkAPI(
+            entity_cache=ciscosparkapi.EntityCache()
+        )
+        api.rooms.get(group_room.id)
+        api.rooms.update(group_room.id, title=group_room.title)
+        api.rooms.get(group_room.id)
+        assert api.entity_cache.misses == 2
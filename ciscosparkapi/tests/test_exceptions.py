@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""ciscosparkapi/exceptions.py Fixtures & Tests"""
+
+
+__author__ = "Chris Lunsford"
+__author_email__ = "chrlunsf@cisco.com"
+__copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
+__license__ = "MIT"
+
+
+import email.utils
+import time
+
+import pytest
+import requests
+
+import ciscosparkapi
+from ciscosparkapi import exceptions
+
+
+# Helper Functions
+
+def error_response(status_code, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.reason = "Too Many Requests" if status_code == 429 else None
+    response._content = b'{"message": "Slow down"}'
+    response.headers.update(headers or {})
+    response.request = requests.Request(
+        'GET', 'https://api.ciscospark.com/v1/rooms',
+        headers={'Authorization': 'Bearer secret-token'},
+    ).prepare()
+    return response
+
+
+# pytest Fixtures
+
+@pytest.fixture
+def rate_limit_error():
+    return ciscosparkapi.SparkRateLimitError(error_response(
+        429, {'Retry-After': '5', 'TrackingID': 'ROUTER_1234'}
+    ))
+
+
+# SparkApiError Tests
+
+class TestSparkApiError:
+    """Test the SparkApiError exception classes."""
+
+    def test_structured_fields(self, rate_limit_error):
+        assert rate_limit_error.status_code == 429
+        assert rate_limit_error.tracking_id == 'ROUTER_1234'
+        assert rate_limit_error.retry_after == 5
+
+    def test_report_is_rendered_lazily(self, rate_limit_error, monkeypatch):
+        calls = []
+        render = exceptions.response_to_string
+
+        def counting_render(response):
+            calls.append(response)
+            return render(response)
+
+        monkeypatch.setattr(exceptions, 'response_to_string', counting_render)
+        error = ciscosparkapi.SparkApiError(error_response(404))
+        assert calls == []
+
+        message = str(error)
+        assert message.startswith("Response Code [404] - ")
+        assert "Slow down" in message
+        assert str(error) == message
+        assert len(calls) == 1
+
+    def test_report_redacts_the_access_token(self, rate_limit_error):
+        assert "secret-token" not in str(rate_limit_error)
+        assert "Bearer <redacted>" in rate_limit_error.details
+
+    @pytest.mark.parametrize('value, retry_after', [
+        ('5', 5),
+        (' 1.5 ', 1.5),
+        (None, 200),
+        ('soon', 200),
+        ('-3', 200),
+        ('inf', 200),
+        ('nan', 200),
+        ('Wed, 21 Oct 2015 07:28:00 GMT', 0),
+    ])
+    def test_retry_after_parsing(self, value, retry_after):
+        headers = {'Retry-After': value} if value is not None else {}
+        error = ciscosparkapi.SparkRateLimitError(error_response(429, headers))
+        assert error.retry_after == retry_after
+
+    def test_retry_after_date(self):
+        value = email.utils.formatdate(time.time() + 30, usegmt=True)
+        assert 28 <= exceptions.parse_retry_after(value) <= 31
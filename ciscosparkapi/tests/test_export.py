@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""ciscosparkapi/export.py Fixtures & Tests"""
+
+
+__author__ = "Chris Lunsford"
+__author_email__ = "chrlunsf@cisco.com"
+__copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
+__license__ = "MIT"
+
+
+import csv
+import io
+import json
+
+import pytest
+import requests
+
+import ciscosparkapi
+from ciscosparkapi.export import (
+    batched,
+    coerce_value,
+    export_items,
+    infer_column_types,
+)
+
+
+# Helper Classes
+
+class MembershipsAdapter(requests.adapters.BaseAdapter):
+    """Serves `pages` pages of `page_size` memberships."""
+
+    def __init__(self, pages, page_size):
+        super(MembershipsAdapter, self).__init__()
+        self.pages = pages
+        self.page_size = page_size
+
+    def send(self, request, **kwargs):
+        page = int(request.url.split('page=')[-1]) if 'page=' in request.url \
+            else 0
+        items = [membership(page * self.page_size + i)
+                 for i in range(self.page_size)]
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        response.status_code = 200
+        response._content = json.dumps({'items': items}).encode('utf-8')
+        if page + 1 < self.pages:
+            response.headers['Link'] = \
+                '<https://api.ciscospark.com/v1/memberships?page={}>; ' \
+                'rel="next"'.format(page + 1)
+        return response
+
+    def close(self):
+        pass
+
+
+# Helper Functions
+
+def membership(index):
+    return {
+        'id': 'membership-{}'.format(index),
+        'personEmail': u'pérson{}@example.com'.format(index),
+        'isModerator': index % 2 == 0,
+        'roles': ['a', 'b'],
+    }
+
+
+# pytest Fixtures
+
+@pytest.fixture
+def items():
+    return [membership(i) for i in range(25)]
+
+
+# Export Tests
+
+class TestExportItems:
+    """Test exporting items to files."""
+
+    def test_batched(self):
+        assert list(batched(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+    def test_jsonl(self, items, tmpdir):
+        path = str(tmpdir.join('memberships.jsonl'))
+        assert export_items(items, path, batch_size=10) == 25
+        with io.open(path, encoding='utf-8') as file:
+            assert [json.loads(line) for line in file] == items
+
+    def test_csv(self, items, tmpdir):
+        path = str(tmpdir.join('memberships.csv'))
+        assert export_items(items, path, batch_size=10) == 25
+        with io.open(path, encoding='utf-8', newline='') as file:
+            rows = list(csv.reader(file))
+        assert rows[0] == ['id', 'personEmail', 'isModerator', 'roles']
+        assert rows[1] == ['membership-0', u'pérson0@example.com', 'True',
+                           '["a", "b"]']
+        assert len(rows) == 26
+
+    def test_columns_and_file_objects(self, items):
+        file = io.StringIO()
+        export_items(items, file, format='csv', columns=['id', 'missing'])
+        assert file.getvalue().splitlines()[:2] == ['id,missing',
+                                                    'membership-0,']
+
+    def test_no_items(self, tmpdir):
+        for name in ('empty.csv', 'empty.jsonl'):
+            path = tmpdir.join(name)
+            assert export_items([], str(path)) == 0
+            assert path.read_binary() == b''
+
+        file = io.StringIO()
+        export_items([], file, format='csv', columns=['id', 'roles'])
+        assert file.getvalue().splitlines() == ['id,roles']
+
+    def test_parquet_no_items(self, tmpdir):
+        parquet = pytest.importorskip('pyarrow.parquet')
+        path = str(tmpdir.join('empty.parquet'))
+        assert export_items([], path, columns=['id', 'isModerator'],
+                            column_types={'isModerator': 'bool'}) == 0
+        table = parquet.read_table(path)
+        assert table.num_rows == 0
+        assert str(table.schema.field('isModerator').type) == 'bool'
+        assert str(table.schema.field('id').type) == 'string'
+
+    def test_parquet(self, items, tmpdir):
+        parquet = pytest.importorskip('pyarrow.parquet')
+        path = str(tmpdir.join('memberships.parquet'))
+        assert export_items(items, path, batch_size=10) == 25
+        table = parquet.read_table(path)
+        assert table.num_rows == 25
+        assert table.column('personEmail').to_pylist() == \
+            [item['personEmail'] for item in items]
+
+    def test_column_types(self):
+        batch = [{'a': None, 'b': 1, 'c': 1, 'd': {'x': 1}, 'e': True},
+                 {'a': None, 'b': 2, 'c': 1.5, 'd': None, 'e': False}]
+        assert infer_column_types(batch, list('abcde'), {'e': 'string'}) == \
+            {'a': 'string', 'b': 'int', 'c': 'float', 'd': 'json',
+             'e': 'string'}
+
+    def test_coerce_value(self):
+        assert coerce_value(True, 'string') == 'true'
+        assert coerce_value(['a'], 'string') == '["a"]'
+        assert coerce_value(1, 'float') == 1.0
+        assert coerce_value(2.0, 'int') == 2
+        assert coerce_value(None, 'int') is None
+        with pytest.raises(ValueError):
+            coerce_value(1.5, 'int', 'count')
+
+    def test_parquet_null_first_batch(self, tmpdir):
+        parquet = pytest.importorskip('pyarrow.parquet')
+        items = [{'id': str(i), 'extra': None, 'count': i} for i in range(10)]
+        items += [{'id': '10', 'extra': True, 'count': 2.0},
+                  {'id': '11', 'extra': {'nested': [1]}, 'count': 3}]
+        path = str(tmpdir.join('items.parquet'))
+        assert export_items(items, path, batch_size=10) == 12
+        table = parquet.read_table(path)
+        assert table.column('extra').to_pylist()[-2:] == \
+            ['true', '{"nested": [1]}']
+        assert table.column('count').to_pylist()[-2:] == [2, 3]
+
+    def test_parquet_explicit_column_types(self, tmpdir):
+        parquet = pytest.importorskip('pyarrow.parquet')
+        items = [{'score': None}, {'score': 1}, {'score': 1.5}]
+        path = str(tmpdir.join('items.parquet'))
+        export_items(items, path, batch_size=1,
+                     column_types={'score': 'float'})
+        assert parquet.read_table(path).column('score').to_pylist() == \
+            [None, 1.0, 1.5]
+
+    def test_later_keys_are_reported(self):
+        items = [{'id': '1'}, {'id': '2', 'late': 'value'}]
+        file = io.StringIO()
+        with pytest.warns(Warning, match='late'):
+            export_items(items, file, format='csv', batch_size=1)
+
+    def test_unknown_column_type(self, items):
+        with pytest.raises(ValueError):
+            export_items(items, 'memberships.csv',
+                         column_types={'id': 'decimal'})
+
+    def test_unknown_format(self, items):
+        with pytest.raises(ValueError):
+            export_items(items, 'memberships.xlsx')
+
+
+class TestCiscoSparkAPIExport:
+    """Test exporting list results from the API."""
+
+    def test_export_streams_all_pages(self, tmpdir):
+        api = ciscosparkapi.CiscoSparkAPI(
+            access_token="token",
+            http_adapter=MembershipsAdapter(pages=4, page_size=50),
+        )
+        path = str(tmpdir.join('memberships.jsonl'))
+        assert api.export('memberships', path, roomId='room-id') == 200
+        with io.open(path, encoding='utf-8') as file:
+            assert json.loads(file.readlines()[-1])['id'] == 'membership-199'
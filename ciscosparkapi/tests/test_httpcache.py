@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""ciscosparkapi/httpcache.py Fixtures & Tests"""
+
+
+__author__ = "Chris Lunsford"
+__author_email__ = "chrlunsf@cisco.com"
+__copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
+__license__ = "MIT"
+
+
+import json
+import threading
+
+import pytest
+import requests
+from future.moves.http import server as http_server
+
+import ciscosparkapi
+from ciscosparkapi.httpcache import DISK_CACHE_INDEX_BATCH
+from ciscosparkapi.restsession import RestSession
+
+
+# Helper Classes
+
+class ConditionalHandler(http_server.BaseHTTPRequestHandler):
+    """Serves rooms with ETags; responds 304 to matching If-None-Match."""
+
+    protocol_version = "HTTP/1.1"
+    rooms = {}
+    requests = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        room_id = self.path.rsplit('/', 1)[-1]
+        title = self.rooms.get(room_id, "Untitled")
+        etag = '"{}-{}"'.format(room_id, title)
+        if_none_match = self.headers.get('If-None-Match')
+        self.requests.append(if_none_match)
+
+        if if_none_match == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = json.dumps({'id': room_id, 'title': title}).encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json;charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        if room_id != 'no-validators':
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+# Helper Functions
+
+def etag_response(etag):
+    response = requests.Response()
+    response.status_code = 200
+    response.headers['ETag'] = etag
+    return response
+
+
+def stored_files(tmpdir):
+    return [path for path in tmpdir.listdir()
+            if path.basename != 'index.json']
+
+
+# pytest Fixtures
+
+@pytest.fixture
+def stub_server():
+    ConditionalHandler.rooms = {}
+    ConditionalHandler.requests = []
+    server = http_server.HTTPServer(("127.0.0.1", 0), ConditionalHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    yield "http://127.0.0.1:{}/v1/".format(server.server_port)
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(params=['memory', 'disk'])
+def response_cache(request, tmpdir):
+    if request.param == 'memory':
+        return ciscosparkapi.ResponseCache(max_entries=10)
+    else:
+        return ciscosparkapi.DiskResponseCache(str(tmpdir), max_entries=10)
+
+
+# ResponseCache Tests
+
+class TestResponseCache:
+    """Test revalidating GET responses against a local stub server."""
+
+    def test_not_modified_responses_are_served_from_cache(
+            self, stub_server, response_cache):
+        session = RestSession("token", stub_server,
+                              response_cache=response_cache)
+        first = session.get('rooms/abc')
+        second = session.get('rooms/abc')
+        assert first == second == {'id': 'abc', 'title': 'Untitled'}
+        assert ConditionalHandler.requests == [None, '"abc-Untitled"']
+        assert response_cache.stats()['hits'] == 1
+
+    def test_callers_get_their_own_copies(self, stub_server, response_cache):
+        session = RestSession("token", stub_server,
+                              response_cache=response_cache)
+        session.get('rooms/abc')['title'] = "Changed"
+        first = session.get('rooms/abc')
+        first['title'] = "Changed again"
+        assert session.get('rooms/abc')['title'] == "Untitled"
+        assert response_cache.hits == 2
+
+    def test_modified_responses_replace_the_cache(self, stub_server,
+                                                  response_cache):
+        session = RestSession("token", stub_server,
+                              response_cache=response_cache)
+        session.get('rooms/abc')
+        ConditionalHandler.rooms['abc'] = "Renamed"
+        assert session.get('rooms/abc')['title'] == "Renamed"
+        assert session.get('rooms/abc')['title'] == "Renamed"
+        assert response_cache.hits == 1
+
+    def test_responses_without_validators_are_not_cached(self, stub_server,
+                                                         response_cache):
+        session = RestSession("token", stub_server,
+                              response_cache=response_cache)
+        session.get('rooms/no-validators')
+        assert len(response_cache) == 0
+
+    def test_cache_size_is_bounded(self, stub_server, response_cache):
+        session = RestSession("token", stub_server,
+                              response_cache=response_cache)
+        for i in range(15):
+            session.get('rooms/{}'.format(i))
+        assert len(response_cache) == 10
+        assert response_cache.stats()['evictions'] == 5
+
+    def test_disk_cache_persists(self, stub_server, tmpdir):
+        cache = ciscosparkapi.DiskResponseCache(str(tmpdir))
+        RestSession("token", stub_server, response_cache=cache).get('rooms/a')
+        cache.flush()
+
+        reloaded = ciscosparkapi.DiskResponseCache(str(tmpdir))
+        session = RestSession("token", stub_server, response_cache=reloaded)
+        assert session.get('rooms/a') == {'id': 'a', 'title': 'Untitled'}
+        assert reloaded.hits == 1
+
+    def test_disk_cache_byte_limit(self, stub_server, tmpdir):
+        cache = ciscosparkapi.DiskResponseCache(str(tmpdir), max_bytes=500)
+        session = RestSession("token", stub_server, response_cache=cache)
+        for i in range(20):
+            session.get('rooms/{}'.format(i))
+        assert 0 < cache.stats()['bytes'] <= 500
+        assert len(stored_files(tmpdir)) == len(cache)
+
+    def test_disk_cache_index(self, tmpdir):
+        cache = ciscosparkapi.DiskResponseCache(str(tmpdir))
+        keys = [('url/{}'.format(i), ()) for i in range(3)]
+        for key in keys:
+            cache.store(key, etag_response('"1"'), {'key': key[0]})
+        cache.flush()
+
+        # Entries are indexed without being read; unreadable entries are
+        # dropped when they are read
+        stored = [path for path in stored_files(tmpdir)
+                  if path.read_binary().startswith(b'{"etag"')]
+        stored[0].write_binary(b'{"truncated')
+        tmpdir.join('0' * 40 + '.json').write_binary(b'{}')
+        tmpdir.join('tmpabc.tmp').write_binary(b'{}')
+        reloaded = ciscosparkapi.DiskResponseCache(str(tmpdir))
+        assert len(reloaded) == 3
+        assert len(stored_files(tmpdir)) == 3
+        results = [reloaded.get(key) for key in keys]
+        assert sum(result is None for result in results) == 1
+        assert len(reloaded) == 2
+
+    def test_disk_cache_concurrent_reads_and_writes(self, tmpdir):
+        cache = ciscosparkapi.DiskResponseCache(str(tmpdir))
+        key = ('rooms/abc', ())
+        data = {'items': ['x' * 1000] * 100}
+        cache.store(key, etag_response('"0"'), data)
+        misses = []
+
+        def read():
+            for _ in range(200):
+                if cache.get(key) is None:
+                    misses.append(key)
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        for reader in readers:
+            reader.start()
+        for i in range(200):
+            cache.store(key, etag_response('"{}"'.format(i)), data)
+        for reader in readers:
+            reader.join()
+        assert misses == []
+
+    def test_disk_cache_serves_parsed_responses_from_memory(self, tmpdir):
+        cache = ciscosparkapi.DiskResponseCache(str(tmpdir), memory_entries=1)
+        keys = [('url/{}'.format(i), ()) for i in range(2)]
+        for key in keys:
+            cache.store(key, etag_response('"1"'), {'key': key[0]})
+        for path in stored_files(tmpdir):
+            path.write_binary(b'{"truncated')
+
+        # The most recently used response is served without reading its file
+        assert cache.get(keys[1]).json_data == {'key': 'url/1'}
+        assert cache.get(keys[0]) is None
+
+    def test_disk_cache_index_writes_are_batched(self, tmpdir, monkeypatch):
+        cache = ciscosparkapi.DiskResponseCache(str(tmpdir))
+        writes = []
+        write_index = cache._write_index
+
+        def counting_write_index():
+            writes.append(None)
+            write_index()
+
+        monkeypatch.setattr(cache, '_write_index', counting_write_index)
+        for i in range(100):
+            cache.store(('url/{}'.format(i), ()), etag_response('"1"'), {})
+        assert len(writes) <= 100 // DISK_CACHE_INDEX_BATCH + 1
+
+        cache.flush()
+        reloaded = ciscosparkapi.DiskResponseCache(str(tmpdir))
+        assert len(reloaded) == 100
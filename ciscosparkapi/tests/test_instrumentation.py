@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""ciscosparkapi/instrumentation.py Fixtures & Tests"""
+
+
+__author__ = "Chris Lunsford"
+__author_email__ = "chrlunsf@cisco.com"
+__copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
+__license__ = "MIT"
+
+
+import asyncio
+
+import pytest
+
+import ciscosparkapi
+from ciscosparkapi.aio import AsyncRestSession
+from ciscosparkapi.instrumentation import (
+    Instrumentation,
+    MetricsSink,
+    RequestEvent,
+    TracingSink,
+)
+from ciscosparkapi.restsession import _endpoint_template
+from ciscosparkapi.uploads import MultipartUpload
+
+
+BASE_URL = 'https://api.ciscospark.com/v1/'
+
+
+# Helper Classes
+
+class FakeSpan(object):
+    def __init__(self, name, start_time, attributes, **kwargs):
+        self.name = name
+        self.start_time = start_time
+        self.attributes = attributes
+        self.events = []
+        self.end_time = None
+
+    def set_status(self, status):
+        self.status = status
+
+    def add_event(self, name, attributes=None):
+        self.events.append((name, attributes))
+
+    def end(self, end_time=None):
+        self.end_time = end_time
+
+
+class FakeTracer(object):
+    def __init__(self):
+        self.spans = []
+
+    def start_span(self, name, **kwargs):
+        span = FakeSpan(name, **kwargs)
+        self.spans.append(span)
+        return span
+
+
+# Helper Functions
+
+def request_event(**fields):
+    defaults = dict(method='GET', url=BASE_URL + 'rooms/1',
+                    endpoint='rooms/{id}', status_code=200, request_bytes=0,
+                    response_bytes=100, attempts=1, rate_limit_wait=0.0,
+                    ttfb=0.02, duration=0.03, start_time=1500000000.0,
+                    error=None)
+    defaults.update(fields)
+    return RequestEvent(**defaults)
+
+
+# pytest Fixtures
+
+@pytest.fixture
+def events():
+    return []
+
+
+@pytest.fixture
+def api(simulator, events):
+    return simulator.api(retry_policy=None,
+                         instrumentation=Instrumentation(events.append))
+
+
+# Tests
+
+class TestEndpointTemplate:
+    """Test the endpoint templates used to label request events."""
+
+    @pytest.mark.parametrize('url, template', [
+        ('rooms', 'rooms'),
+        ('rooms/Y2lzY29zcGFyazovL3VzL1JPT00vMQ', 'rooms/{id}'),
+        ('people/me', 'people/me'),
+        ('team/memberships/abc', 'team/memberships/{id}'),
+        ('contents/abc', 'contents/{id}'),
+    ])
+    def test_endpoint_template(self, url, template):
+        assert _endpoint_template(BASE_URL + url, BASE_URL) == template
+
+
+class TestInstrumentation:
+    """Test the emission of request events."""
+
+    def test_events_emitted(self, simulator, api, events):
+        room = api.rooms.create("Instrumented")
+        api.rooms.get(room.id)
+
+        assert [(event.method, event.endpoint, event.status_code)
+                for event in events] == [('POST', 'rooms', 200),
+                                         ('GET', 'rooms/{id}', 200)]
+        create, get = events
+        assert create.request_bytes > 0
+        assert get.response_bytes > 0
+        assert get.attempts == 1
+        assert 0 <= get.ttfb <= get.duration
+        assert get.error is None
+
+    def test_error_event(self, api, events):
+        with pytest.raises(ciscosparkapi.SparkApiError) as error:
+            api.rooms.get('unknown')
+        event = events[-1]
+        assert event.status_code == 404
+        assert event.error is error.value
+
+    def test_rate_limit_wait(self, simulator, api, events):
+        simulator.inject(429, retry_after=1)
+        api.people.get(simulator.me['id'])
+        event = events[-1]
+        assert event.attempts == 2
+        assert event.rate_limit_wait == 1
+        assert event.duration >= 1
+
+    def test_submitted_request_events(self, simulator, api, events):
+        simulator.inject(429, retry_after=1)
+        future = api._session.submit('GET', 'people/' + simulator.me['id'])
+        future.result(5)
+        event, = events
+        assert event.endpoint == 'people/{id}'
+        assert event.attempts == 2
+        assert event.rate_limit_wait == 1
+        assert event.duration >= 1
+
+        with pytest.raises(ciscosparkapi.SparkApiError):
+            api._session.submit('GET', 'rooms/unknown').result(5)
+        assert events[-1].status_code == 404
+        assert events[-1].error is not None
+
+    def test_async_request_events(self, simulator, api, events):
+        session = AsyncRestSession(api._session)
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(
+                session.request('GET', 'people/' + simulator.me['id'], 200)
+            )
+        finally:
+            loop.close()
+            session.close()
+        assert [event.endpoint for event in events] == ['people/{id}']
+
+    def test_chunked_upload_request_bytes(self, api, events):
+        room = api.rooms.create("Uploads")
+        upload = MultipartUpload({'roomId': room.id},
+                                 iter([b'x' * 1000, b'y' * 1000]))
+        assert upload.len is None
+        api._session.post('messages', data=upload,
+                          headers={'Content-type': upload.content_type})
+        assert events[-1].request_bytes == upload.bytes_sent > 2000
+
+    def test_failing_sink_ignored(self, simulator, events):
+        def failing_sink(event):
+            raise RuntimeError("Sink failure")
+
+        instrumentation = Instrumentation(failing_sink, events.append)
+        api = simulator.api(instrumentation=instrumentation)
+        api.people.get(simulator.me['id'])
+        assert len(events) == 1
+
+    def test_add_and_remove_sinks(self):
+        events = []
+        instrumentation = Instrumentation()
+        instrumentation.add_sink(events.append)
+        instrumentation.emit(request_event())
+        instrumentation.remove_sink(events.append)
+        instrumentation.emit(request_event())
+        assert len(events) == 1
+        with pytest.raises(TypeError):
+            instrumentation.add_sink("not callable")
+
+
+class TestMetricsSink:
+    """Test the Prometheus-style metrics sink."""
+
+    def test_snapshot(self):
+        metrics = MetricsSink(buckets=(0.01, 0.1, 1.0))
+        metrics(request_event(duration=0.05))
+        metrics(request_event(duration=0.5, attempts=3, rate_limit_wait=0.2))
+        metrics(request_event(status_code=None, ttfb=None, duration=2.0,
+                              error=RuntimeError()))
+
+        snapshot = metrics.snapshot()
+        labels = ('GET', 'rooms/{id}', '200')
+        assert snapshot['requests_total'][labels] == 2
+        assert snapshot['request_retries_total'][labels] == 2
+        assert snapshot['rate_limit_wait_seconds_total'][labels] == 0.2
+        assert snapshot['request_duration_seconds'][labels]['buckets'] == \
+            {0.01: 0, 0.1: 1, 1.0: 2, float('inf'): 2}
+        error_labels = ('GET', 'rooms/{id}', 'error')
+        assert snapshot['request_errors_total'][error_labels] == 1
+        assert error_labels not in snapshot['request_ttfb_seconds']
+
+    def test_render(self):
+        metrics = MetricsSink(buckets=(0.1, 1.0))
+        metrics(request_event(duration=0.05))
+        text = metrics.render()
+        labels = 'method="GET",endpoint="rooms/{id}",status="200"'
+        assert "# TYPE ciscosparkapi_requests_total counter" in text
+        assert "ciscosparkapi_requests_total{%s} 1" % labels in text
+        assert 'ciscosparkapi_request_duration_seconds_bucket{%s,le="+Inf"} 1'\
+               % labels in text
+        assert "ciscosparkapi_request_duration_seconds_count{%s} 1" % labels \
+               in text
+
+
+class TestTracingSink:
+    """Test the OpenTelemetry tracing sink."""
+
+    def test_span(self):
+        tracer = FakeTracer()
+        TracingSink(tracer)(request_event())
+        span, = tracer.spans
+        assert span.name == 'GET rooms/{id}'
+        assert span.attributes['http.response.status_code'] == 200
+        assert span.start_time == 1500000000 * 10 ** 9
+        assert span.end_time == span.start_time + 30 * 10 ** 6
+
+    def test_error_span(self):
+        tracer = FakeTracer()
+        error = RuntimeError("Failure")
+        TracingSink(tracer)(request_event(status_code=None, error=error))
+        span, = tracer.spans
+        assert span.events == [('exception', {
+            'exception.type': 'RuntimeError',
+            'exception.message': 'Failure',
+        })]
+        assert span.attributes['error.type'] == 'RuntimeError'
+
+    def test_api_error_report_is_not_rendered(self, api):
+        tracer = FakeTracer()
+        api._session.instrumentation.add_sink(TracingSink(tracer))
+        with pytest.raises(ciscosparkapi.SparkApiError) as error:
+            api.rooms.get('unknown')
+        span, = tracer.spans
+        assert span.events[0][1]['exception.message'] == error.value.args[0]
+        assert error.value._details is None
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""ciscosparkapi/parallel.py Fixtures & Tests"""
+
+
+__author__ = "Chris Lunsford"
+__author_email__ = "chrlunsf@cisco.com"
+__copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
+__license__ = "MIT"
+
+
+import threading
+import time
+
+import pytest
+
+from ciscosparkapi.parallel import chunked, parallel_calls, parallel_items
+
+
+# Helper Classes
+
+class ShardedListing(object):
+    """A list function that records the peak number of concurrent calls."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def list(self, shard, fail=False):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        if fail:
+            raise ValueError(shard)
+        for i in range(3):
+            yield (shard, i)
+
+
+# Tests
+
+class TestParallelItems:
+    """Test the parallel_items function."""
+
+    def test_items_are_merged_in_shard_order(self):
+        listing = ShardedListing()
+        shards = [{'shard': n} for n in range(10)]
+        items = list(parallel_items(listing.list, shards, max_concurrency=4))
+        assert items == [(n, i) for n in range(10) for i in range(3)]
+
+    def test_concurrency_is_capped(self):
+        listing = ShardedListing()
+        shards = [{'shard': n} for n in range(10)]
+        list(parallel_items(listing.list, shards, max_concurrency=3))
+        assert 1 < listing.peak <= 3
+
+    def test_errors_are_raised(self):
+        listing = ShardedListing(delay=0)
+        shards = [{'shard': 0}, {'shard': 1, 'fail': True}]
+        with pytest.raises(ValueError):
+            list(parallel_items(listing.list, shards))
+
+    def test_buffered_items_are_bounded(self):
+        produced = []
+
+        def numbers(shard):
+            for i in range(1000):
+                produced.append((shard, i))
+                yield (shard, i)
+
+        shards = [{'shard': n} for n in range(4)]
+        items = parallel_items(numbers, shards, max_concurrency=2,
+                               buffer_size=10)
+        consumed = 0
+        for item in items:
+            consumed += 1
+            if consumed % 100 == 0:
+                time.sleep(0.01)
+                # Each running shard is at most (buffer_size + 1) items ahead
+                assert len(produced) - consumed <= 2 * 11
+        assert consumed == 4000
+
+    def test_finished_shards_are_bounded(self):
+        produced = []
+
+        def numbers(shard):
+            for i in range(10):
+                produced.append((shard, i))
+                yield (shard, i)
+
+        shards = [{'shard': n} for n in range(20)]
+        items = parallel_items(numbers, shards, max_concurrency=2,
+                               buffer_size=10)
+        consumed = 0
+        for item in items:
+            consumed += 1
+            time.sleep(0.002)
+            # Only the unconsumed shards in the window hold buffered items
+            assert len(produced) - consumed <= 2 * 11
+        assert consumed == 200
+
+    def test_items_are_yielded_before_the_shard_completes(self):
+        finished = threading.Event()
+
+        def slow(shard):
+            yield 'first'
+            finished.wait(1)
+            yield 'last'
+
+        items = parallel_items(slow, [{'shard': 0}])
+        assert next(items) == 'first'
+        assert not finished.is_set()
+        finished.set()
+        assert list(items) == ['last']
+
+    def test_closing_stops_the_queries(self):
+        produced = []
+
+        def numbers(shard):
+            for i in range(1000):
+                produced.append(i)
+                yield i
+
+        items = parallel_items(numbers, [{'shard': 0}], buffer_size=5)
+        assert next(items) == 0
+        items.close()
+        time.sleep(0.3)
+        count = len(produced)
+        time.sleep(0.3)
+        assert len(produced) == count < 1000
+
+    def test_chunked(self):
+        assert chunked(range(5), 2) == [[0, 1], [2, 3], [4]]
+
+
+class TestParallelCalls:
+    """Test the parallel_calls function."""
+
+    def test_results_are_returned_in_call_order(self):
+        listing = ShardedListing()
+        calls = [{'shard': n} for n in range(6)]
+        results = parallel_calls(lambda **call: list(listing.list(**call)),
+                                 calls, max_concurrency=3)
+        assert results == [[(n, i) for i in range(3)] for n in range(6)]
+        assert 1 < listing.peak <= 3
+
+    def test_errors_are_raised(self):
+        listing = ShardedListing(delay=0)
+        calls = [{'shard': 0}, {'shard': 1, 'fail': True}]
+        with pytest.raises(ValueError):
+            parallel_calls(lambda **call: list(listing.list(**call)), calls)
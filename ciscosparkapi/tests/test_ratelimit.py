@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""ciscosparkapi/ratelimit.py Fixtures & Tests"""
+
+
+__author__ = "Chris Lunsford"
+__author_email__ = "chrlunsf@cisco.com"
+__copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
+__license__ = "MIT"
+
+
+import time
+
+import pytest
+
+import ciscosparkapi
+from ciscosparkapi.ratelimit import TokenBucket
+from ciscosparkapi.restsession import _api_endpoint
+
+
+# TokenBucket Tests
+
+class TestTokenBucket:
+    """Test the TokenBucket class."""
+
+    def test_burst_is_not_paced(self):
+        bucket = TokenBucket(rate=1, burst=5)
+        assert all(bucket.reserve() == 0 for _ in range(5))
+
+    def test_calls_beyond_the_burst_are_paced(self):
+        bucket = TokenBucket(rate=10, burst=1)
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == pytest.approx(0.1, abs=0.02)
+        assert bucket.reserve() == pytest.approx(0.2, abs=0.02)
+
+    def test_penalize_holds_calls_and_reduces_rate(self):
+        bucket = TokenBucket(rate=10, burst=10)
+        bucket.penalize(retry_after=1)
+        assert bucket.rate == 5
+        assert bucket.reserve() == pytest.approx(1.2, abs=0.05)
+
+    def test_reward_restores_configured_rate(self):
+        bucket = TokenBucket(rate=10, burst=10)
+        bucket.penalize()
+        for _ in range(100):
+            bucket.reward()
+        assert bucket.rate == bucket.configured_rate
+
+    def test_acquire_waits(self):
+        bucket = TokenBucket(rate=20, burst=1)
+        start = time.time()
+        for _ in range(3):
+            bucket.acquire()
+        assert time.time() - start >= 0.09
+
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+
+# RateLimiter Tests
+
+class TestRateLimiter:
+    """Test the RateLimiter class."""
+
+    def test_endpoints_are_paced_independently(self):
+        limiter = ciscosparkapi.RateLimiter(rates={'messages': (1, 1)},
+                                            default_rate=100)
+        limiter.acquire('messages')
+        limiter.on_rate_limit('messages', retry_after=60)
+        assert limiter.acquire('rooms') == 0
+        assert limiter.bucket('messages').reserve() > 59
+
+    def test_rates(self):
+        limiter = ciscosparkapi.RateLimiter(rates={'messages': 2})
+        limiter.acquire('messages')
+        limiter.on_rate_limit('messages')
+        assert limiter.rates() == {'messages': 1}
+
+
+class TestApiEndpoint:
+    """Test mapping request URLs to API endpoints."""
+
+    @pytest.mark.parametrize("url, endpoint", [
+        ("https://api.ciscospark.com/v1/rooms", "rooms"),
+        ("https://api.ciscospark.com/v1/rooms/abc?max=1", "rooms"),
+        ("https://api.ciscospark.com/v1/people/me", "people"),
+        ("https://api.ciscospark.com/v1/team/memberships/abc",
+         "team/memberships"),
+    ])
+    def test_api_endpoint(self, url, endpoint):
+        assert _api_endpoint(url, "https://api.ciscospark.com/v1/") == endpoint
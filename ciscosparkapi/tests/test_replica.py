@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""ciscosparkapi/replica.py Fixtures & Tests"""
+
+
+__author__ = "Chris Lunsford"
+__author_email__ = "chrlunsf@cisco.com"
+__copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
+__license__ = "MIT"
+
+
+import json
+
+import pytest
+
+import ciscosparkapi
+
+
+# Recorded webhook events (IDs shortened)
+
+WEBHOOK_TEMPLATE = {
+    "id": "Y2lzY29zcGFyazovL3VzL1dFQkhPT0svMQ",
+    "name": "replica test webhook",
+    "targetUrl": "https://example.com/sparkwebhook",
+    "filter": None,
+    "orgId": "Y2lzY29zcGFyazovL3VzL09SR0FOSVpBVElPTi8x",
+    "createdBy": "Y2lzY29zcGFyazovL3VzL1BFT1BMRS9ib3Q",
+    "appId": "Y2lzY29zcGFyazovL3VzL0FQUExJQ0FUSU9OLzE",
+    "ownedBy": "creator",
+    "status": "active",
+    "actorId": "Y2lzY29zcGFyazovL3VzL1BFT1BMRS9hbGljZQ",
+}
+
+ROOM_ID = "Y2lzY29zcGFyazovL3VzL1JPT00vMQ"
+
+ROOM_DATA = {
+    "id": ROOM_ID,
+    "title": "Project Unicorn",
+    "type": "group",
+    "isLocked": False,
+    "lastActivity": "2018-01-10T15:03:05.115Z",
+    "creatorId": "Y2lzY29zcGFyazovL3VzL1BFT1BMRS9hbGljZQ",
+    "created": "2018-01-10T15:03:05.115Z",
+}
+
+MEMBERSHIP_DATA = {
+    "id": "Y2lzY29zcGFyazovL3VzL01FTUJFUlNISVAvYm9i",
+    "roomId": ROOM_ID,
+    "personId": "Y2lzY29zcGFyazovL3VzL1BFT1BMRS9ib2I",
+    "personEmail": "bob@example.com",
+    "personDisplayName": "Bob",
+    "personOrgId": "Y2lzY29zcGFyazovL3VzL09SR0FOSVpBVElPTi8x",
+    "isModerator": False,
+    "isMonitor": False,
+    "created": "2018-01-10T15:04:00.000Z",
+}
+
+MESSAGE_DATA = {
+    "id": "Y2lzY29zcGFyazovL3VzL01FU1NBR0UvMQ",
+    "roomId": ROOM_ID,
+    "roomType": "group",
+    "personId": "Y2lzY29zcGFyazovL3VzL1BFT1BMRS9ib2I",
+    "personEmail": "bob@example.com",
+    "created": "2018-01-10T15:05:00.000Z",
+}
+
+
+# Helper Functions
+
+def recorded_webhook(resource, event, data):
+    """Render a webhook POST body, as received from Cisco Spark."""
+    webhook = dict(WEBHOOK_TEMPLATE, resource=resource, event=event,
+                   data=data)
+    return json.dumps(webhook)
+
+
+# pytest Fixtures
+
+@pytest.fixture
+def replica():
+    replica = ciscosparkapi.ReplicaStore()
+    replica.process_event(recorded_webhook("rooms", "created", ROOM_DATA))
+    replica.process_event(ciscosparkapi.WebhookEvent(
+        recorded_webhook("memberships", "created", MEMBERSHIP_DATA)
+    ))
+    return replica
+
+
+@pytest.fixture
+def simulated_replica(simulator):
+    simulator.populate(people=4, rooms=3, members_per_room=2)
+    return ciscosparkapi.ReplicaStore(simulator.api())
+
+
+# ReplicaStore Tests
+
+class TestReplicaStore:
+    """Test the ReplicaStore class, offline."""
+
+    def test_room_created(self, replica):
+        room = replica.get_room(ROOM_ID)
+        assert isinstance(room, ciscosparkapi.Room)
+        assert room.title == "Project Unicorn"
+        assert len(replica) == 1
+
+    def test_room_updated(self, replica):
+        data = dict(ROOM_DATA, title="Project Pegasus")
+        assert replica.process_event(recorded_webhook("rooms", "updated",
+                                                      data))
+        assert replica.get_room(ROOM_ID).title == "Project Pegasus"
+
+    def test_room_deleted(self, replica):
+        replica.process_event(recorded_webhook("rooms", "deleted",
+                                               {"id": ROOM_ID}))
+        assert replica.get_room(ROOM_ID) is None
+        assert replica.memberships(ROOM_ID) == []
+        assert replica.get_membership(MEMBERSHIP_DATA["id"]) is None
+
+    def test_membership_created(self, replica):
+        memberships = replica.memberships(ROOM_ID)
+        assert len(memberships) == 1
+        assert isinstance(memberships[0], ciscosparkapi.Membership)
+        assert replica.is_member(ROOM_ID, MEMBERSHIP_DATA["personId"])
+
+    def test_membership_updated(self, replica):
+        data = dict(MEMBERSHIP_DATA, isModerator=True)
+        replica.process_event(recorded_webhook("memberships", "updated",
+                                               data))
+        assert replica.get_membership(MEMBERSHIP_DATA["id"]).isModerator
+        assert replica.memberships(ROOM_ID)[0].isModerator
+
+    def test_membership_deleted(self, replica):
+        replica.process_event(recorded_webhook("memberships", "deleted",
+                                               MEMBERSHIP_DATA))
+        assert not replica.is_member(ROOM_ID, MEMBERSHIP_DATA["personId"])
+        assert replica.get_room(ROOM_ID) is not None
+
+    def test_message_created_updates_last_activity(self, replica):
+        replica.process_event(recorded_webhook("messages", "created",
+                                               MESSAGE_DATA))
+        room = replica.get_room(ROOM_ID)
+        assert room.lastActivity == MESSAGE_DATA["created"]
+
+    def test_unreplicated_events_are_ignored(self, replica):
+        assert not replica.process_event(
+            recorded_webhook("messages", "deleted", MESSAGE_DATA)
+        )
+        assert not replica.process_event(
+            recorded_webhook("teams", "created", {"id": "team"})
+        )
+
+    def test_bootstrap_requires_an_api(self):
+        with pytest.raises(ciscosparkapi.ciscosparkapiException):
+            ciscosparkapi.ReplicaStore().bootstrap()
+
+
+class TestReplicaStoreSimulated:
+    """Test a ReplicaStore bootstrapped from a SparkSimulator."""
+
+    def test_bootstrap(self, simulator, simulated_replica):
+        simulated_replica.bootstrap()
+        rooms = simulator.items('rooms')
+        assert len(simulated_replica) == len(rooms)
+        room_id = rooms[0]['id']
+        assert len(simulated_replica.memberships(room_id)) == 3
+
+    def test_events_during_bootstrap_are_applied(self, simulator,
+                                                 simulated_replica):
+        api = simulated_replica._api
+        deleted_room = simulator.items('rooms')[0]
+        new_room = dict(ROOM_DATA, id="Y2lzY29zcGFyazovL3VzL1JPT00vbmV3")
+        list_parallel = api.memberships.list_parallel
+
+        def list_parallel_with_events(room_ids, **kwargs):
+            simulated_replica.process_event(
+                recorded_webhook("rooms", "created", new_room)
+            )
+            simulated_replica.process_event(
+                recorded_webhook("rooms", "deleted", deleted_room)
+            )
+            return list_parallel(room_ids, **kwargs)
+
+        api.memberships.list_parallel = list_parallel_with_events
+        simulated_replica.bootstrap()
+        room_ids = [room.id for room in simulated_replica.rooms()]
+        assert new_room['id'] in room_ids
+        assert deleted_room['id'] not in room_ids
+
+    def test_own_membership_created_adds_the_room(self, simulator,
+                                                  simulated_replica):
+        simulated_replica.bootstrap()
+        room = simulator.create('rooms', title="Added")
+        membership = dict(MEMBERSHIP_DATA, roomId=room['id'],
+                          personId=simulator.me['id'])
+        simulated_replica.process_event(
+            recorded_webhook("memberships", "created", membership)
+        )
+        assert room['id'] in [r.id for r in simulated_replica.rooms()]
+
+        simulated_replica.process_event(
+            recorded_webhook("memberships", "deleted", membership)
+        )
+        assert room['id'] not in [r.id for r in simulated_replica.rooms()]
+
+
+class TestReplicaStoreBootstrap:
+    """Test bootstrapping a ReplicaStore from the Cisco Spark APIs."""
+
+    def test_bootstrap(self, api, group_room,
+                       additional_group_room_memberships):
+        replica = ciscosparkapi.ReplicaStore(api)
+        replica.bootstrap(type="group")
+        assert replica.get_room(group_room.id).id == group_room.id
+        assert len(replica.memberships(group_room.id)) == \
+            len(list(api.memberships.list(roomId=group_room.id)))
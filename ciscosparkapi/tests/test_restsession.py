@@ -8,9 +8,17 @@ __copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
 __license__ = "MIT"
 
 
+import io
+import json
 import logging
+import threading
+import time
 
 import pytest
+import requests
+
+import ciscosparkapi
+from ciscosparkapi.restsession import RestSession, _read_ahead
 
 
 # Helper Classes
@@ -30,6 +38,40 @@ class RateLimitDetector(logging.Handler):
             self.rate_limit_detected = True
 
 
+class PagingAdapter(requests.adapters.BaseAdapter):
+    """Serves `pages` pages of items, each taking `delay` seconds."""
+
+    def __init__(self, pages, delay=0.0, fail_on_page=None):
+        super(PagingAdapter, self).__init__()
+        self.pages = pages
+        self.delay = delay
+        self.fail_on_page = fail_on_page
+
+    def send(self, request, **kwargs):
+        time.sleep(self.delay)
+        page = int(request.url.split('page=')[-1]) if 'page=' in request.url \
+            else 0
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        if page == self.fail_on_page:
+            response.status_code = 404
+            response._content = b'{"message": "Not Found"}'
+            return response
+        response.status_code = 200
+        response.raw = io.BytesIO(
+            json.dumps({'items': [page]}).encode('utf-8')
+        )
+        if page + 1 < self.pages:
+            response.headers['Link'] = \
+                '<https://api.ciscospark.com/v1/rooms?page={}>; rel="next"' \
+                ''.format(page + 1)
+        return response
+
+    def close(self):
+        pass
+
+
 # CiscoSparkAPI Tests
 class TestRestSession:
     """Test edge cases of core RestSession functionality."""
@@ -67,4 +109,147 @@ class TestRestSession:
             api._session.wait_on_rate_limit = original_wait_on_rate_limit
 
         # Assert test condition
-        assert rate_limit_detector.rate_limit_detected == True
+        assert rate_limit_detector.rate_limit_detected is True
+
+
+class TestRestSessionConnections:
+    """Test the connection pool and header settings of RestSession."""
+
+    def test_pool_settings(self):
+        session = RestSession("token", "https://api.ciscospark.com/v1/",
+                              pool_maxsize=64, pool_block=True)
+        adapter = session.http_adapter
+        assert isinstance(adapter, requests.adapters.HTTPAdapter)
+        assert adapter._pool_maxsize == 64
+        assert adapter._pool_block is True
+
+    def test_keep_alive_disabled(self):
+        session = RestSession("token", "https://api.ciscospark.com/v1/",
+                              keep_alive=False)
+        assert session.headers['Connection'] == 'close'
+
+    def test_concurrent_header_updates(self):
+        session = RestSession("token", "https://api.ciscospark.com/v1/")
+        headers = session._req_session.headers
+
+        def update(n):
+            for i in range(100):
+                session.update_headers({'X-Test-{}-{}'.format(n, i): 'x'})
+
+        threads = [threading.Thread(target=update, args=(n,))
+                   for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(session.headers) == len(headers) + 800
+        # Copy-on-write: the original headers dictionary was never modified
+        assert 'X-Test-0-0' not in headers
+
+
+class TestPrefetchPages:
+    """Test reading pages ahead of the consumer."""
+
+    def session(self, adapter, prefetch_pages=0):
+        return RestSession("token", "https://api.ciscospark.com/v1/",
+                           http_adapter=adapter, retry_policy=None,
+                           prefetch_pages=prefetch_pages)
+
+    def test_pages_are_yielded_in_order(self):
+        session = self.session(PagingAdapter(pages=20), prefetch_pages=2)
+        assert list(session.get_items('rooms')) == list(range(20))
+
+    def test_pages_are_fetched_while_consumed(self):
+        session = self.session(PagingAdapter(pages=5, delay=0.1))
+
+        def consume(**kwargs):
+            start = time.time()
+            for _ in session.get_pages('rooms', **kwargs):
+                time.sleep(0.1)
+            return time.time() - start
+
+        assert consume(prefetch=1) < consume() - 0.3
+
+    def test_errors_are_raised_to_the_consumer(self):
+        session = self.session(PagingAdapter(pages=5, fail_on_page=3),
+                               prefetch_pages=2)
+        items = []
+        with pytest.raises(ciscosparkapi.SparkApiError):
+            for item in session.get_items('rooms'):
+                items.append(item)
+        assert items == [0, 1, 2]
+
+    def test_first_page_is_fetched_by_the_consumer(self):
+        threads = []
+
+        def pages():
+            threads.append(threading.current_thread())
+            yield 'first'
+            threads.append(threading.current_thread())
+            yield 'second'
+
+        assert list(_read_ahead(pages(), 1)) == ['first', 'second']
+        assert threads[0] is threading.current_thread()
+        assert threads[1] is not threading.current_thread()
+        assert list(_read_ahead(iter([]), 1)) == []
+
+
+class TestStreamItems:
+    """Test streaming the items of list pages."""
+
+    def test_streamed_items_match(self):
+        session = RestSession("token", "https://api.ciscospark.com/v1/",
+                              http_adapter=PagingAdapter(pages=5),
+                              stream_items=True)
+        assert list(session.get_items('rooms')) == list(range(5))
+
+    def test_stream_items_per_request(self):
+        session = RestSession("token", "https://api.ciscospark.com/v1/",
+                              http_adapter=PagingAdapter(pages=3))
+        assert not session.stream_items
+        items = session.get_items('rooms', stream_items=True, prefetch=2)
+        assert list(items) == [0, 1, 2]
+
+    def test_stream_errors_are_raised(self):
+        session = RestSession("token", "https://api.ciscospark.com/v1/",
+                              http_adapter=PagingAdapter(pages=5,
+                                                         fail_on_page=2),
+                              retry_policy=None, stream_items=True)
+        items = []
+        with pytest.raises(ciscosparkapi.SparkApiError):
+            for item in session.get_items('rooms'):
+                items.append(item)
+        assert items == [0, 1]
+
+    def test_custom_decoder_is_used(self):
+        decoded = []
+
+        def decoder(content):
+            decoded.append(content)
+            return json.loads(content)
+
+        session = RestSession("token", "https://api.ciscospark.com/v1/",
+                              http_adapter=PagingAdapter(pages=3),
+                              json_decoder=decoder, stream_items=True)
+        assert list(session.get_items('rooms')) == [0, 1, 2]
+        assert len(decoded) == 3
+
+
+class TestRawJson:
+    """Test returning the raw (unparsed) JSON of single entities."""
+
+    def test_get_entity_returns_raw_json(self):
+        session = RestSession("token", "https://api.ciscospark.com/v1/",
+                              http_adapter=PagingAdapter(pages=1),
+                              raw_json=True)
+        raw_json = session.get_entity('rooms', 'abc')
+        assert raw_json == b'{"items": [0]}'
+        assert ciscosparkapi.Room(raw_json).to_json() is raw_json
+
+    def test_raw_json_per_request(self):
+        session = RestSession("token", "https://api.ciscospark.com/v1/",
+                              http_adapter=PagingAdapter(pages=1))
+        assert session.get_entity('rooms', 'abc') == {'items': [0]}
+        assert session.get_entity('rooms', 'abc', raw_json=True) == \
+            b'{"items": [0]}'
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""ciscosparkapi/retry.py Fixtures & Tests"""
+
+
+__author__ = "Chris Lunsford"
+__author_email__ = "chrlunsf@cisco.com"
+__copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
+__license__ = "MIT"
+
+
+import time
+
+import pytest
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+import ciscosparkapi
+from ciscosparkapi.restsession import RestSession
+
+
+# Helper Classes
+
+class FlakyAdapter(requests.adapters.BaseAdapter):
+    """Fails the first `failures` requests; then responds 200."""
+
+    def __init__(self, failures, error=None, status_code=503,
+                 status_codes=None):
+        super(FlakyAdapter, self).__init__()
+        self.failures = failures
+        self.error = error
+        self.status_code = status_code
+        self.status_codes = status_codes
+        self.attempts = 0
+
+    def send(self, request, **kwargs):
+        self.attempts += 1
+        if self.attempts <= self.failures and self.error is not None:
+            raise self.error
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        if self.attempts <= self.failures:
+            response.status_code = self.status_code
+            if self.status_codes:
+                response.status_code = self.status_codes[self.attempts - 1]
+            response.headers['Retry-After'] = '1'
+            response._content = b'{"message": "Service Unavailable"}'
+        else:
+            response.status_code = 200
+            response._content = b'{"id": "abc"}'
+        return response
+
+    def close(self):
+        pass
+
+
+# pytest Fixtures
+
+@pytest.fixture
+def fast_retry_policy():
+    return ciscosparkapi.RetryPolicy(max_attempts=3, backoff_factor=0.01)
+
+
+def flaky_session(adapter, retry_policy):
+    return RestSession("token", "https://api.ciscospark.com/v1/",
+                       retry_policy=retry_policy, http_adapter=adapter)
+
+
+# RetryPolicy Tests
+
+class TestRetryPolicy:
+    """Test the RetryPolicy class."""
+
+    def test_backoff_is_jittered_and_capped(self):
+        policy = ciscosparkapi.RetryPolicy(backoff_factor=1, backoff_max=5)
+        backoffs = [policy.backoff(10) for _ in range(100)]
+        assert all(0 <= backoff <= 5 for backoff in backoffs)
+        assert len(set(backoffs)) > 1
+
+    def test_post_is_not_retried_after_it_may_have_been_sent(self):
+        policy = ciscosparkapi.RetryPolicy()
+        assert not policy.is_retryable('POST',
+                                       requests.exceptions.ReadTimeout())
+        assert policy.is_retryable('POST',
+                                   requests.exceptions.ConnectTimeout())
+        assert policy.is_retryable('GET', requests.exceptions.ReadTimeout())
+
+    def test_refused_connections_are_retried(self):
+        policy = ciscosparkapi.RetryPolicy()
+        refused = requests.exceptions.ConnectionError(MaxRetryError(
+            None, 'https://api.ciscospark.com/v1/messages',
+            NewConnectionError(None, 'Connection refused'),
+        ))
+        assert policy.is_retryable('POST', refused)
+        assert not policy.is_retryable('POST',
+                                       requests.exceptions.ConnectionError())
+
+    def test_max_attempts(self):
+        policy = ciscosparkapi.RetryPolicy(max_attempts=2)
+        error = requests.exceptions.ConnectionError()
+        assert policy.should_retry('GET', 1, error)
+        assert not policy.should_retry('GET', 2, error)
+
+
+# RestSession Retry Tests
+
+class TestRestSessionRetries:
+    """Test retrying failed requests in RestSession."""
+
+    def test_retries_are_opt_in(self):
+        adapter = FlakyAdapter(failures=1)
+        session = RestSession("token", "https://api.ciscospark.com/v1/",
+                              http_adapter=adapter)
+        with pytest.raises(ciscosparkapi.SparkApiError):
+            session.get('people/abc')
+        assert adapter.attempts == 1
+
+    def test_server_errors_are_retried(self, fast_retry_policy):
+        adapter = FlakyAdapter(failures=2)
+        session = flaky_session(adapter, fast_retry_policy)
+        assert session.get('people/abc') == {'id': 'abc'}
+        assert adapter.attempts == 3
+
+    def test_retries_are_limited(self, fast_retry_policy):
+        adapter = FlakyAdapter(failures=3)
+        session = flaky_session(adapter, fast_retry_policy)
+        with pytest.raises(ciscosparkapi.SparkApiError):
+            session.get('people/abc')
+        assert adapter.attempts == 3
+
+    def test_post_server_errors_are_not_retried(self, fast_retry_policy):
+        adapter = FlakyAdapter(failures=1)
+        session = flaky_session(adapter, fast_retry_policy)
+        with pytest.raises(ciscosparkapi.SparkApiError):
+            session.post('messages', json={'text': 'Hello'})
+        assert adapter.attempts == 1
+
+    def test_rate_limits_do_not_count_as_attempts(self, fast_retry_policy,
+                                                  monkeypatch):
+        monkeypatch.setattr(time, 'sleep', lambda seconds: None)
+        adapter = FlakyAdapter(failures=3, status_codes=[429, 429, 503])
+        session = flaky_session(adapter, fast_retry_policy)
+        assert session.get('people/abc') == {'id': 'abc'}
+        assert adapter.attempts == 4
+
+    def test_connection_errors_are_retried(self, fast_retry_policy):
+        adapter = FlakyAdapter(failures=1,
+                               error=requests.exceptions.ConnectionError())
+        session = flaky_session(adapter, fast_retry_policy)
+        assert session.get('people/abc') == {'id': 'abc'}
+
+    def test_per_call_override(self, fast_retry_policy):
+        adapter = FlakyAdapter(failures=1)
+        session = flaky_session(adapter, fast_retry_policy)
+        with pytest.raises(ciscosparkapi.SparkApiError):
+            session.get('people/abc', retry_policy=None)
+        assert adapter.attempts == 1
+
+    def test_submitted_requests_are_retried(self, fast_retry_policy):
+        adapter = FlakyAdapter(failures=2)
+        session = flaky_session(adapter, fast_retry_policy)
+        assert session.submit('GET', 'people/abc').result(5) == {'id': 'abc'}
+        assert adapter.attempts == 3
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""ciscosparkapi/scheduler.py Fixtures & Tests"""
+
+
+__author__ = "Chris Lunsford"
+__author_email__ = "chrlunsf@cisco.com"
+__copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
+__license__ = "MIT"
+
+
+from concurrent.futures import Future
+import json
+import threading
+import time
+
+import pytest
+import requests
+
+import ciscosparkapi
+from ciscosparkapi.restsession import RestSession
+
+
+# Helper Classes
+
+class RateLimitedAdapter(requests.adapters.BaseAdapter):
+    """Responds 429 to the first `messages` request; 200 to all others."""
+
+    def __init__(self, retry_after=1):
+        super(RateLimitedAdapter, self).__init__()
+        self.retry_after = retry_after
+        self.rate_limited = False
+        self.sent = []
+
+    def send(self, request, **kwargs):
+        self.sent.append((time.time(), request.url))
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        if '/messages' in request.url and not self.rate_limited:
+            self.rate_limited = True
+            response.status_code = 429
+            response.headers['Retry-After'] = str(self.retry_after)
+            response._content = b'{"message": "Too Many Requests"}'
+        elif '/html' in request.url:
+            response.status_code = 200
+            response._content = b'<html>oops'
+        else:
+            response.status_code = 200
+            response._content = json.dumps({'url': request.url}).encode()
+        return response
+
+    def close(self):
+        pass
+
+
+# pytest Fixtures
+
+@pytest.fixture
+def executor():
+    executor = ciscosparkapi.DeferredExecutor(max_workers=2)
+    yield executor
+    executor.shutdown()
+
+
+@pytest.fixture
+def rate_limited_session(executor):
+    return RestSession("token", "https://api.ciscospark.com/v1/",
+                       deferred_executor=executor,
+                       http_adapter=RateLimitedAdapter())
+
+
+# DeferredExecutor Tests
+
+class TestDeferredExecutor:
+    """Test the DeferredExecutor class."""
+
+    def test_call_soon(self, executor):
+        done = threading.Event()
+        executor.call_soon(done.set)
+        assert done.wait(1)
+
+    def test_calls_run_in_deadline_order(self, executor):
+        results = []
+        finished = threading.Event()
+        executor.call_later(0.2, results.append, 'late')
+        executor.call_later(0.1, results.append, 'early')
+        executor.call_later(0.3, finished.set)
+        assert finished.wait(1)
+        assert results == ['early', 'late']
+
+    def test_waiting_calls_do_not_hold_workers(self, executor):
+        for _ in range(10):
+            executor.call_later(60, time.sleep, 0)
+        done = threading.Event()
+        executor.call_soon(done.set)
+        assert done.wait(1)
+        assert executor.pending == 10
+
+    def test_shutdown_fails_waiting_futures(self):
+        executor = ciscosparkapi.DeferredExecutor(max_workers=1)
+        future = Future()
+        executor.call_later(60, Future.set_result, future, None)
+        executor.shutdown()
+        with pytest.raises(RuntimeError):
+            future.result(1)
+
+
+# RestSession.submit() Tests
+
+class TestSubmit:
+    """Test making requests with RestSession.submit()."""
+
+    def test_submit_returns_json_data(self, rate_limited_session):
+        future = rate_limited_session.submit('GET', 'rooms/abc')
+        assert future.result(1)['url'].endswith('rooms/abc')
+
+    def test_rate_limited_request_is_retried(self, rate_limited_session):
+        start = time.time()
+        future = rate_limited_session.submit('GET', 'messages/abc')
+        assert future.result(5)['url'].endswith('messages/abc')
+        assert time.time() - start >= 1
+
+    def test_other_endpoints_are_served_while_throttled(self,
+                                                        rate_limited_session):
+        throttled = rate_limited_session.submit('GET', 'messages/abc')
+        time.sleep(0.1)
+        others = [rate_limited_session.submit('GET', 'rooms/' + str(i))
+                  for i in range(5)]
+        for future in others:
+            future.result(0.5)
+        assert not throttled.done()
+        throttled.result(5)
+
+    def test_rate_limit_error_without_wait(self, rate_limited_session):
+        rate_limited_session.wait_on_rate_limit = False
+        future = rate_limited_session.submit('GET', 'messages/abc')
+        with pytest.raises(ciscosparkapi.SparkRateLimitError):
+            future.result(1)
+
+    def test_invalid_json_fails_the_future(self, rate_limited_session):
+        future = rate_limited_session.submit('GET', 'html/abc')
+        with pytest.raises(ValueError):
+            future.result(1)
+
+    def test_shutdown_fails_waiting_requests(self, rate_limited_session,
+                                             executor):
+        future = rate_limited_session.submit('GET', 'messages/abc')
+        time.sleep(0.1)
+        executor.shutdown()
+        with pytest.raises(RuntimeError):
+            future.result(1)
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""ciscosparkapi/simulator.py Fixtures & Tests"""
+
+
+__author__ = "Chris Lunsford"
+__author_email__ = "chrlunsf@cisco.com"
+__copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
+__license__ = "MIT"
+
+
+import time
+
+import pytest
+import requests
+
+import ciscosparkapi
+from ciscosparkapi.simulator import SparkSimulator
+
+
+# SparkSimulator Tests
+
+class TestSparkSimulator:
+    """Test the offline Spark API simulator."""
+
+    def test_pagination(self, simulator, simulated_api):
+        room_id = simulator.populate(rooms=1, messages_per_room=250)[0]
+        messages = list(simulated_api.messages.list(roomId=room_id, max=40))
+        assert len(messages) == 250
+        # Messages are listed newest first
+        assert messages[0].text == "Message 249"
+        assert simulator.stats()['endpoints']['messages'] == 7
+
+    def test_crud(self, simulated_api):
+        room = simulated_api.rooms.create("Test Room")
+        assert simulated_api.rooms.get(room.id).title == "Test Room"
+        assert simulated_api.rooms.update(room.id, title="Renamed").title \
+            == "Renamed"
+
+        membership = simulated_api.memberships.create(
+            room.id, personEmail="new@example.com"
+        )
+        memberships = simulated_api.memberships.list(roomId=room.id)
+        assert [m.id for m in memberships] == [membership.id]
+        with pytest.raises(ciscosparkapi.SparkApiError) as error:
+            simulated_api.memberships.create(room.id,
+                                             personEmail="new@example.com")
+        assert error.value.status_code == 409
+
+        simulated_api.rooms.delete(room.id)
+        with pytest.raises(ciscosparkapi.SparkApiError) as error:
+            simulated_api.rooms.get(room.id)
+        assert error.value.status_code == 404
+
+    def test_file_upload(self, simulated_api, tmpdir):
+        path = tmpdir.join('upload.txt')
+        path.write_binary(b'file contents')
+        room = simulated_api.rooms.create("Files")
+        message = simulated_api.messages.create(roomId=room.id,
+                                                text="See attached",
+                                                files=[str(path)])
+        assert message.text == "See attached"
+        assert requests.get(message.files[0]).content == b'file contents'
+
+    def test_people(self, simulator, simulated_api):
+        simulator.populate(people=3)
+        assert simulated_api.people.me().emails == ['simulator@example.com']
+        people = list(simulated_api.people.list(email='person2@example.com'))
+        assert [person.displayName for person in people] == ['Person 2']
+
+    def test_me_cache_is_opt_in(self, simulator, simulated_api):
+        assert simulated_api.people.me() is not simulated_api.people.me()
+
+        api = simulator.api(me_cache_ttl=60)
+        assert api.me is api.people.me()
+        refreshed = api.people.me(refresh=True)
+        assert refreshed.id == simulator.me['id']
+        assert api.people.me() is refreshed
+
+    def test_get_many_people(self, simulator):
+        simulator.populate(people=200)
+        api = simulator.api(entity_cache=ciscosparkapi.EntityCache())
+        ids = [person['id'] for person in simulator.items('people')][:100]
+
+        people = api.people.get_many(ids + ids[:5] + ['unknown'])
+        assert sorted(people) == sorted(ids + ['unknown'])
+        assert all(people[person_id].id == person_id for person_id in ids)
+        assert people['unknown'] is None
+        # 101 distinct IDs are requested in batches of (up to) 85 IDs
+        assert simulator.stats()['endpoints']['people'] == 2
+
+        cached = api.people.get_many(ids[:10])
+        assert [cached[person_id].id for person_id in ids[:10]] == ids[:10]
+        assert simulator.stats()['endpoints']['people'] == 2
+
+    def test_invalid_access_token(self, simulator):
+        api = ciscosparkapi.CiscoSparkAPI(access_token='invalid',
+                                          base_url=simulator.url,
+                                          retry_policy=None)
+        with pytest.raises(ciscosparkapi.SparkApiError) as error:
+            api.people.me()
+        assert error.value.status_code == 401
+
+    def test_injected_rate_limit_is_retried(self, simulator, simulated_api):
+        simulator.inject(429, retry_after=1)
+        start = time.time()
+        assert simulated_api.people.me().displayName == 'Spark Simulator'
+        assert time.time() - start >= 1
+        assert simulator.stats()['rate_limited'] == 1
+
+    def test_injected_server_errors(self, simulator):
+        api = simulator.api(retry_policy=ciscosparkapi.RetryPolicy(
+            max_attempts=3, backoff_factor=0
+        ))
+        me = simulator.me['id']
+        simulator.inject(503, count=2)
+        assert api.people.get(me).displayName == 'Spark Simulator'
+        simulator.inject(503, count=3)
+        with pytest.raises(ciscosparkapi.SparkApiError):
+            api.people.get(me)
+
+    def test_random_faults_are_deterministic(self):
+        def faults():
+            with SparkSimulator(error_rate=0.3, seed=42) as simulator:
+                api = simulator.api(retry_policy=None)
+                results = []
+                for _ in range(20):
+                    try:
+                        api.people.get(simulator.me['id'])
+                        results.append(True)
+                    except ciscosparkapi.SparkApiError:
+                        results.append(False)
+                return results
+
+        results = faults()
+        assert not all(results) and any(results)
+        assert faults() == results
+
+    def test_conditional_gets(self, simulator):
+        cache = ciscosparkapi.ResponseCache()
+        api = simulator.api(response_cache=cache)
+        room = api.rooms.create("Cached")
+        api.rooms.get(room.id)
+        api.rooms.get(room.id)
+        assert simulator.stats()['not_modified'] == 1
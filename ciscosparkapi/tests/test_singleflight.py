@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+"""ciscosparkapi/singleflight.py Fixtures & Tests"""
+
+
+__author__ = "Chris Lunsford"
+__author_email__ = "chrlunsf@cisco.com"
+__copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
+__license__ = "MIT"
+
+
+import json
+import sys
+import threading
+import time
+
+import pytest
+import requests
+
+from ciscosparkapi.restsession import RestSession
+from ciscosparkapi.singleflight import (
+    SingleFlight, coalescing_key, request_key,
+)
+
+
+# Helper Classes
+
+class SlowAdapter(requests.adapters.BaseAdapter):
+    """Counts the requests sent; each response takes `delay` seconds."""
+
+    def __init__(self, delay=0.2):
+        super(SlowAdapter, self).__init__()
+        self.delay = delay
+        self.sent = 0
+        self.lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        with self.lock:
+            self.sent += 1
+        time.sleep(self.delay)
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        response.status_code = 200
+        response._content = json.dumps({'url': request.url}).encode('utf-8')
+        return response
+
+    def close(self):
+        pass
+
+
+# Helper Functions
+
+def call_concurrently(function, args_list):
+    results = [None] * len(args_list)
+
+    def call(index, args):
+        results[index] = function(*args)
+
+    threads = [threading.Thread(target=call, args=(index, args))
+               for index, args in enumerate(args_list)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+# pytest Fixtures
+
+@pytest.fixture
+def adapter():
+    return SlowAdapter()
+
+
+@pytest.fixture
+def coalescing_session(adapter):
+    return RestSession("token", "https://api.ciscospark.com/v1/",
+                       http_adapter=adapter, coalesce_gets=True)
+
+
+# SingleFlight Tests
+
+class TestSingleFlight:
+    """Test the SingleFlight class."""
+
+    def test_concurrent_calls_are_coalesced(self):
+        singleflight = SingleFlight()
+        calls = []
+
+        def slow_call():
+            calls.append(None)
+            time.sleep(0.2)
+            return object()
+
+        results = call_concurrently(
+            lambda: singleflight.do('key', slow_call), [()] * 10
+        )
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+        assert singleflight.coalesced == 9
+
+    def test_waiters_get_copied_results(self):
+        singleflight = SingleFlight(copy_result=list)
+
+        def slow_call():
+            time.sleep(0.2)
+            return [1, 2]
+
+        results = call_concurrently(
+            lambda: singleflight.do('key', slow_call), [()] * 5
+        )
+        assert results == [[1, 2]] * 5
+        assert len(set(id(result) for result in results)) == 5
+
+    def test_errors_are_shared(self):
+        singleflight = SingleFlight()
+
+        def failing_call():
+            time.sleep(0.1)
+            raise ValueError()
+
+        def call():
+            try:
+                singleflight.do('key', failing_call)
+            except ValueError:
+                return 'raised'
+
+        assert call_concurrently(call, [()] * 5) == ['raised'] * 5
+
+    def test_request_key_ignores_parameter_order(self):
+        assert (request_key('url', {'a': 1, 'b': 2}) ==
+                request_key('url', {'b': 2, 'a': 1}))
+
+    def test_coalescing_key_includes_request_options(self):
+        key = coalescing_key('url', {'a': 1}, 200, headers={'Accept': 'x'})
+        assert key == coalescing_key('url', {'a': 1}, 200,
+                                     headers={'accept': 'x'})
+        assert key != coalescing_key('url', {'a': 1}, 200)
+        assert key != coalescing_key('url', {'a': 1}, 204,
+                                     headers={'Accept': 'x'})
+        assert key != coalescing_key('url', {'a': 1}, 200,
+                                     headers={'Accept': 'x'}, timeout=1)
+
+
+# RestSession Coalescing Tests
+
+class TestCoalescedGets:
+    """Test coalescing identical concurrent GETs in RestSession."""
+
+    def test_identical_gets_are_coalesced(self, adapter, coalescing_session):
+        results = call_concurrently(coalescing_session.get,
+                                    [('rooms/abc',)] * 10)
+        assert adapter.sent == 1
+        assert all(result['url'].endswith('rooms/abc') for result in results)
+        # Each caller gets its own copy of the JSON data
+        assert len(set(id(result) for result in results)) == 10
+
+    def test_different_gets_are_not_coalesced(self, adapter,
+                                              coalescing_session):
+        call_concurrently(coalescing_session.get,
+                          [('rooms/abc',), ('rooms/def',),
+                           ('rooms', {'max': 1})])
+        assert adapter.sent == 3
+
+    def test_gets_with_different_options_are_not_coalesced(
+            self, adapter, coalescing_session):
+        def get(kwargs):
+            return coalescing_session.get('rooms/abc', **kwargs)
+
+        call_concurrently(get, [({},), ({'headers': {'Accept': 'x'}},),
+                                ({'erc': 200},), ({'erc': (200, 204)},)])
+        assert adapter.sent == 3
+
+    def test_coalescing_is_opt_in(self, adapter):
+        session = RestSession("token", "https://api.ciscospark.com/v1/",
+                              http_adapter=adapter)
+        call_concurrently(session.get, [('rooms/abc',)] * 3)
+        assert adapter.sent == 3
+
+    @pytest.mark.skipif(sys.version_info < (3, 6),
+                        reason="requires Python 3.6+")
+    def test_async_gets_are_coalesced(self, adapter, coalescing_session):
+        import asyncio
+        from ciscosparkapi.aio import AsyncRestSession
+
+        async_session = AsyncRestSession(coalescing_session)
+
+        async def get_concurrently():
+            return await asyncio.gather(*[async_session.get('rooms/abc')
+                                          for _ in range(10)])
+
+        loop = asyncio.new_event_loop()
+        try:
+            results = loop.run_until_complete(get_concurrently())
+        finally:
+            loop.close()
+            async_session.close()
+
+        assert adapter.sent == 1
+        assert len(results) == 10
+
+    @pytest.mark.skipif(sys.version_info < (3, 6),
+                        reason="requires Python 3.6+")
+    def test_async_gets_with_different_headers_are_not_coalesced(
+            self, adapter, coalescing_session):
+        import asyncio
+        from ciscosparkapi.aio import AsyncRestSession
+
+        async_session = AsyncRestSession(coalescing_session)
+
+        async def get_concurrently():
+            return await asyncio.gather(
+                async_session.get('rooms/abc'),
+                async_session.get('rooms/abc', headers={'Accept': 'x'}),
+                async_session.get('rooms/abc', erc=(200, 204)),
+            )
+
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(get_concurrently())
+        finally:
+            loop.close()
+            async_session.close()
+
+        assert adapter.sent == 3
+
+    @pytest.mark.skipif(sys.version_info < (3, 6),
+                        reason="requires Python 3.6+")
+    def test_async_api_gets_are_coalesced(self, adapter, coalescing_session):
+        import asyncio
+        from ciscosparkapi.aio import AsyncAPIWrapper, AsyncRestSession
+        from ciscosparkapi.api.rooms import RoomsAPI
+
+        async_session = AsyncRestSession(coalescing_session)
+        rooms = AsyncAPIWrapper(RoomsAPI(coalescing_session), async_session,
+                                coalesced_methods=('get',))
+
+        async def get_concurrently():
+            return await asyncio.gather(*[rooms.get('abc')
+                                          for _ in range(10)])
+
+        loop = asyncio.new_event_loop()
+        try:
+            results = loop.run_until_complete(get_concurrently())
+        finally:
+            loop.close()
+            async_session.close()
+
+        assert adapter.sent == 1
+        # The tasks shared a single executor call (and Room object)
+        assert all(result is results[0] for result in results)
+
+    @pytest.mark.skipif(sys.version_info < (3, 6),
+                        reason="requires Python 3.6+")
+    def test_async_coalesced_gets_are_copied(self, adapter,
+                                             coalescing_session):
+        import asyncio
+        from ciscosparkapi.aio import AsyncRestSession
+
+        async_session = AsyncRestSession(coalescing_session)
+
+        async def get_concurrently():
+            return await asyncio.gather(*[async_session.get('rooms/abc')
+                                          for _ in range(5)])
+
+        loop = asyncio.new_event_loop()
+        try:
+            results = loop.run_until_complete(get_concurrently())
+        finally:
+            loop.close()
+            async_session.close()
+
+        assert adapter.sent == 1
+        assert len(set(id(result) for result in results)) == 5
+
+    @pytest.mark.skipif(sys.version_info < (3, 6),
+                        reason="requires Python 3.6+")
+    def test_async_api_calls_with_unhashable_arguments(self,
+                                                       coalescing_session):
+        import asyncio
+        from ciscosparkapi.aio import AsyncAPIWrapper, AsyncRestSession
+
+        class ListAPI(object):
+            calls = 0
+
+            def get(self, ids, options=None):
+                ListAPI.calls += 1
+                time.sleep(0.1)
+                return list(ids)
+
+        async_session = AsyncRestSession(coalescing_session)
+        api = AsyncAPIWrapper(ListAPI(), async_session,
+                              coalesced_methods=('get',))
+
+        async def get_concurrently():
+            return await asyncio.gather(
+                api.get(['a', 'b'], options={'max': 1}),
+                api.get(['a', 'b'], options={'max': 1}),
+                api.get(['a', 'c'], options={'max': 1}),
+            )
+
+        loop = asyncio.new_event_loop()
+        try:
+            results = loop.run_until_complete(get_concurrently())
+        finally:
+            loop.close()
+            async_session.close()
+
+        assert results == [['a', 'b'], ['a', 'b'], ['a', 'c']]
+        assert ListAPI.calls == 2
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""ciscosparkapi/sparkdata.py Fixtures & Tests"""
+
+
+__author__ = "Chris Lunsford"
+__author_email__ = "chrlunsf@cisco.com"
+__copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
+__license__ = "MIT"
+
+
+import copy
+import json
+import pickle
+
+import pytest
+
+import ciscosparkapi
+from ciscosparkapi.sparkdata import SparkData
+
+
+# pytest Fixtures
+
+@pytest.fixture
+def person():
+    return ciscosparkapi.Person({
+        'id': 'person-id',
+        'displayName': 'Test Person',
+        'newAttribute': 42,
+        'address': {'city': 'Austin', 'country': 'US'},
+    })
+
+
+# SparkData Tests
+
+class TestSparkData:
+    """Test the SparkData base class."""
+
+    def test_objects_are_slotted(self, person):
+        assert not hasattr(person, '__dict__')
+        for cls in SparkData.__subclasses__():
+            assert '__dict__' not in dir(cls), cls
+
+    def test_unknown_attributes(self, person):
+        assert person.newAttribute == 42
+        with pytest.raises(AttributeError):
+            person.missingAttribute
+
+    def test_nested_objects_are_wrapped_once(self, person):
+        assert isinstance(person.address, SparkData)
+        assert person.address.city == 'Austin'
+        assert person.address is person.address
+
+    def test_copy_and_pickle(self, person):
+        for clone in (copy.copy(person), copy.deepcopy(person),
+                      pickle.loads(pickle.dumps(person))):
+            assert clone.json_data == person.json_data
+            assert clone.address.country == 'US'
+
+    def test_raw_json_is_parsed_on_first_access(self):
+        raw_json = b'{"id": "room-id", "title": "Caf\\u00e9"}'
+        room = ciscosparkapi.Room(raw_json)
+        with pytest.raises(AttributeError):
+            object.__getattribute__(room, '_json_data')
+        assert room.title == u'Café'
+        assert room.json_data == {'id': 'room-id', 'title': u'Café'}
+        assert type(room._json_data) is dict
+
+    def test_raw_json_is_relayed_unchanged(self):
+        raw_json = b'{"id":"room-id",  "title":"Unparsed"}'
+        room = ciscosparkapi.Room(raw_json)
+        assert room.to_json() is raw_json
+        assert room.id == 'room-id'
+        assert room.to_json() is raw_json
+        assert json.loads(room.to_json(sort_keys=True)) == json.loads(raw_json)
+
+    def test_invalid_raw_json_raises_on_access(self):
+        room = ciscosparkapi.Room(b'{"id": ')
+        with pytest.raises(ValueError):
+            room.id
+
+    def test_raw_json_copy_and_pickle(self):
+        room = ciscosparkapi.Room(b'{"id": "room-id"}')
+        for clone in (copy.copy(room), pickle.loads(pickle.dumps(room))):
+            assert clone.id == 'room-id'
+            assert clone.to_json() == b'{"id": "room-id"}'
+
+    def test_webhook_event_data(self):
+        event = ciscosparkapi.WebhookEvent({
+            'resource': 'messages',
+            'data': {'id': 'message-id'},
+        })
+        assert isinstance(event.data, ciscosparkapi.Message)
+        assert event.data is event.data
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""ciscosparkapi/transports.py Fixtures & Tests"""
+
+
+__author__ = "Chris Lunsford"
+__author_email__ = "chrlunsf@cisco.com"
+__copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
+__license__ = "MIT"
+
+
+import http.server
+import json
+import threading
+
+import pytest
+import requests
+
+import ciscosparkapi
+from ciscosparkapi.restsession import RestSession
+
+
+httpx = pytest.importorskip("httpx")
+
+
+# Helper Classes
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+    """Serves a page of rooms, with a Link header to the next page."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        body = json.dumps({'items': [{'id': self.path}]}).encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json;charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        if 'start' not in self.path:
+            self.send_header("Link", '<http://{}{}?start=1>; rel="next"'
+                                     ''.format(self.headers['Host'],
+                                               self.path))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+# pytest Fixtures
+
+@pytest.fixture
+def stub_server():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    yield "http://127.0.0.1:{}/v1/".format(server.server_port)
+    server.shutdown()
+    server.server_close()
+
+
+def mock_client(handler):
+    return httpx.Client(transport=httpx.MockTransport(handler))
+
+
+# HTTP2Adapter Tests
+
+class TestHTTP2Adapter:
+    """Test the HTTP2Adapter transport adapter."""
+
+    def test_responses_are_requests_responses(self):
+        def handler(request):
+            return httpx.Response(200, json={'id': 'abc'},
+                                  headers={'TrackingID': '123'})
+
+        adapter = ciscosparkapi.HTTP2Adapter(client=mock_client(handler))
+        session = RestSession("token", "https://api.ciscospark.com/v1/",
+                              http_adapter=adapter)
+        response = session.request('GET', 'people/abc', 200)
+        assert isinstance(response, requests.Response)
+        assert response.headers['trackingid'] == '123'
+        assert session.get('people/abc') == {'id': 'abc'}
+
+    def test_request_headers_and_body_are_sent(self):
+        sent = {}
+
+        def handler(request):
+            sent['authorization'] = request.headers['Authorization']
+            sent['body'] = json.loads(request.content)
+            return httpx.Response(200, json={'id': 'abc'})
+
+        adapter = ciscosparkapi.HTTP2Adapter(client=mock_client(handler))
+        session = RestSession("token", "https://api.ciscospark.com/v1/",
+                              http_adapter=adapter)
+        session.post('messages', json={'text': 'Hello'})
+        assert sent == {'authorization': 'Bearer token',
+                        'body': {'text': 'Hello'}}
+
+    def test_error_responses_raise_spark_api_errors(self):
+        def handler(request):
+            return httpx.Response(404, json={'message': 'Not Found'})
+
+        adapter = ciscosparkapi.HTTP2Adapter(client=mock_client(handler))
+        session = RestSession("token", "https://api.ciscospark.com/v1/",
+                              http_adapter=adapter)
+        with pytest.raises(ciscosparkapi.SparkApiError):
+            session.get('people/abc')
+
+    def test_transport_errors_are_requests_errors(self):
+        def handler(request):
+            raise httpx.ConnectError("Connection refused", request=request)
+
+        adapter = ciscosparkapi.HTTP2Adapter(client=mock_client(handler))
+        session = RestSession("token", "https://api.ciscospark.com/v1/",
+                              http_adapter=adapter, retry_policy=None)
+        with pytest.raises(requests.exceptions.ConnectionError):
+            session.get('people/abc')
+
+    def test_stub_server_pagination(self, stub_server):
+        pytest.importorskip("h2")
+        session = RestSession("token", stub_server, http2=True)
+        assert isinstance(session.http_adapter, ciscosparkapi.HTTP2Adapter)
+        items = list(session.get_items('rooms'))
+        assert [item['id'] for item in items] == ['/v1/rooms',
+                                                  '/v1/rooms?start=1']
+
+    def test_hop_by_hop_headers_are_not_sent(self):
+        sent = {}
+
+        def handler(request):
+            sent['headers'] = dict(request.headers)
+            return httpx.Response(200, json={'id': 'abc'})
+
+        adapter = ciscosparkapi.HTTP2Adapter(client=mock_client(handler))
+        session = RestSession("token", "https://api.ciscospark.com/v1/",
+                              http_adapter=adapter, keep_alive=False)
+        session.get('people/abc')
+        assert sent['headers'].get('connection') != 'close'
+
+    def test_unsupported_settings_raise(self):
+        def handler(request):
+            return httpx.Response(200, json={'id': 'abc'})
+
+        adapter = ciscosparkapi.HTTP2Adapter(client=mock_client(handler))
+        request = requests.Request(
+            'GET', "https://api.ciscospark.com/v1/people/abc"
+        ).prepare()
+        assert adapter.send(request, verify=True).status_code == 200
+        with pytest.raises(ValueError):
+            adapter.send(request, verify=False)
+        with pytest.raises(ValueError):
+            adapter.send(request, cert='client.pem')
+        with pytest.raises(ValueError):
+            adapter.send(request, proxies={'https': 'http://proxy:3128'})
+
+    def test_clients_per_settings(self):
+        adapter = ciscosparkapi.HTTP2Adapter()
+        try:
+            assert adapter.client is adapter._get_client(True, None, None)
+            assert adapter._get_client(False, None, None) is not adapter.client
+        finally:
+            adapter.close()
+
+    def test_streamed_responses(self):
+        def handler(request):
+            return httpx.Response(200, json={'items': [{'id': 'a'},
+                                                       {'id': 'b'}]})
+
+        adapter = ciscosparkapi.HTTP2Adapter(client=mock_client(handler))
+        session = RestSession("token", "https://api.ciscospark.com/v1/",
+                              http_adapter=adapter, stream_items=True)
+        items = list(session.get_items('rooms'))
+        assert [item['id'] for item in items] == ['a', 'b']
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""ciscosparkapi/uploads.py Fixtures & Tests"""
+
+
+__author__ = "Chris Lunsford"
+__author_email__ = "chrlunsf@cisco.com"
+__copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
+__license__ = "MIT"
+
+
+import email.parser
+import io
+import os
+
+import pytest
+import requests
+
+from ciscosparkapi.uploads import MultipartUpload, is_upload_source
+from ciscosparkapi.utils import EncodableFile
+
+
+CONTENTS = os.urandom(100 * 1024 + 7)
+
+
+# Helper Classes
+
+class NonSeekableFile(io.RawIOBase):
+    """A readable, non-seekable binary file (i.e. a pipe or socket)."""
+
+    def __init__(self, data):
+        self._file = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._file.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+# Helper Functions
+
+def parse(upload, chunks=None):
+    """Send an upload's body; return the (parsed) multipart message parts."""
+    body = b''.join(upload if chunks is None else chunks)
+    if upload.len is not None:
+        assert len(body) == upload.len
+    message = email.parser.BytesParser().parsebytes(
+        b'Content-Type: ' + upload.content_type.encode('utf-8') + b'\r\n\r\n' +
+        body
+    )
+    return message.get_payload()
+
+
+# pytest Fixtures
+
+@pytest.fixture
+def file_path(tmpdir):
+    path = tmpdir.join('upload.bin')
+    path.write_binary(CONTENTS)
+    return str(path)
+
+
+@pytest.fixture
+def room(simulated_api):
+    return simulated_api.rooms.create("Uploads")
+
+
+# Tests
+
+class TestMultipartUpload:
+    """Test the streaming multipart/form-data body."""
+
+    @pytest.mark.parametrize('make_source', [
+        lambda path: path,
+        lambda path: open(path, 'rb'),
+        lambda path: CONTENTS,
+        lambda path: bytearray(CONTENTS),
+        lambda path: memoryview(CONTENTS),
+        lambda path: iter([CONTENTS[:1000], CONTENTS[1000:]]),
+        lambda path: NonSeekableFile(CONTENTS),
+    ])
+    def test_sources(self, file_path, make_source):
+        upload = MultipartUpload({'roomId': 'room', 'text': 'Hello'},
+                                 make_source(file_path), chunk_size=4096)
+        chunks = list(upload)
+        assert max(len(chunk) for chunk in chunks) <= 4096
+
+        room_id, text, files = parse(upload, chunks)
+        assert room_id.get_payload() == 'room'
+        assert text.get_payload() == 'Hello'
+        assert files.get_param('name', header='content-disposition') == \
+            'files'
+        assert files.get_payload(decode=True) == CONTENTS
+
+    def test_length(self, file_path):
+        assert MultipartUpload({}, file_path).len is not None
+        assert MultipartUpload({}, io.BytesIO(CONTENTS)).len is not None
+        assert MultipartUpload({}, iter([CONTENTS])).len is None
+        assert MultipartUpload({}, iter([CONTENTS]),
+                               size=len(CONTENTS)).len is not None
+
+    def test_file_name_and_content_type(self, file_path):
+        upload = MultipartUpload({}, file_path)
+        assert upload.file_name == 'upload.bin'
+        upload = MultipartUpload({}, EncodableFile('report.pdf', CONTENTS,
+                                                   None))
+        part, = parse(upload)
+        assert part.get_filename() == 'report.pdf'
+        assert part.get_content_type() == 'application/pdf'
+
+    def test_progress(self, file_path):
+        progress = []
+        upload = MultipartUpload({}, file_path, chunk_size=8192,
+                                 progress=lambda *args: progress.append(args))
+        list(upload)
+        assert progress[-1] == (upload.len, upload.len)
+        sent = [bytes_sent for bytes_sent, _ in progress]
+        assert sent == sorted(sent)
+
+    def test_replay(self, file_path):
+        file_object = open(file_path, 'rb')
+        file_object.read(10)
+        upload = MultipartUpload({}, file_object)
+        assert upload.replayable
+        assert parse(upload)[0].get_payload(decode=True) == CONTENTS[10:]
+        assert parse(upload)[0].get_payload(decode=True) == CONTENTS[10:]
+
+        upload = MultipartUpload({}, iter([CONTENTS]))
+        assert not upload.replayable
+        list(upload)
+        with pytest.raises(ValueError):
+            list(upload)
+
+    def test_invalid_sources(self, tmpdir):
+        assert not is_upload_source(str(tmpdir.join('missing.txt')))
+        for container in ([CONTENTS], (CONTENTS,), {'file': CONTENTS}):
+            assert not is_upload_source(container)
+            with pytest.raises(ValueError):
+                MultipartUpload({}, container)
+        assert is_upload_source(chunk for chunk in [CONTENTS])
+        with pytest.raises(ValueError):
+            MultipartUpload({}, 42)
+        with pytest.raises(ValueError):
+            MultipartUpload({}, CONTENTS, chunk_size=0)
+
+
+class TestMessagesUploads:
+    """Test uploading files with MessagesAPI.create()."""
+
+    @pytest.mark.parametrize('make_source', [
+        lambda path: path,
+        lambda path: open(path, 'rb'),
+        lambda path: memoryview(CONTENTS),
+        lambda path: iter([CONTENTS[:1000], CONTENTS[1000:]]),
+    ])
+    def test_create_with_file(self, simulated_api, room, file_path,
+                              make_source):
+        progress = []
+        message = simulated_api.messages.create(
+            roomId=room.id, text="Attached", files=[make_source(file_path)],
+            progress=lambda *args: progress.append(args),
+        )
+        assert requests.get(message.files[0]).content == CONTENTS
+        assert progress[-1][0] > len(CONTENTS)
+
+    def test_rate_limited_upload_is_resent(self, simulator, simulated_api,
+                                           room):
+        simulator.inject(429, retry_after=1)
+        message = simulated_api.messages.create(roomId=room.id,
+                                                files=[CONTENTS])
+        assert requests.get(message.files[0]).content == CONTENTS
+
+    def test_create_many(self, simulator, simulated_api):
+        rooms = [simulated_api.rooms.create("Room {}".format(i))
+                 for i in range(6)]
+        messages = simulated_api.messages.create_many(
+            [{'roomId': r.id, 'files': [EncodableFile(
+                'file{}.txt'.format(i), CONTENTS[:i + 1], 'text/plain'
+            )]} for i, r in enumerate(rooms)],
+            max_concurrency=3,
+        )
+        assert [m.roomId for m in messages] == [r.id for r in rooms]
+        for i, message in enumerate(messages):
+            assert requests.get(message.files[0]).content == CONTENTS[:i + 1]
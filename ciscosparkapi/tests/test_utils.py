@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""ciscosparkapi/utils.py Fixtures & Tests"""
+
+
+__author__ = "Chris Lunsford"
+__author_email__ = "chrlunsf@cisco.com"
+__copyright__ = "Copyright (c) 2016-2018 Cisco and/or its affiliates."
+__license__ = "MIT"
+
+
+from collections import OrderedDict
+import json
+
+import pytest
+import requests
+
+from ciscosparkapi.utils import (
+    check_response_code,
+    extract_and_parse_json,
+    get_json_decoder,
+    iter_json_items,
+)
+from ciscosparkapi.exceptions import SparkApiError, ciscosparkapiException
+
+
+# Helper Functions
+
+def json_response(json_data, status_code=200):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(json_data).encode('utf-8')
+    response.encoding = 'utf-8'
+    response.request = requests.Request(
+        'GET', 'https://api.ciscospark.com/v1/messages'
+    ).prepare()
+    return response
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+# Helper Classes
+
+class CountingDecoder(json.JSONDecoder):
+    """Counts the values it is asked to parse."""
+
+    def __init__(self, **kwargs):
+        super(CountingDecoder, self).__init__(**kwargs)
+        self.calls = 0
+
+    def raw_decode(self, s, idx=0):
+        self.calls += 1
+        return super(CountingDecoder, self).raw_decode(s, idx)
+
+
+# pytest Fixtures
+
+@pytest.fixture
+def page():
+    return {'items': [{'id': str(i), 'text': u'Héllo {}'.format(i),
+                       'mentionedPeople': ['a', 'b']}
+                      for i in range(100)]}
+
+
+# JSON Decoder Tests
+
+class TestJsonDecoders:
+    """Test the pluggable JSON decoders."""
+
+    @pytest.mark.parametrize("decoder", ['auto', 'fast', 'compat'])
+    def test_decoders_agree(self, page, decoder):
+        assert extract_and_parse_json(json_response(page), decoder) == page
+
+    def test_orjson_decoder(self, page):
+        pytest.importorskip("orjson")
+        assert extract_and_parse_json(json_response(page), 'orjson') == page
+
+    def test_compat_decoder_builds_ordered_dicts(self, page):
+        json_data = extract_and_parse_json(json_response(page), 'compat')
+        assert isinstance(json_data['items'][0], OrderedDict)
+
+    def test_fast_decoder_builds_plain_dicts(self, page):
+        json_data = extract_and_parse_json(json_response(page), 'fast')
+        assert type(json_data['items'][0]) is dict
+
+    def test_custom_decoder(self, page):
+        decoder = get_json_decoder(lambda content: json.loads(content)['items'])
+        assert decoder(json_response(page)) == page['items']
+
+    def test_unknown_decoder(self):
+        with pytest.raises(ValueError):
+            get_json_decoder('simd')
+
+
+class TestCheckResponseCode:
+    """Test checking response codes."""
+
+    def test_expected_response_code_tuple(self):
+        check_response_code(json_response({}, status_code=304), (200, 304))
+        with pytest.raises(SparkApiError):
+            check_response_code(json_response({}, status_code=404), (200, 304))
+
+
+# Streaming Items Parser Tests
+
+class TestIterJsonItems:
+    """Test incrementally parsing the items of a JSON page."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 1024, 1024 * 1024])
+    def test_items_are_parsed_across_chunks(self, page, chunk_size):
+        data = json.dumps(page, ensure_ascii=False).encode('utf-8')
+        items = list(iter_json_items(chunked(data, chunk_size)))
+        assert items == page['items']
+
+    def test_items_are_yielded_before_the_page_is_complete(self, page):
+        data = json.dumps(page).encode('utf-8')
+        chunks = iter(chunked(data, 1024))
+        first = next(iter_json_items(chunks))
+        assert first == page['items'][0]
+        assert next(chunks, None) is not None
+
+    def test_empty_items(self):
+        data = b'{"items" : [ ], "other": 1}'
+        assert list(iter_json_items([data])) == []
+
+    def test_missing_items(self):
+        with pytest.raises(ciscosparkapiException):
+            list(iter_json_items([b'{"message": "no items"}']))
+
+    def test_truncated_items(self):
+        with pytest.raises(ValueError):
+            list(iter_json_items([b'{"items": [{"id": "1"}, {"id": ']))
+
+    def test_only_the_top_level_items_key_is_used(self):
+        data = b'{"meta": {"items": [1]}, "note": "\\"items\\": [2]", ' \
+               b'"items": [{"id": "a"}, 3]}'
+        for chunk_size in (1, 5, len(data)):
+            items = list(iter_json_items(chunked(data, chunk_size)))
+            assert items == [{'id': 'a'}, 3]
+
+    def test_nested_items_key_is_not_the_items_array(self):
+        with pytest.raises(ciscosparkapiException):
+            list(iter_json_items([b'{"meta": {"items": [1]}}']))
+
+    @pytest.mark.parametrize("data", [
+        b'{"items": [, 1]}',
+        b'{"items": [1,, 2]}',
+        b'{"items": [1 2]}',
+        b'{"items": [1,]}',
+        b'{"items": [1, 2',
+        b'["items", [1]]',
+    ])
+    def test_malformed_items(self, data):
+        with pytest.raises(ValueError):
+            list(iter_json_items(chunked(data, 3)))
+
+    def test_numbers_split_across_chunks(self):
+        assert list(iter_json_items([b'{"items": [12', b'34, 5', b'6]}'])) \
+            == [1234, 56]
+
+    def test_every_chunk_size(self):
+        data = (b'{"notItems": 1.25e5, "count": -7, '
+                b'"items": [1.5e3, -0.25, 12, {"id": "a", "n": 6.02E+23}, '
+                b'true, null, 10]}')
+        expected = json.loads(data.decode('utf-8'))['items']
+        for chunk_size in range(1, len(data) + 1):
+            assert list(iter_json_items(chunked(data, chunk_size))) \
+                == expected
+
+    def test_large_items_are_not_reparsed_per_chunk(self):
+        item = {'text': 'x' * 100000}
+        data = json.dumps({'items': [item]}).encode('utf-8')
+        decoder = CountingDecoder()
+        chunks = chunked(data, 100)
+        assert list(iter_json_items(chunks, decoder=decoder)) == [item]
+        assert decoder.calls < 30 < len(chunks)
+
+    def test_decoder_is_used(self, page):
+        data = json.dumps(page).encode('utf-8')
+        decoder = json.JSONDecoder(object_hook=OrderedDict)
+        items = list(iter_json_items(chunked(data, 64), decoder=decoder))
+        assert isinstance(items[0], OrderedDict)
+
+    def test_decoder_without_raw_decode_is_rejected(self):
+        with pytest.raises(TypeError):
+            list(iter_json_items([b'{"items": []}'], decoder=json.loads))
@@ -2,6 +2,7 @@
 #  -*- coding: utf-8 -*-
 import csv
 import random
+from concurrent.futures import ThreadPoolExecutor
 # 3rd party imports ------------------------------------------------------------
 from flask import Flask, request
 from ciscosparkapi import CiscoSparkAPI, Webhook
@@ -15,6 +16,8 @@ from helpers import (read_yaml_data,
 
 flask_app = Flask(__name__)
 spark_api = None
+# Worker pool for the per-message Spark API lookups; see __main__
+lookup_pool = None
 interaction = defaultdict(list)
 response = defaultdict(list)
 used = []
@@ -29,6 +32,7 @@ with open('interactions.csv') as csvfile:
         interaction[key].append(action)
         response[action].append(solution)
 
+
 @flask_app.route('/sparkwebhook', methods=['POST'])
 def sparkwebhook():
     if request.method == 'POST':
@@ -40,74 +44,92 @@ def sparkwebhook():
         print("\n")
 
         webhook_obj = Webhook(json_data)
-        # Details of the message created
-        room = spark_api.rooms.get(webhook_obj.data.roomId)
-        message = spark_api.messages.get(webhook_obj.data.id)
-        person = spark_api.people.get(message.personId)
+        # Message was sent by the bot, do not respond.
+        # The bot's identity is cached by the API object, so this is an
+        # in-memory comparison against the sender in the webhook payload
+        sender_id = getattr(webhook_obj.data, 'personId', None)
+        if sender_id and sender_id == spark_api.me.id:
+            return 'OK'
+
+        # Details of the message created; the independent lookups run
+        # concurrently so the latency is that of the slowest one
+        room_future = lookup_pool.submit(spark_api.rooms.get,
+                                         webhook_obj.data.roomId)
+        message_future = lookup_pool.submit(spark_api.messages.get,
+                                            webhook_obj.data.id)
+        # The sender is part of the webhook payload, so the person lookup
+        # doesn't have to wait for the message details
+        person_future = None
+        if sender_id:
+            person_future = lookup_pool.submit(spark_api.people.get, sender_id)
+
+        message = message_future.result()
+        if person_future is None:
+            # No sender in the payload; check it against the message's
+            if message.personId == spark_api.me.id:
+                return 'OK'
+            person_future = lookup_pool.submit(spark_api.people.get,
+                                               message.personId)
+        room = room_future.result()
+        person = person_future.result()
         email = person.emails[0]
 
         print("NEW MESSAGE IN ROOM '{}'".format(room.title))
         print("FROM '{}'".format(person.displayName))
         print("MESSAGE '{}'\n".format(message.text))
 
-        # Message was sent by the bot, do not respond.
-        # At the moment there is no way to filter this out, there will be in the future
-        me = spark_api.people.me()
-        if message.personId == me.id:
-            return 'OK'
-        else:
-            string = message.text.replace(',', '')
-            string = string.replace('.', '')
-            string = string.lower()
-            words = string.split(' ')
-            x=0
-            i=0
-            while (i<len(words) and x==0):
-                word = words[i]
-                if(type != []):
-                    if(word == 'yes'):
-                        type.remove(1)
-                        spark_api.messages.create(room.id, text=random.choice(interaction['another']))
+        string = message.text.replace(',', '')
+        string = string.replace('.', '')
+        string = string.lower()
+        words = string.split(' ')
+        x=0
+        i=0
+        while (i<len(words) and x==0):
+            word = words[i]
+            if(type != []):
+                if(word == 'yes'):
+                    type.remove(1)
+                    spark_api.messages.create(room.id, text=random.choice(interaction['another']))
+                    x=1
+                elif(word == 'no'):
+                    spark_api.messages.create(room.id, text=random.choice(interaction['goodbye']))
+                    sys.exit(0)
+            else:
+                if(word == 'yes'):
+                    if(interaction[word]!=[]):
+                        s=str(random.choice(interaction[word]))
+                        interaction[word].remove(s)
+                        x=str(random.choice(interaction[used[-1]]))
+                        query.append(x)
+                        interaction[used[-1]].remove(x)
+                        s=s+x
+                        spark_api.messages.create(room.id, text=s)
+                        x=1
+                elif(word == 'no'):
+                        r = str(response[query[-1]])
+                        r = r.replace('[','')
+                        r = r.replace(']','')
+                        r = str(r[1:-1])
+                        r = r + ' '
+                        w = str(interaction['nextquery'])
+                        w = w.replace('[','')
+                        w = w.replace(']','')
+                        w = str(w[1:-1])
+                        r=r+w
+                        type.append(1)
+                        x=1
+                        spark_api.messages.create(room.id, text=r)
+                elif(word in interaction):
+                    used.append(word)
+                    if(interaction[word]!=[]):
+                        s=random.choice(interaction[word])
+                        query.append(s)
+                        spark_api.messages.create(room.id, text=s)
+                        interaction[word].remove(s)
                         x=1
-                    elif(word == 'no'):
-                        spark_api.messages.create(room.id, text=random.choice(interaction['goodbye']))
-                        sys.exit(0)
-                else:
-                    if(word == 'yes'):
-                        if(interaction[word]!=[]):
-                            s=str(random.choice(interaction[word]))
-                            interaction[word].remove(s)
-                            x=str(random.choice(interaction[used[-1]]))
-                            query.append(x)
-                            interaction[used[-1]].remove(x)
-                            s=s+x
-                            spark_api.messages.create(room.id, text=s)
-                            x=1
-                    elif(word == 'no'):
-                            r = str(response[query[-1]])
-                            r = r.replace('[','')
-                            r = r.replace(']','')
-                            r = str(r[1:-1])
-                            r = r + ' '
-                            w = str(interaction['nextquery'])
-                            w = w.replace('[','')
-                            w = w.replace(']','')
-                            w = str(w[1:-1])
-                            r=r+w
-                            type.append(1)
-                            x=1
-                            spark_api.messages.create(room.id, text=r)
-                    elif(word in interaction):
-                        used.append(word)
-                        if(interaction[word]!=[]):
-                            s=random.choice(interaction[word])
-                            query.append(s)
-                            spark_api.messages.create(room.id, text=s)
-                            interaction[word].remove(s)
-                            x=1
-                    i=i+1
-            if(x==0):
-                spark_api.messages.create(room.id, text=random.choice(interaction['generic']))
+                i=i+1
+        if(x==0):
+            spark_api.messages.create(room.id, text=random.choice(interaction['generic']))
 
     else:
         print('received none post request, not handled!')
@@ -115,7 +137,11 @@ def sparkwebhook():
 
 if __name__ == '__main__':
     config = read_yaml_data('/opt/config/config.yaml')['hello_bot']
-    spark_api = CiscoSparkAPI(access_token=config['spark_access_token'])
+    # Coalesce the duplicate room/person lookups made by concurrent webhooks
+    spark_api = CiscoSparkAPI(access_token=config['spark_access_token'],
+                              coalesce_gets=True, me_cache_ttl=300)
+    # Resolve (and cache) the bot's identity before handling any webhooks
+    print("BOT IDENTITY: '{}'".format(spark_api.me.displayName))
 
     ngrok_url = get_ngrok_url()
     webhook_name = 'hello-bot-wb-hook'
@@ -124,4 +150,6 @@ if __name__ == '__main__':
         delete_webhook(spark_api, dev_webhook)
     create_webhook(spark_api, webhook_name, ngrok_url + '/sparkwebhook')
 
-    flask_app.run(host='0.0.0.0', port=5000)
+    # The pool's threads are shut down when the server stops
+    with ThreadPoolExecutor(max_workers=16) as lookup_pool:
+        flask_app.run(host='0.0.0.0', port=5000)